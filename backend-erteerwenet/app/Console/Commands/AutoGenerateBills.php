@@ -4,8 +4,7 @@
 
 use Illuminate\Console\Command;
 use App\Models\BillingSetting;
-use App\Models\Customer;
-use App\Models\Payment;
+use App\Services\BillingService;
 use Carbon\Carbon;
 use Illuminate\Support\Facades\Log;
 
@@ -16,7 +15,7 @@ class AutoGenerateBills extends Command
 
     protected $description = 'Generate tagihan internet otomatis sesuai setting database';
 
-    public function handle()
+    public function handle(BillingService $billing)
     {
         // 1. Ambil Setting
         $setting = BillingSetting::first();
@@ -50,37 +49,9 @@ public function handle()
         $this->info('Starting auto billing generation...');
         Log::info('Auto Billing Started.');
 
-        // --- LOGIKA GENERATE TAGIHAN (Mirip PaymentController) ---
-        $month = $now->month;
-        $year = $now->year;
-
-        $customers = Customer::where('status', 'active')
-            ->whereNotNull('package_id')
-            ->with('package')
-            ->get();
-
-        $count = 0;
-        foreach ($customers as $customer) {
-            // Cek duplikasi
-            $exists = Payment::where('customer_id', $customer->id)
-                ->where('billing_month', $month)
-                ->where('billing_year', $year)
-                ->exists();
-
-            if (!$exists && $customer->package) {
-                Payment::create([
-                    'customer_id' => $customer->id,
-                    'amount' => $customer->package->price,
-                    'due_date' => Carbon::create($year, $month, 20),
-                    'status' => 'pending',
-                    'billing_month' => $month,
-                    'billing_year' => $year,
-                    'description' => "Auto Tagihan {$customer->package->name} Periode {$month}/{$year}",
-                    'token_status' => 'unused'
-                ]);
-                $count++;
-            }
-        }
+        // --- LOGIKA GENERATE TAGIHAN (engine yang sama dengan PaymentController) ---
+        $report = $billing->generate($now->month, $now->year, 'Auto Tagihan');
+        $count = $report['created'];
 
         // 3. Update Status Setting
         $setting->last_run_at = $now;
@@ -94,6 +65,6 @@ public function handle()
         $setting->save();
 
         $this->info("Success! Generated {$count} bills.");
-        Log::info("Auto Billing Completed. Generated {$count} bills.");
+        Log::info("Auto Billing Completed. Generated {$count} bills in {$report['duration_ms']} ms.");
     }
 }
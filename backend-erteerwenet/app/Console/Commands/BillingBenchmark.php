@@ -0,0 +1,84 @@
+<?php
+
+namespace App\Console\Commands;
+
+use App\Models\InternetPackage;
+use App\Services\BillingService;
+use Illuminate\Console\Command;
+use Illuminate\Support\Facades\DB;
+
+/**
+ * Benchmark engine generate tagihan: seed N pelanggan aktif, generate 2x (awal & ulang).
+ * Semua tulisan ke database di-rollback di akhir.
+ */
+class BillingBenchmark extends Command
+{
+    protected $signature = 'billing:benchmark
+        {--customers=50000 : Jumlah pelanggan dummy}
+        {--month=1}
+        {--year=2000 : Periode dummy (jangan periode asli)}';
+
+    protected $description = 'Ukur waktu generate tagihan massal terhadap pelanggan dummy';
+
+    public function handle(BillingService $billing)
+    {
+        $total = (int) $this->option('customers');
+        $month = (int) $this->option('month');
+        $year = (int) $this->option('year');
+        $marker = 'billing-benchmark-' . uniqid();
+        $rows = [];
+
+        DB::beginTransaction();
+
+        try {
+            $package = InternetPackage::create([
+                'name' => 'Benchmark 10M',
+                'description' => $marker,
+                'speed' => 10,
+                'price' => 150000,
+                'category' => 'basic',
+            ]);
+
+            $started = microtime(true);
+            $now = now()->toDateTimeString();
+
+            for ($i = 1; $i <= $total; $i += BillingService::CHUNK_SIZE) {
+                $chunk = [];
+                for ($j = $i; $j < min($i + BillingService::CHUNK_SIZE, $total + 1); $j++) {
+                    $chunk[] = [
+                        'name' => "Benchmark {$j}",
+                        'email' => "{$marker}-{$j}@example.test",
+                        'phone' => '0800000000',
+                        'address' => '-',
+                        'package_id' => $package->id,
+                        'status' => 'active',
+                        'created_at' => $now,
+                        'updated_at' => $now,
+                    ];
+                }
+                DB::table('customers')->insert($chunk);
+            }
+            $rows[] = ["seed {$total} pelanggan", $this->elapsed($started), $total];
+
+            $started = microtime(true);
+            $missing = $billing->countMissing($month, $year);
+            $rows[] = ['anti-join count', $this->elapsed($started), $missing];
+
+            foreach (['generate (awal)', 'generate (ulang, idempotent)'] as $label) {
+                $report = $billing->generate($month, $year, 'Benchmark');
+                $rows[] = [$label, $report['duration_ms'], "baru {$report['created']} / dicek {$report['processed']}"];
+            }
+
+            $this->table(['Langkah', 'ms', 'Baris'], $rows);
+        } finally {
+            DB::rollBack();
+        }
+
+        return self::SUCCESS;
+    }
+
+    protected function elapsed(float $started): float
+    {
+        return round((microtime(true) - $started) * 1000, 1);
+    }
+}
@@ -0,0 +1,103 @@
+<?php
+
+namespace App\Console\Commands;
+
+use App\Services\CustomerImportService;
+use Illuminate\Console\Command;
+use Illuminate\Support\Facades\DB;
+use Illuminate\Support\Facades\Hash;
+use Illuminate\Support\Facades\Storage;
+
+/**
+ * Benchmark pipeline import pelanggan: generate file CSV N baris (sebagian sengaja tidak valid / duplikat),
+ * import lewat CustomerImportService. Semua tulisan ke database di-rollback di akhir.
+ */
+class CustomerImportBenchmark extends Command
+{
+    protected $signature = 'customers:import-benchmark
+        {--rows=50000 : Jumlah baris file dummy}
+        {--invalid=2 : Persen baris tidak valid / email duplikat}';
+
+    protected $description = 'Ukur waktu & memori import pelanggan massal dari file CSV dummy';
+
+    public function handle(CustomerImportService $importer)
+    {
+        $total = (int) $this->option('rows');
+        $invalidEvery = max(1, (int) round(100 / max(0.01, (float) $this->option('invalid'))));
+        $marker = 'import-benchmark-' . uniqid();
+        $path = "imports/{$marker}.csv";
+        $rows = [];
+
+        $started = microtime(true);
+        $this->writeFile($path, $total, $invalidEvery, $marker);
+        $rows[] = ["generate CSV {$total} baris", $this->elapsed($started), round(Storage::size($path) / 1048576, 1) . ' MB'];
+
+        // Pembanding: biaya bcrypt per baris di import lama, diekstrapolasi dari 50 hash
+        $started = microtime(true);
+        for ($i = 0; $i < 50; $i++) {
+            Hash::make((string) (790000 + $i));
+        }
+        $rows[] = ["bcrypt per baris (estimasi {$total} baris, dilewati)", round($this->elapsed($started) / 50 * $total, 1), '-'];
+
+        DB::beginTransaction();
+
+        try {
+            $memory = memory_get_usage(true);
+            $report = $importer->import($path);
+
+            $rows[] = [
+                'import (chunk ' . CustomerImportService::CHUNK_SIZE . ')',
+                $report['duration_ms'],
+                "baru {$report['created']} / gagal {$report['failed']} / dibaca {$report['processed']}",
+            ];
+            $rows[] = ['baris per detik', '-', (int) round($report['processed'] / max(0.001, $report['duration_ms'] / 1000))];
+            $rows[] = ['tambahan memori puncak', '-', round((memory_get_peak_usage(true) - $memory) / 1048576, 1) . ' MB'];
+
+            $this->table(['Langkah', 'ms', 'Hasil'], $rows);
+
+            if ($report['errors']) {
+                $this->line('Contoh error: ' . json_encode($report['errors'][0]));
+            }
+        } finally {
+            DB::rollBack();
+            Storage::delete($path);
+        }
+
+        return self::SUCCESS;
+    }
+
+    /**
+     * Tulis CSV baris per baris (file besar tidak ditampung di memori)
+     */
+    protected function writeFile(string $path, int $total, int $invalidEvery, string $marker): void
+    {
+        Storage::put($path, '');
+        $handle = fopen(Storage::path($path), 'w');
+        fputcsv($handle, ['name', 'email', 'phone', 'address', 'latitude', 'longitude']);
+
+        for ($i = 1; $i <= $total; $i++) {
+            $email = "{$marker}-{$i}@example.test";
+
+            if ($i % $invalidEvery === 0) {
+                // Bergantian: email tidak valid & duplikat baris sebelumnya
+                $email = $i % (2 * $invalidEvery) === 0 ? 'bukan-email' : "{$marker}-" . ($i - 1) . '@example.test';
+            }
+
+            fputcsv($handle, [
+                "Benchmark {$i}",
+                $email,
+                '08' . str_pad((string) $i, 10, '0', STR_PAD_LEFT),
+                "Jl. Benchmark No. {$i}",
+                -5.37 + mt_rand(-5000, 5000) / 100000,
+                105.07 + mt_rand(-5000, 5000) / 100000,
+            ]);
+        }
+
+        fclose($handle);
+    }
+
+    protected function elapsed(float $started): float
+    {
+        return round((microtime(true) - $started) * 1000, 1);
+    }
+}
@@ -0,0 +1,91 @@
+<?php
+
+namespace App\Console\Commands;
+
+use App\Models\MikrotikRouter;
+use App\Services\MikrotikConnectionManager;
+use App\Services\MikrotikService;
+use App\Services\MikrotikSyncService;
+use Illuminate\Console\Command;
+use Illuminate\Support\Facades\DB;
+
+/**
+ * Benchmark layer koneksi + engine sync terhadap router (biasanya mikrotik:fake-server).
+ * Semua tulisan ke database di-rollback di akhir.
+ */
+class MikrotikBenchmark extends Command
+{
+    protected $signature = 'mikrotik:benchmark
+        {--host=127.0.0.1}
+        {--port=18728}
+        {--user=admin}
+        {--pass=admin}
+        {--runs=3 : Berapa kali poll active diulang}';
+
+    protected $description = 'Ukur waktu connect, fetch & sync MikroTik (contoh: jalankan mikrotik:fake-server dulu)';
+
+    public function handle(MikrotikConnectionManager $connections, MikrotikService $mikrotik, MikrotikSyncService $syncer)
+    {
+        DB::beginTransaction();
+
+        try {
+            $router = MikrotikRouter::create([
+                'name' => 'Benchmark',
+                'host' => $this->option('host'),
+                'port' => (int) $this->option('port'),
+                'username' => $this->option('user'),
+                'password' => $this->option('pass'),
+                'is_default' => true,
+            ]);
+
+            $mikrotik = $mikrotik->forRouter($router);
+            $syncer = $syncer->forRouter($router);
+            $rows = [];
+
+            $started = microtime(true);
+            $connections->client($router);
+            $rows[] = ['connect + login', $this->elapsed($started), '-'];
+
+            $started = microtime(true);
+            $count = iterator_count($mikrotik->streamPppSecrets(MikrotikSyncService::SECRET_FIELDS));
+            $rows[] = ['/ppp/secret/print (iterator)', $this->elapsed($started), $count];
+
+            $started = microtime(true);
+            $count = iterator_count($mikrotik->streamActivePppConnections(MikrotikSyncService::ACTIVE_FIELDS));
+            $rows[] = ['/ppp/active/print (iterator)', $this->elapsed($started), $count];
+
+            // Sync pertama = insert semua, kedua = sebagian besar unchanged
+            foreach (['syncSecrets (awal)', 'syncSecrets (ulang)'] as $label) {
+                $report = $syncer->syncSecrets();
+                $rows[] = [
+                    $label . ' ' . json_encode($report['timings']),
+                    array_sum($report['timings']),
+                    "ins {$report['inserted']} / upd {$report['updated']} / sama {$report['unchanged']}",
+                ];
+            }
+
+            for ($i = 1; $i <= (int) $this->option('runs'); $i++) {
+                $report = $syncer->syncActiveSessions();
+                $rows[] = [
+                    "syncActiveSessions #{$i} " . json_encode($report['timings']),
+                    array_sum($report['timings']),
+                    "on {$report['online']} / +{$report['connected']} / -{$report['disconnected']} / ~{$report['changed']}",
+                ];
+            }
+
+            $this->table(['Langkah', 'ms', 'Baris'], $rows);
+        } finally {
+            DB::rollBack();
+            if (isset($router)) {
+                $connections->disconnect($router);
+            }
+        }
+
+        return self::SUCCESS;
+    }
+
+    protected function elapsed(float $started): float
+    {
+        return round((microtime(true) - $started) * 1000, 1);
+    }
+}
@@ -0,0 +1,425 @@
+<?php
+
+namespace App\Console\Commands;
+
+use Illuminate\Console\Command;
+
+/**
+ * Server RouterOS API palsu untuk development, test & benchmark tanpa router asli.
+ *
+ * Mendukung protokol API (length-prefixed words), login post-6.43 (name/password),
+ * /ppp/secret, /ppp/active, /ppp/profile, /interface (print/add/set/remove), filter '?key=value',
+ * '.proplist' dan '.tag'. Beberapa client dilayani bersamaan lewat stream_select.
+ */
+class MikrotikFakeServer extends Command
+{
+    protected $signature = 'mikrotik:fake-server
+        {--host=127.0.0.1 : Alamat listen}
+        {--port=18728 : Port listen}
+        {--user=admin : Username login}
+        {--pass=admin : Password login}
+        {--secrets=3000 : Jumlah PPP Secret palsu}
+        {--online=80 : Persentase secret yang sedang online}
+        {--churn=0 : Persentase sesi yang connect/disconnect setiap /ppp/active/print}
+        {--latency=0 : Delay (ms) sebelum membalas setiap perintah}';
+
+    protected $description = 'Jalankan server RouterOS API palsu (test & benchmark offline)';
+
+    protected $tables = [
+        '/ppp/secret' => [],
+        '/ppp/active' => [],
+        '/ppp/profile' => [],
+        '/interface' => [],
+    ];
+
+    protected $clients = [];
+
+    protected $nextId = 1;
+
+    public function handle()
+    {
+        $this->seed((int) $this->option('secrets'), (int) $this->option('online'));
+
+        $address = "tcp://{$this->option('host')}:{$this->option('port')}";
+        $server = @stream_socket_server($address, $errno, $errstr);
+
+        if (!$server) {
+            $this->error("Gagal listen di {$address}: {$errstr}");
+            return self::FAILURE;
+        }
+
+        $this->info("Fake RouterOS API listen di {$address} ({$this->option('secrets')} secret, "
+            . count($this->tables['/ppp/active']) . " online). Ctrl+C untuk berhenti.");
+
+        while (true) {
+            $read = array_merge([$server], array_column($this->clients, 'socket'));
+            $write = null;
+            $except = null;
+
+            if (@stream_select($read, $write, $except, null) === false) {
+                break;
+            }
+
+            foreach ($read as $socket) {
+                if ($socket === $server) {
+                    $this->accept($server);
+                    continue;
+                }
+
+                $id = (int) $socket;
+                $data = fread($socket, 65536);
+
+                if ($data === '' || $data === false) {
+                    $this->close($id);
+                    continue;
+                }
+
+                $this->clients[$id]['buffer'] .= $data;
+
+                foreach ($this->extractSentences($id) as $sentence) {
+                    if (!isset($this->clients[$id])) break;
+                    $this->respond($id, $sentence);
+                }
+            }
+        }
+
+        return self::SUCCESS;
+    }
+
+    protected function accept($server)
+    {
+        $socket = @stream_socket_accept($server, 0);
+        if (!$socket) return;
+
+        $this->clients[(int) $socket] = ['socket' => $socket, 'buffer' => '', 'authed' => false];
+        $this->line('Client terhubung: ' . stream_socket_get_name($socket, true), null, 'v');
+    }
+
+    protected function close(int $id)
+    {
+        if (isset($this->clients[$id])) {
+            fclose($this->clients[$id]['socket']);
+            unset($this->clients[$id]);
+        }
+    }
+
+    /**
+     * Ambil semua sentence lengkap dari buffer client (sisa yang terpotong tetap di buffer)
+     */
+    protected function extractSentences(int $id): array
+    {
+        $buffer = $this->clients[$id]['buffer'];
+        $offset = 0;
+        $consumed = 0;
+        $sentences = [];
+        $words = [];
+
+        while (true) {
+            $length = $this->decodeLength($buffer, $offset);
+
+            if ($length === null || $offset + $length > strlen($buffer)) {
+                break;
+            }
+
+            if ($length === 0) {
+                $sentences[] = $words;
+                $words = [];
+                $consumed = $offset;
+                continue;
+            }
+
+            $words[] = substr($buffer, $offset, $length);
+            $offset += $length;
+        }
+
+        $this->clients[$id]['buffer'] = substr($buffer, $consumed);
+
+        return $sentences;
+    }
+
+    protected function respond(int $id, array $words)
+    {
+        if ($latency = (int) $this->option('latency')) {
+            usleep($latency * 1000);
+        }
+
+        $command = array_shift($words);
+        $attributes = [];
+        $filters = [];
+
+        foreach ($words as $word) {
+            if (preg_match('/^=([^=]+)=(.*)$/s', $word, $m)) {
+                $attributes[$m[1]] = $m[2];
+            } elseif (preg_match('/^\?([^=]+)=(.*)$/s', $word, $m)) {
+                $filters[$m[1]] = $m[2];
+            } elseif (str_starts_with($word, '.tag=')) {
+                $attributes['.tag'] = substr($word, 5);
+            }
+        }
+
+        $tag = isset($attributes['.tag']) ? ['=.tag=' . $attributes['.tag']] : [];
+        unset($attributes['.tag']);
+
+        if ($command === '/login') {
+            if (($attributes['name'] ?? null) === $this->option('user') && ($attributes['password'] ?? null) === $this->option('pass')) {
+                $this->clients[$id]['authed'] = true;
+                return $this->send($id, [array_merge(['!done'], $tag)]);
+            }
+
+            return $this->send($id, [
+                array_merge(['!trap', '=message=invalid user name or password (6)'], $tag),
+                array_merge(['!done'], $tag),
+            ]);
+        }
+
+        if (!$this->clients[$id]['authed']) {
+            $this->send($id, [['!fatal', 'not logged in']]);
+            return $this->close($id);
+        }
+
+        if ($command === '/quit') {
+            $this->send($id, [['!fatal', 'session terminated on request']]);
+            return $this->close($id);
+        }
+
+        $menu = substr($command, 0, strrpos($command, '/'));
+        $action = substr($command, strrpos($command, '/') + 1);
+
+        if (!isset($this->tables[$menu])) {
+            return $this->trap($id, 'no such command prefix', $tag);
+        }
+
+        switch ($action) {
+            case 'print':
+                if ($menu === '/ppp/active') {
+                    $this->churn();
+                }
+
+                if ($menu === '/interface') {
+                    $this->traffic();
+                }
+
+                $proplist = isset($attributes['.proplist']) ? explode(',', $attributes['.proplist']) : null;
+                $replies = [];
+
+                foreach ($this->tables[$menu] as $row) {
+                    foreach ($filters as $key => $value) {
+                        if (($row[$key] ?? null) !== $value) continue 2;
+                    }
+
+                    if ($proplist) {
+                        $row = array_intersect_key($row, array_flip($proplist));
+                    }
+
+                    $sentence = ['!re'];
+                    foreach ($row as $key => $value) {
+                        $sentence[] = "={$key}={$value}";
+                    }
+                    $replies[] = array_merge($sentence, $tag);
+                }
+
+                $replies[] = array_merge(['!done'], $tag);
+                return $this->send($id, $replies);
+
+            case 'add':
+                $newId = $this->newId();
+                $this->tables[$menu][$newId] = array_merge(['.id' => $newId], $attributes);
+                return $this->send($id, [array_merge(['!done', "=ret={$newId}"], $tag)]);
+
+            case 'set':
+                $target = $attributes['.id'] ?? null;
+                if (!isset($this->tables[$menu][$target])) {
+                    return $this->trap($id, 'no such item', $tag);
+                }
+                $this->tables[$menu][$target] = array_merge($this->tables[$menu][$target], $attributes);
+                return $this->send($id, [array_merge(['!done'], $tag)]);
+
+            case 'remove':
+                unset($this->tables[$menu][$attributes['.id'] ?? null]);
+                return $this->send($id, [array_merge(['!done'], $tag)]);
+        }
+
+        return $this->trap($id, 'no such command', $tag);
+    }
+
+    protected function trap(int $id, string $message, array $tag)
+    {
+        $this->send($id, [
+            array_merge(['!trap', "=message={$message}"], $tag),
+            array_merge(['!done'], $tag),
+        ]);
+    }
+
+    protected function send(int $id, array $sentences)
+    {
+        $payload = '';
+        foreach ($sentences as $words) {
+            foreach ($words as $word) {
+                $payload .= $this->encodeLength(strlen($word)) . $word;
+            }
+            $payload .= "\0";
+        }
+
+        $socket = $this->clients[$id]['socket'];
+        for ($written = 0; $written < strlen($payload); $written += $bytes) {
+            $bytes = @fwrite($socket, substr($payload, $written));
+            if ($bytes === false || $bytes === 0) {
+                return $this->close($id);
+            }
+        }
+    }
+
+    protected function encodeLength(int $length): string
+    {
+        if ($length < 0x80) return chr($length);
+        if ($length < 0x4000) return pack('n', $length | 0x8000);
+        if ($length < 0x200000) return substr(pack('N', $length | 0xC00000), 1);
+        if ($length < 0x10000000) return pack('N', $length | 0xE0000000);
+
+        return chr(0xF0) . pack('N', $length);
+    }
+
+    protected function decodeLength(string $buffer, int &$offset): ?int
+    {
+        if ($offset >= strlen($buffer)) return null;
+
+        $first = ord($buffer[$offset]);
+        if (($first & 0x80) === 0x00) {
+            $bytes = 1;
+            $length = $first;
+        } elseif (($first & 0xC0) === 0x80) {
+            $bytes = 2;
+            $length = $first & 0x3F;
+        } elseif (($first & 0xE0) === 0xC0) {
+            $bytes = 3;
+            $length = $first & 0x1F;
+        } elseif (($first & 0xF0) === 0xE0) {
+            $bytes = 4;
+            $length = $first & 0x0F;
+        } else {
+            $bytes = 5;
+            $length = 0;
+        }
+
+        if ($offset + $bytes > strlen($buffer)) return null;
+
+        for ($i = 1; $i < $bytes; $i++) {
+            $length = ($length << 8) | ord($buffer[$offset + $i]);
+        }
+        $offset += $bytes;
+
+        return $length;
+    }
+
+    /**
+     * Data palsu: profile, secret (username = customer_number 79xxxx) dan sesi aktif
+     */
+    protected function seed(int $secrets, int $onlinePercent)
+    {
+        foreach (['10M' => '10M/10M', '20M' => '20M/20M', '50M' => '50M/50M'] as $name => $rate) {
+            $id = $this->newId();
+            $this->tables['/ppp/profile'][$id] = [
+                '.id' => $id,
+                'name' => $name,
+                'local-address' => '10.10.0.1',
+                'remote-address' => 'pool-pppoe',
+                'rate-limit' => $rate,
+                'dns-server' => '8.8.8.8',
+                'default' => 'false',
+            ];
+        }
+
+        $profiles = array_column($this->tables['/ppp/profile'], 'name');
+
+        for ($i = 1; $i <= $secrets; $i++) {
+            $name = (string) (790000 + $i);
+            $id = $this->newId();
+
+            $this->tables['/ppp/secret'][$id] = [
+                '.id' => $id,
+                'name' => $name,
+                'service' => 'pppoe',
+                'caller-id' => '',
+                'password' => $name,
+                'profile' => $profiles[$i % count($profiles)],
+                'local-address' => '-',
+                'remote-address' => '-',
+                'disabled' => 'false',
+            ];
+
+            if (mt_rand(1, 100) <= $onlinePercent) {
+                $this->connect($name);
+            }
+        }
+    }
+
+    /**
+     * Simulasi pelanggan connect/disconnect di antara dua poll
+     */
+    protected function churn()
+    {
+        $percent = (int) $this->option('churn');
+        if ($percent <= 0) return;
+
+        $online = array_column($this->tables['/ppp/active'], '.id', 'name');
+        $interfaces = array_column($this->tables['/interface'], 'name', '.id');
+
+        foreach ($this->tables['/ppp/secret'] as $secret) {
+            if (mt_rand(1, 100) > $percent) continue;
+
+            if (isset($online[$secret['name']])) {
+                unset($this->tables['/ppp/active'][$online[$secret['name']]]);
+                unset($this->tables['/interface'][array_search("<pppoe-{$secret['name']}>", $interfaces)]);
+            } else {
+                $this->connect($secret['name']);
+            }
+        }
+    }
+
+    protected function connect(string $name)
+    {
+        $id = $this->newId();
+        $n = (int) $name;
+
+        $this->tables['/ppp/active'][$id] = [
+            '.id' => $id,
+            'name' => $name,
+            'service' => 'pppoe',
+            'caller-id' => sprintf('AA:BB:CC:%02X:%02X:%02X', ($n >> 16) & 0xFF, ($n >> 8) & 0xFF, $n & 0xFF),
+            'address' => sprintf('10.20.%d.%d', intdiv($n % 65000, 250), $n % 250 + 2),
+            'uptime' => sprintf('%dd%dh%dm%ds', mt_rand(0, 20), mt_rand(0, 23), mt_rand(0, 59), mt_rand(0, 59)),
+            'encoding' => '',
+            'session-id' => sprintf('0x%08X', mt_rand()),
+            'limit-bytes-in' => '0',
+            'limit-bytes-out' => '0',
+            'radius' => 'false',
+        ];
+
+        // Interface dinamis PPPoE server, counter mulai dari 0 tiap sesi baru
+        $interfaceId = $this->newId();
+        $this->tables['/interface'][$interfaceId] = [
+            '.id' => $interfaceId,
+            'name' => "<pppoe-{$name}>",
+            'type' => 'pppoe-in',
+            'rx-byte' => '0',
+            'tx-byte' => '0',
+            'running' => 'true',
+        ];
+    }
+
+    /**
+     * Naikkan counter rx/tx semua interface PPPoE (seolah ada traffic sejak print terakhir)
+     */
+    protected function traffic()
+    {
+        foreach ($this->tables['/interface'] as $id => $interface) {
+            $this->tables['/interface'][$id]['rx-byte'] = (string) ((int) $interface['rx-byte'] + mt_rand(0, 50_000_000));
+            $this->tables['/interface'][$id]['tx-byte'] = (string) ((int) $interface['tx-byte'] + mt_rand(0, 200_000_000));
+        }
+    }
+
+    protected function newId(): string
+    {
+        return '*' . strtoupper(dechex($this->nextId++));
+    }
+}
@@ -0,0 +1,26 @@
+<?php
+
+namespace App\Console\Commands;
+
+use App\Services\PppoeHistoryService;
+use Illuminate\Console\Command;
+
+class PppoeRollup extends Command
+{
+    protected $signature = 'pppoe:rollup {--no-prune : Lewati penghapusan data lama}';
+
+    protected $description = 'Rollup riwayat sesi & traffic PPPoE ke agregat jam/hari lalu hapus data lewat retensi';
+
+    public function handle(PppoeHistoryService $history)
+    {
+        $rollup = $history->rollup();
+        $this->info("Rollup selesai: {$rollup['hours']} jam, {$rollup['days']} hari.");
+
+        if (!$this->option('no-prune')) {
+            $pruned = $history->prune();
+            $this->info('Data lama dihapus: ' . json_encode($pruned));
+        }
+
+        return self::SUCCESS;
+    }
+}
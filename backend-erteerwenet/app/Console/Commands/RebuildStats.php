@@ -0,0 +1,21 @@
+<?php
+
+namespace App\Console\Commands;
+
+use App\Services\StatsService;
+use Illuminate\Console\Command;
+
+class RebuildStats extends Command
+{
+    protected $signature = 'stats:rebuild';
+
+    protected $description = 'Hitung ulang semua cache statistik dashboard & monitoring pembayaran';
+
+    public function handle(StatsService $stats)
+    {
+        $timings = $stats->rebuild();
+        $this->info('Statistik dihitung ulang (ms): ' . json_encode($timings));
+
+        return self::SUCCESS;
+    }
+}
@@ -0,0 +1,21 @@
+<?php
+
+namespace App\Console\Commands;
+
+use App\Services\PortService;
+use Illuminate\Console\Command;
+
+class RefreshPorts extends Command
+{
+    protected $signature = 'ports:refresh';
+
+    protected $description = 'Hitung ulang counter port terpakai ODP/ODC/OLT dari data pelanggan (setelah edit manual di database)';
+
+    public function handle(PortService $ports)
+    {
+        $ports->refreshAll();
+        $this->info('Counter port ODP/ODC/OLT sudah disinkronkan.');
+
+        return self::SUCCESS;
+    }
+}
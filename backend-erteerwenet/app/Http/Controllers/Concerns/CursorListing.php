@@ -0,0 +1,72 @@
+<?php
+
+namespace App\Http\Controllers\Concerns;
+
+use Illuminate\Database\Eloquent\Builder;
+use Illuminate\Http\Request;
+
+/**
+ * Helper list besar: cursor pagination (?cursor=&size=) dan sparse fields (?fields=).
+ *
+ * fields berisi daftar dipisah koma: kolom tabel utama ("name"), relasi dengan kolom
+ * default-nya ("odp"), atau kolom tertentu dari relasi ("package.name").
+ * Tanpa fields: semua kolom + relasi default.
+ */
+trait CursorListing
+{
+    /**
+     * $relations: nama relasi => ['local' => kolom di tabel utama, 'foreign' => kolom di tabel relasi,
+     *                             'columns' => kolom relasi yang boleh diminta (default semua ini)]
+     */
+    protected function applyFields(Builder $query, Request $request, array $columns, array $relations, array $defaultWith = []): Builder
+    {
+        if (!$request->filled('fields')) {
+            return $query->with($defaultWith);
+        }
+
+        $table = $query->getModel()->getTable();
+        $select = ['id'];
+        $with = [];
+
+        foreach (explode(',', $request->input('fields')) as $field) {
+            [$name, $column] = array_pad(explode('.', trim($field), 2), 2, null);
+
+            if (isset($relations[$name])) {
+                $relation = $relations[$name];
+                $select[] = $relation['local'];
+
+                // Kolom relasi di luar whitelist diabaikan
+                $wanted = $column ? array_intersect([$column], $relation['columns']) : $relation['columns'];
+                $with[$name] = array_merge($with[$name] ?? [$relation['foreign']], $wanted);
+            } elseif (in_array($name, $columns, true)) {
+                $select[] = $name;
+            }
+        }
+
+        $query->select(array_map(fn ($column) => "{$table}.{$column}", array_unique($select)));
+
+        foreach ($with as $name => $relationColumns) {
+            $query->with($name . ':' . implode(',', array_unique($relationColumns)));
+        }
+
+        return $query;
+    }
+
+    /**
+     * Cursor pagination urut id terbaru (setara latest(), tapi stabil & tanpa OFFSET)
+     */
+    protected function cursorResponse(Builder $query, Request $request, array $extra = [])
+    {
+        $size = min(100, max(1, (int) $request->input('size', 20)));
+        $table = $query->getModel()->getTable();
+
+        $page = $query->orderByDesc("{$table}.id")->cursorPaginate($size);
+
+        return response()->json(array_merge([
+            'data' => $page->items(),
+            'next_cursor' => $page->nextCursor()?->encode(),
+            'prev_cursor' => $page->previousCursor()?->encode(),
+            'size' => $page->perPage(),
+        ], $extra));
+    }
+}
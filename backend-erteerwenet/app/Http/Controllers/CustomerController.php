@@ -2,30 +2,44 @@
 
 namespace App\Http\Controllers;
 
+use App\Http\Controllers\Concerns\CursorListing;
+use App\Jobs\ImportCustomers;
 use App\Models\Customer;
-use App\Imports\CustomersImport;
-use Maatwebsite\Excel\Facades\Excel;
+use App\Services\CustomerNumberService;
 use App\Services\MikrotikService; // Jangan lupa use ini
 use App\Models\CustomerPppoeAccount; // Dan ini
+use App\Models\MikrotikRouter;
+use App\Services\StatsService;
 use Illuminate\Support\Facades\DB; // Dan ini
 use Illuminate\Support\Facades\Hash; // Dan ini
 use Illuminate\Http\Request;
+use Illuminate\Support\Facades\Cache;
+use Illuminate\Support\Str;
 
 class CustomerController extends Controller
 {
-    public function index(Request $request)
+    use CursorListing;
+
+    // Kolom & relasi yang boleh diminta lewat ?fields=
+    const LIST_COLUMNS = [
+        'customer_number', 'name', 'email', 'phone', 'address', 'latitude', 'longitude',
+        'odp_id', 'odp_port', 'package_id', 'status', 'installation_date', 'notes', 'is_active', 'created_at', 'updated_at',
+    ];
+
+    const LIST_RELATIONS = [
+        'odp' => ['local' => 'odp_id', 'foreign' => 'id', 'columns' => ['id', 'name', 'location']],
+        'package' => ['local' => 'package_id', 'foreign' => 'id', 'columns' => ['id', 'name', 'speed', 'price']],
+        'pppoe_account' => ['local' => 'id', 'foreign' => 'customer_id', 'columns' => ['id', 'username', 'profile', 'caller_id']],
+    ];
+
+    public function index(Request $request, StatsService $stats)
     {
-        $query = Customer::with(['odp', 'package', 'pppoe_account']); // Eager load relasi
-
-        // 1. Search
-        if ($request->has('search') && $request->search != '') {
-            $search = $request->search;
-            $query->where(function ($q) use ($search) {
-                $q->where('name', 'like', "%{$search}%")
-                    ->orWhere('email', 'like', "%{$search}%")
-                    ->orWhere('phone', 'like', "%{$search}%")
-                    ->orWhere('address', 'like', "%{$search}%");
-            });
+        $query = Customer::query();
+        $this->applyFields($query, $request, self::LIST_COLUMNS, self::LIST_RELATIONS, ['odp', 'package', 'pppoe_account']);
+
+        // 1. Search (FULLTEXT / prefix, lihat Customer::scopeSearch)
+        if ($request->filled('search')) {
+            $query->search($request->search);
         }
 
         // 2. Filter Status
@@ -38,12 +52,16 @@ public function index(Request $request)
             $query->where('odp_id', $request->odp_id);
         }
 
-        // 4. Pagination atau All
-        // Frontend pakai getCustomers() tanpa pagination parameter explicit di service,
-        // tapi biasanya butuh semua data atau pagination. Kita default return all collection dulu
-        // sesuai kode frontend: setCustomers(customersData)
+        // 4. Filter Paket
+        if ($request->filled('package_id') && $request->package_id != 'all') {
+            $query->where('package_id', $request->package_id);
+        }
+
+        // 5. Cursor pagination, ringkasan jumlah per status dari cache statistik
+        $summary = $stats->get('customers');
+        unset($summary['growth']);
 
-        return response()->json($query->latest()->get());
+        return $this->cursorResponse($query, $request, ['summary' => $summary]);
     }
 
     public function store(Request $request)
@@ -56,6 +74,7 @@ public function store(Request $request)
             'latitude' => 'nullable|numeric',
             'longitude' => 'nullable|numeric',
             'odp_id' => 'required|exists:odps,id',
+            'odp_port' => 'nullable|integer|min:1', // Kosong = port bebas terkecil (PortService)
             'package_id' => 'required|exists:internet_packages,id',
             'status' => 'required|in:pending,active,inactive,suspended',
             'installation_date' => 'nullable|date',
@@ -63,7 +82,8 @@ public function store(Request $request)
             'is_active' => 'boolean',
         ]);
 
-        $customer = Customer::create($validated);
+        // Transaksi: PortObserver mengunci baris ODP saat memilih port
+        $customer = DB::transaction(fn () => Customer::create($validated));
 
         return response()->json($customer, 201);
     }
@@ -73,7 +93,7 @@ public function show($id)
         return Customer::with(['odp', 'package', 'pppoe_account'])->findOrFail($id);
     }
 
-    public function update(Request $request, $id)
+    public function update(Request $request, $id, CustomerNumberService $numbers)
     {
         $customer = Customer::findOrFail($id);
 
@@ -85,6 +105,7 @@ public function update(Request $request, $id)
             'latitude' => 'nullable|numeric',
             'longitude' => 'nullable|numeric',
             'odp_id' => 'sometimes|required|exists:odps,id',
+            'odp_port' => 'nullable|integer|min:1',
             'package_id' => 'sometimes|required|exists:internet_packages,id',
             'status' => 'sometimes|required|in:pending,active,inactive,suspended',
             'installation_date' => 'nullable|date',
@@ -98,20 +119,8 @@ public function update(Request $request, $id)
             $validated['status'] === 'active' &&
             is_null($customer->customer_number)
         ) {
-            // Cari nomor terakhir yang depannya 79
-            $latestCustomer = Customer::where('customer_number', 'like', '79%')
-                ->orderBy('customer_number', 'desc')
-                ->first();
-
-            if ($latestCustomer) {
-                // Jika ada, tambah 1 (Contoh: 790001 -> 790002)
-                $nextId = intval($latestCustomer->customer_number) + 1;
-            } else {
-                // Jika belum ada sama sekali, mulai dari 790001
-                $nextId = 790001;
-            }
-
-            $newId = (string) $nextId;
+            // Nomor berikutnya dari sequence (aman dipakai bersamaan dengan import)
+            $newId = $numbers->next();
 
             $validated['customer_number'] = $newId;
 
@@ -120,7 +129,7 @@ public function update(Request $request, $id)
             $validated['must_change_password'] = true;
         }
 
-        $customer->update($validated);
+        DB::transaction(fn () => $customer->update($validated));
 
         return response()->json($customer);
     }
@@ -128,7 +137,7 @@ public function update(Request $request, $id)
     public function destroy($id)
     {
         $customer = Customer::findOrFail($id);
-        $customer->delete();
+        DB::transaction(fn () => $customer->delete());
 
         return response()->json(['message' => 'Customer deleted successfully']);
     }
@@ -143,26 +152,41 @@ public function stats()
         ]);
     }
 
+    // Import Excel/CSV - dijalankan di queue, progress & laporan error via importStatus
     public function import(Request $request)
     {
         $request->validate([
             'file' => 'required|mimes:xlsx,xls,csv'
         ]);
 
-        try {
-            Excel::import(new CustomersImport, $request->file('file'));
-            return response()->json(['message' => 'Data pelanggan berhasil diimport!']);
-        } catch (\Maatwebsite\Excel\Validators\ValidationException $e) {
-            $failures = $e->failures();
-            $errorMsg = "Gagal pada baris: " . $failures[0]->row() . ". " . $failures[0]->errors()[0];
-            return response()->json(['message' => $errorMsg], 422);
-        } catch (\Exception $e) {
-            return response()->json(['message' => 'Gagal import: ' . $e->getMessage()], 500);
+        $file = $request->file('file');
+        $importId = (string) Str::uuid();
+        $path = $file->storeAs('imports', $importId . '.' . strtolower($file->getClientOriginalExtension()));
+
+        $progress = ImportCustomers::markQueued($importId, $file->getClientOriginalName());
+        ImportCustomers::dispatch($importId, $path);
+
+        return response()->json([
+            'message' => 'File diterima, import diproses di background.',
+            'import_id' => $importId,
+            'progress' => $progress,
+        ], 202);
+    }
+
+    // Progress & laporan error import (polling dari frontend)
+    public function importStatus($importId)
+    {
+        $progress = Cache::get(ImportCustomers::progressKey($importId));
+
+        if (!$progress) {
+            return response()->json(['message' => 'Proses import tidak ditemukan'], 404);
         }
+
+        return response()->json($progress);
     }
 
     // Method Aktivasi Pelanggan + Create PPPoE
-    public function activate(Request $request, $id, MikrotikService $mikrotik)
+    public function activate(Request $request, $id, MikrotikService $mikrotik, CustomerNumberService $numbers)
     {
         $request->validate([
             'pppoe_profile' => 'required|string',
@@ -170,23 +194,19 @@ public function activate(Request $request, $id, MikrotikService $mikrotik)
 
         $customer = Customer::findOrFail($id);
 
-        // 1. Generate ID Pelanggan (79xxxx)
-        // Cek ID terakhir
-        $latestCustomer = Customer::where('customer_number', 'like', '79%')
-            ->orderBy('customer_number', 'desc')
-            ->first();
-
-        if ($latestCustomer) {
-            $nextId = intval($latestCustomer->customer_number) + 1;
-        } else {
-            $nextId = 790001;
-        }
-        $customerIdString = (string) $nextId;
+        // 1. Generate ID Pelanggan (79xxxx) dari sequence
+        $customerIdString = $numbers->next();
 
         DB::beginTransaction(); // Pakai transaksi biar aman
 
         try {
-            // 2. Create Secret di MikroTik
+            // 2. Create Secret di MikroTik (router sesuai OLT pelanggan, fallback router default)
+            $router = MikrotikRouter::forCustomer($customer);
+            if (!$router) {
+                throw new \Exception("Belum ada router MikroTik yang dikonfigurasi! Tambahkan di menu Server > Router MikroTik.");
+            }
+            $mikrotik = $mikrotik->forRouter($router);
+
             // Cek koneksi dulu
             if (!$mikrotik->isConnected()) {
                 throw new \Exception("Router MikroTik tidak terhubung!");
@@ -212,6 +232,7 @@ public function activate(Request $request, $id, MikrotikService $mikrotik)
             // 4. Create Mapping di Tabel customer_pppoe_accounts
             CustomerPppoeAccount::create([
                 'customer_id' => $customer->id,
+                'mikrotik_router_id' => $router->id,
                 'username' => $customerIdString,
                 'profile' => $request->pppoe_profile,
                 // Password plain text opsional disimpan atau tidak,
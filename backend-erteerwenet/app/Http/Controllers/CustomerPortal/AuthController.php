@@ -7,6 +7,7 @@
 use Illuminate\Support\Facades\Auth;
 use Illuminate\Support\Facades\Hash;
 use App\Models\Customer;
+use App\Services\PppoeHistoryService;
 
 class AuthController extends Controller
 {
@@ -19,7 +20,7 @@ public function login(Request $request)
 
         $customer = Customer::where('customer_number', $request->customer_number)->first();
 
-        if (!$customer || !Hash::check($request->password, $customer->password)) {
+        if (!$customer || !$customer->verifyPassword($request->password)) {
             return response()->json(['message' => 'ID Pelanggan atau Password salah'], 401);
         }
 
@@ -48,7 +49,7 @@ public function changePassword(Request $request)
         $customer = $request->user(); // Ambil user dari token
 
         // Cek password lama
-        if (!Hash::check($request->current_password, $customer->password)) {
+        if (!$customer->verifyPassword($request->current_password)) {
             return response()->json(['message' => 'Password lama salah'], 400);
         }
 
@@ -60,7 +61,7 @@ public function changePassword(Request $request)
         return response()->json(['message' => 'Password berhasil diubah. Silakan lanjut ke dashboard.']);
     }
 
-    public function dashboard(Request $request)
+    public function dashboard(Request $request, PppoeHistoryService $history)
     {
         // Data untuk dashboard pelanggan (Tagihan, Profil)
         $customer = $request->user();
@@ -70,6 +71,9 @@ public function dashboard(Request $request)
             $q->latest();
         }]);
 
-        return response()->json($customer);
+        // Riwayat koneksi 14 hari terakhir (dari rollup, ringan)
+        return response()->json(array_merge($customer->toArray(), [
+            'connection_history' => $history->customerUptime($customer, 14),
+        ]));
     }
 }
@@ -2,31 +2,70 @@
 
 namespace App\Http\Controllers\Infrastructure;
 
+use App\Http\Controllers\Concerns\CursorListing;
 use App\Http\Controllers\Controller;
+use App\Jobs\PollActiveSessions;
 use App\Services\MikrotikService;
+use App\Services\MikrotikSyncService;
 use App\Models\Customer;
+use App\Models\MikrotikRouter;
 use Illuminate\Http\Request;
 use App\Models\CustomerPppoeAccount;
+use Illuminate\Support\Facades\Cache;
 use Illuminate\Support\Facades\Log;
 
 class MikrotikController extends Controller
 {
+    use CursorListing;
+
     protected $mikrotik;
+    protected $syncer;
 
-    public function __construct(MikrotikService $mikrotik)
+    public function __construct(MikrotikService $mikrotik, MikrotikSyncService $syncer)
     {
         $this->mikrotik = $mikrotik;
+        $this->syncer = $syncer;
     }
 
+    // Kolom & relasi yang boleh diminta lewat ?fields=
+    const LIST_COLUMNS = [
+        'customer_id', 'mikrotik_router_id', 'username', 'password', 'profile', 'local_address', 'remote_address',
+        'caller_id', 'service', 'uptime', 'session_id', 'connected_at', 'last_seen_at', 'created_at', 'updated_at',
+    ];
+
+    const LIST_RELATIONS = [
+        'customer' => ['local' => 'customer_id', 'foreign' => 'id', 'columns' => ['id', 'name', 'customer_number']],
+    ];
+
     /**
-     * Tampilkan data dari Database Lokal (Bukan nembak MikroTik langsung)
+     * Tampilkan data dari Database Lokal (Bukan nembak MikroTik langsung), per halaman (cursor)
      */
-    public function index()
+    public function index(Request $request)
     {
-        // Ambil data dari database lokal, beserta relasi ke customer
-        $accounts = CustomerPppoeAccount::with('customer')->get();
+        $query = CustomerPppoeAccount::query();
+        $this->applyFields($query, $request, self::LIST_COLUMNS, self::LIST_RELATIONS, ['customer']);
+
+        // Search: prefix username (unique index) atau nama/nomor pelanggan
+        if ($request->filled('search')) {
+            $search = trim($request->search);
+            $query->where(function ($q) use ($search) {
+                $q->where('username', 'like', addcslashes($search, '%_\\') . '%')
+                    ->orWhereIn('customer_id', Customer::search($search)->select('customers.id'));
+            });
+        }
+
+        // Filter mapping: synced = sudah terhubung ke pelanggan
+        if ($request->input('sync_status') === 'synced') {
+            $query->whereNotNull('customer_id');
+        } elseif ($request->input('sync_status') === 'unsynced') {
+            $query->whereNull('customer_id');
+        }
 
-        return response()->json($accounts);
+        if ($request->filled('router_id')) {
+            $query->where('mikrotik_router_id', $request->router_id);
+        }
+
+        return $this->cursorResponse($query, $request);
     }
 
     /**
@@ -35,103 +74,25 @@ public function index()
     public function sync(Request $request)
     {
         try {
-            if (!$this->mikrotik->isConnected()) {
-                return response()->json(['message' => 'Gagal koneksi ke MikroTik'], 500);
+            // Opsional: pilih router lewat router_id, default router utama
+            $syncer = $this->syncer;
+            $mikrotik = $this->mikrotik;
+            if ($request->filled('router_id')) {
+                $router = MikrotikRouter::findOrFail($request->router_id);
+                $syncer = $syncer->forRouter($router);
+                $mikrotik = $mikrotik->forRouter($router);
             }
 
-            // 1. Ambil Data dari MikroTik (Secrets & Active)
-            $secrets = $this->mikrotik->getPppSecrets();
-            $actives = $this->mikrotik->getActivePppConnections();
-
-            // Buat Map Active Connections biar pencarian cepat (Key: username)
-            $activeMap = [];
-            foreach ($actives as $conn) {
-                if (isset($conn['name'])) {
-                    $activeMap[$conn['name']] = $conn;
-                }
+            if (!$mikrotik->isConnected()) {
+                return response()->json(['message' => 'Gagal koneksi ke MikroTik'], 500);
             }
 
-            $syncedCount = 0;
-            $newCount = 0;
-
-            foreach ($secrets as $secret) {
-                $name = $secret['name'] ?? null;
-                if (!$name) continue;
-
-                // A. Ambil Data Statis (Dari Secret)
-                // Sanitasi: Ubah '-' jadi null
-                $localAddress = ($secret['local-address'] ?? '-') === '-' ? null : $secret['local-address'];
-                $remoteAddress = ($secret['remote-address'] ?? '-') === '-' ? null : $secret['remote-address'];
-                $callerId = ($secret['caller-id'] ?? '-') === '-' ? null : $secret['caller-id'];
-
-                // B. Ambil Data Dinamis (Dari Active Connection jika ada)
-                $activeData = [];
-                if (isset($activeMap[$name])) {
-                    $userActive = $activeMap[$name];
-
-                    // Prioritaskan data Live untuk Address & Caller ID
-                    if (isset($userActive['address'])) $remoteAddress = $userActive['address'];
-                    if (isset($userActive['caller-id'])) $callerId = $userActive['caller-id'];
-
-                    $activeData = [
-                        'service' => $userActive['service'] ?? 'pppoe',
-                        'uptime' => $userActive['uptime'] ?? null,
-                        'session_id' => $userActive['.id'] ?? null,
-                        'encoding' => $userActive['encoding'] ?? null,
-                        'limit_bytes_in' => $userActive['limit-bytes-in'] ?? '0',
-                        'limit_bytes_out' => $userActive['limit-bytes-out'] ?? '0',
-                        'radius' => $userActive['radius'] ?? 'false',
-                        'last_seen_at' => now(),
-                    ];
-                } else {
-                    // Jika Offline, reset data dinamis agar tidak menyimpan data basi
-                    $activeData = [
-                        'service' => 'pppoe',
-                        'uptime' => null,
-                        'session_id' => null,
-                        'encoding' => null,
-                        'limit_bytes_in' => null, // Atau biarkan nilai terakhir (opsional)
-                        'limit_bytes_out' => null,
-                        'radius' => 'false',
-                        // 'last_seen_at' tidak diupdate biar ketahuan kapan terakhir onlinenya
-                    ];
-                }
-
-                // C. Siapkan Data Final untuk DB
-                $dataToUpdate = array_merge([
-                    'password' => $secret['password'] ?? '',
-                    'profile' => $secret['profile'] ?? 'default',
-                    'local_address' => $localAddress,
-                    'remote_address' => $remoteAddress,
-                    'caller_id' => $callerId,
-                ], $activeData);
-
-
-                // --- LOGIKA AUTO-CONNECT (Sama seperti sebelumnya) ---
-                $matchedCustomer = Customer::where('customer_number', $name)->first();
-                $currentAccount = CustomerPppoeAccount::where('username', $name)->first();
-
-                if ($matchedCustomer && (!$currentAccount || is_null($currentAccount->customer_id))) {
-                    $dataToUpdate['customer_id'] = $matchedCustomer->id;
-                }
-                // -----------------------------------------------------
-
-                // D. Eksekusi Simpan ke DB
-                $account = CustomerPppoeAccount::updateOrCreate(
-                    ['username' => $name],
-                    $dataToUpdate
-                );
-
-                if ($account->wasRecentlyCreated) {
-                    $newCount++;
-                } else {
-                    $syncedCount++;
-                }
-            }
+            $report = $syncer->syncSecrets();
 
             return response()->json([
-                'message' => "Sinkronisasi Selesai. {$newCount} data baru, {$syncedCount} data diperbarui.",
-                'total' => $newCount + $syncedCount
+                'message' => "Sinkronisasi Selesai. {$report['inserted']} data baru, {$report['updated']} data diperbarui, {$report['unchanged']} tidak berubah.",
+                'total' => $report['total'],
+                'report' => $report,
             ]);
         } catch (\Exception $e) {
             return response()->json(['message' => 'Sync Error: ' . $e->getMessage()], 500);
@@ -141,44 +102,18 @@ public function sync(Request $request)
     public function syncCustomers()
     {
         try {
-            // 1. Ambil data dari MikroTik
-            $secrets = $this->mikrotik->getPppSecrets();
-
-            $synced = 0;
-            $new = 0;
-
-            foreach ($secrets as $secret) {
-                // Asumsi: 'name' di secret adalah ID Pelanggan atau Username unik
-                // Kita coba cari customer berdasarkan name (username di mikrotik)
-                // Atau jika belum ada, kita bisa buat (opsional)
-
-                // Contoh Logic: Mapping berdasarkan kolom 'name' di MikroTik == 'customer_number' di DB
-                $customer = Customer::where('customer_number', $secret['name'])->first();
-
-                if ($customer) {
-                    // Jika ketemu, kita update status paketnya atau info lainnya
-                    // Misal service profile di mikrotik = paket di database (perlu mapping ID)
-                    $customer->notes = "Synced from MikroTik Profile: " . ($secret['profile'] ?? '-');
-                    $customer->save();
-                    $synced++;
-                } else {
-                    // OPSI: Jika mau auto-create customer dari MikroTik
-                    // Customer::create([...]);
-                    // $new++;
-
-                    // Untuk sekarang kita log saja yang tidak ketemu
-                    Log::info("MikroTik Secret {$secret['name']} tidak ditemukan di database lokal.");
-                }
-            }
+            // Mapping: 'name' di MikroTik == 'customer_number' di DB
+            $report = $this->syncer->syncCustomerNotes();
 
             return response()->json([
                 'message' => "Sinkronisasi selesai.",
                 'details' => [
-                    'total_mikrotik' => count($secrets),
-                    'synced_db' => $synced,
-                    'new_db' => $new
+                    'total_mikrotik' => $report['total_mikrotik'],
+                    'synced_db' => $report['synced_db'],
+                    'new_db' => $report['new_db']
                 ],
-                'data_preview' => array_slice($secrets, 0, 5) // Kirim 5 data sampel buat debug
+                'timings' => $report['timings'],
+                'data_preview' => $report['preview'] // Kirim 5 data sampel buat debug
             ]);
         } catch (\Exception $e) {
             return response()->json(['message' => 'Error: ' . $e->getMessage()], 500);
@@ -240,8 +175,7 @@ public function mapCustomer(Request $request)
 
             // 3. Cek Koneksi Aktif (Online State) -> Timpa data default dengan data live
             if ($this->mikrotik->isConnected()) {
-                $actives = $this->mikrotik->getActivePppConnections();
-                $userActive = collect($actives)->firstWhere('name', $request->mikrotik_name);
+                $userActive = $this->mikrotik->getActivePppConnection($request->mikrotik_name);
 
                 if ($userActive) {
                     // Prioritaskan data Live untuk Address & Caller ID
@@ -424,6 +358,7 @@ public function getProfiles()
 
     /**
      * Tampilkan Data Monitoring dari Database Lokal
+     * Data sesi diisi oleh PollActiveSessions, endpoint ini tidak pernah menunggu router.
      */
     public function monitorCustomers()
     {
@@ -434,13 +369,21 @@ public function monitorCustomers()
                 ->with(['pppoe_account', 'package'])
                 ->get();
 
+            $lastPoll = Cache::get(PollActiveSessions::SNAPSHOT_KEY);
+
             $monitoringData = $customers->map(function ($customer) {
                 if (!$customer->pppoe_account) return null;
 
                 $account = $customer->pppoe_account;
 
-                // Logika Status: Jika 'uptime' atau 'session_id' ada isinya, berarti Online
-                $isOnline = !empty($account->session_id) && !empty($account->uptime);
+                // Logika Status: Jika 'session_id' ada isinya, berarti Online
+                $isOnline = !empty($account->session_id);
+
+                // Uptime live dihitung dari connected_at, bukan nilai uptime saat terakhir ditulis
+                $uptime = $account->uptime ?? '-';
+                if ($isOnline && $account->connected_at) {
+                    $uptime = MikrotikSyncService::secondsToUptime((int) $account->connected_at->diffInSeconds(now(), true));
+                }
 
                 return [
                     'id' => $customer->id,
@@ -450,7 +393,7 @@ public function monitorCustomers()
                     'pppoe_user' => $account->username,
                     'status' => $isOnline ? 'online' : 'offline',
                     'ip_address' => $account->remote_address ?? '-',
-                    'uptime' => $account->uptime ?? '-',
+                    'uptime' => $uptime,
                     'caller_id' => $account->caller_id ?? '-',
                     'last_seen' => $account->last_seen_at, // Opsional: info kapan terakhir online
                 ];
@@ -467,7 +410,9 @@ public function monitorCustomers()
 
             return response()->json([
                 'stats' => $stats,
-                'data' => $monitoringData
+                'data' => $monitoringData,
+                'polled_at' => $lastPoll['polled_at'] ?? null,
+                'poll_error' => $lastPoll['error'] ?? null,
             ]);
         } catch (\Exception $e) {
             return response()->json(['message' => 'Error monitoring: ' . $e->getMessage()], 500);
@@ -476,57 +421,15 @@ public function monitorCustomers()
 
     /**
      * Sync Data Active Connection (Update Status Online/Offline)
+     * Poll dijalankan di queue (PollActiveSessions), endpoint ini hanya memicu poll lebih awal.
      */
     public function syncActive()
     {
-        try {
-            if (!$this->mikrotik->isConnected()) {
-                return response()->json(['message' => 'Gagal koneksi ke MikroTik'], 500);
-            }
-
-            // 1. Ambil Data Aktif dari MikroTik
-            $actives = $this->mikrotik->getActivePppConnections();
-            $activeUsernames = [];
-
-            // 2. Update Akun yang sedang ONLINE
-            foreach ($actives as $active) {
-                $username = $active['name'] ?? null;
-                if (!$username) continue;
-
-                $activeUsernames[] = $username; // Simpan username yang online
-
-                // Update data realtime ke database
-                CustomerPppoeAccount::where('username', $username)->update([
-                    'service' => $active['service'] ?? 'pppoe',
-                    'uptime' => $active['uptime'] ?? null,
-                    'session_id' => $active['.id'] ?? null,
-                    'encoding' => $active['encoding'] ?? null,
-                    'limit_bytes_in' => $active['limit-bytes-in'] ?? '0',
-                    'limit_bytes_out' => $active['limit-bytes-out'] ?? '0',
-                    'radius' => $active['radius'] ?? 'false',
-                    'caller_id' => $active['caller-id'] ?? null,
-                    'remote_address' => $active['address'] ?? null, // IP Client
-                    'last_seen_at' => now(),
-                ]);
-            }
-
-            // 3. Update Akun yang OFFLINE (Reset session data)
-            // Semua akun di database yang username-nya TIDAK ADA di daftar $activeUsernames
-            // berarti sedang Offline. Kita reset data sesinya.
-            CustomerPppoeAccount::whereNotIn('username', $activeUsernames)->update([
-                'uptime' => null,
-                'session_id' => null,
-                'encoding' => null,
-                // 'caller_id' => null, // Opsional: Jangan hapus caller_id biar ada history
-                // 'remote_address' => null, // Opsional: Jangan hapus IP biar ada history
-            ]);
+        PollActiveSessions::dispatch();
 
-            return response()->json([
-                'message' => 'Sinkronisasi status koneksi berhasil.',
-                'online_count' => count($activeUsernames)
-            ]);
-        } catch (\Exception $e) {
-            return response()->json(['message' => 'Sync Error: ' . $e->getMessage()], 500);
-        }
+        return response()->json([
+            'message' => 'Sinkronisasi status koneksi dijadwalkan.',
+            'last_poll' => Cache::get(PollActiveSessions::SNAPSHOT_KEY),
+        ], 202);
     }
 }
@@ -5,15 +5,18 @@
 use App\Http\Controllers\Controller;
 use App\Models\MikrotikProfile;
 use App\Services\MikrotikService;
+use App\Services\MikrotikSyncService;
 use Illuminate\Http\Request;
 
 class MikrotikProfileController extends Controller
 {
     protected $mikrotik;
+    protected $syncer;
 
-    public function __construct(MikrotikService $mikrotik)
+    public function __construct(MikrotikService $mikrotik, MikrotikSyncService $syncer)
     {
         $this->mikrotik = $mikrotik;
+        $this->syncer = $syncer;
     }
 
     // 1. Get Data dari DB Lokal (Cepat)
@@ -30,24 +33,12 @@ public function sync()
                 return response()->json(['message' => 'Gagal koneksi ke MikroTik'], 500);
             }
 
-            $profiles = $this->mikrotik->getPppProfiles();
-            $count = 0;
-
-            foreach ($profiles as $p) {
-                MikrotikProfile::updateOrCreate(
-                    ['name' => $p['name']],
-                    [
-                        'local_address' => $p['local-address'] ?? null,
-                        'remote_address' => $p['remote-address'] ?? null,
-                        'rate_limit' => $p['rate-limit'] ?? null,
-                        'dns_server' => $p['dns-server'] ?? null,
-                        'default' => ($p['default'] ?? 'false') === 'true'
-                    ]
-                );
-                $count++;
-            }
+            $report = $this->syncer->syncProfiles();
 
-            return response()->json(['message' => "Berhasil sync {$count} profile."]);
+            return response()->json([
+                'message' => "Berhasil sync {$report['total']} profile.",
+                'report' => $report,
+            ]);
         } catch (\Exception $e) {
             return response()->json(['message' => $e->getMessage()], 500);
         }
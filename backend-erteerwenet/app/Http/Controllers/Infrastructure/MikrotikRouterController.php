@@ -0,0 +1,89 @@
+<?php
+
+namespace App\Http\Controllers\Infrastructure;
+
+use App\Http\Controllers\Controller;
+use App\Models\MikrotikRouter;
+use App\Services\MikrotikService;
+use Illuminate\Http\Request;
+
+class MikrotikRouterController extends Controller
+{
+    // List Router (password tidak ikut dikirim)
+    public function index()
+    {
+        return response()->json(MikrotikRouter::with('olt')->orderBy('id')->get());
+    }
+
+    public function store(Request $request)
+    {
+        $validated = $request->validate([
+            'name' => 'required|string|max:255',
+            'host' => 'required|string|max:255',
+            'port' => 'required|integer|min:1|max:65535',
+            'username' => 'required|string|max:255',
+            'password' => 'required|string',
+            'olt_id' => 'nullable|exists:olts,id',
+            'is_default' => 'boolean',
+            'is_active' => 'boolean',
+        ]);
+
+        $router = MikrotikRouter::create($validated);
+        $this->ensureSingleDefault($router);
+
+        return response()->json($router, 201);
+    }
+
+    public function update(Request $request, $id)
+    {
+        $router = MikrotikRouter::findOrFail($id);
+
+        $validated = $request->validate([
+            'name' => 'sometimes|required|string|max:255',
+            'host' => 'sometimes|required|string|max:255',
+            'port' => 'sometimes|required|integer|min:1|max:65535',
+            'username' => 'sometimes|required|string|max:255',
+            'password' => 'nullable|string', // Kosong = password lama tetap dipakai
+            'olt_id' => 'nullable|exists:olts,id',
+            'is_default' => 'boolean',
+            'is_active' => 'boolean',
+        ]);
+
+        if (empty($validated['password'])) {
+            unset($validated['password']);
+        }
+
+        $router->update($validated);
+        $this->ensureSingleDefault($router);
+
+        return response()->json($router);
+    }
+
+    public function destroy($id)
+    {
+        $router = MikrotikRouter::findOrFail($id);
+        $router->delete();
+
+        return response()->json(['message' => 'Router deleted successfully']);
+    }
+
+    // Tes koneksi ke router (ikut circuit breaker & timeout interaktif)
+    public function test($id, MikrotikService $mikrotik)
+    {
+        $router = MikrotikRouter::findOrFail($id);
+
+        if (!$mikrotik->forRouter($router)->isConnected()) {
+            return response()->json(['message' => "Gagal koneksi ke {$router->name}"], 500);
+        }
+
+        return response()->json(['message' => "Berhasil terhubung ke {$router->name}"]);
+    }
+
+    // Hanya boleh ada satu router default
+    protected function ensureSingleDefault(MikrotikRouter $router)
+    {
+        if ($router->is_default) {
+            MikrotikRouter::where('id', '!=', $router->id)->update(['is_default' => false]);
+        }
+    }
+}
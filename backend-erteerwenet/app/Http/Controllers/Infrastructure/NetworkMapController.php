@@ -7,96 +7,174 @@
 use App\Models\Odc;
 use App\Models\Odp;
 use App\Models\Customer;
+use App\Services\NetworkMapService;
+use Illuminate\Http\JsonResponse;
 use Illuminate\Http\Request;
 
 class NetworkMapController extends Controller
 {
-    public function index()
+    /**
+     * Marker per viewport: cluster di zoom rendah, titik individual di zoom tinggi.
+     * Detail marker tidak ikut dikirim (lihat show).
+     */
+    public function index(Request $request, NetworkMapService $map)
     {
-        $locations = collect();
-
-        // 1. Ambil OLT
-        $olts = Olt::all()->map(function ($olt) {
-            return [
-                'id' => 'olt-' . $olt->id, // Prefix ID biar unik di frontend
-                'name' => $olt->name,
-                'lat' => (float) $olt->latitude,
-                'lng' => (float) $olt->longitude,
-                'address' => $olt->location,
-                'type' => 'olt',
-                'status' => $olt->status,
-                'details' => [
-                    'Merek' => $olt->brand . ' ' . $olt->model,
-                    'IP Address' => $olt->ip_address,
-                    'Total Port' => $olt->total_ports,
-                    'Port Terpakai' => $olt->used_ports,
-                ]
-            ];
-        });
-        $locations = $locations->merge($olts);
-
-        // 2. Ambil ODC
-        $odcs = Odc::with('olt')->get()->map(function ($odc) {
-            return [
-                'id' => 'odc-' . $odc->id,
-                'name' => $odc->name,
-                'lat' => (float) $odc->latitude,
-                'lng' => (float) $odc->longitude,
-                'address' => $odc->location,
-                'type' => 'odc',
-                'status' => $odc->status,
-                'details' => [
-                    'Induk OLT' => $odc->olt ? $odc->olt->name : 'N/A',
-                    'Kapasitas' => $odc->capacity,
-                    'Terpakai' => $odc->used_capacity,
-                ]
-            ];
-        });
-        $locations = $locations->merge($odcs);
-
-        // 3. Ambil ODP
-        $odps = Odp::with('odc')->get()->map(function ($odp) {
-            return [
-                'id' => 'odp-' . $odp->id,
-                'name' => $odp->name,
-                'lat' => (float) $odp->latitude,
-                'lng' => (float) $odp->longitude,
-                'address' => $odp->location,
-                'type' => 'odp',
-                'status' => $odp->status,
-                'details' => [
-                    'Induk ODC' => $odp->odc ? $odp->odc->name : 'N/A',
-                    'Kapasitas' => $odp->capacity,
-                    'Terpakai' => $odp->used_capacity,
-                ]
-            ];
-        });
-        $locations = $locations->merge($odps);
-
-        // 4. Ambil Customer
-        $customers = Customer::with(['odp', 'package'])->get()->map(function ($cust) {
-            return [
-                'id' => 'cust-' . $cust->id,
-                'name' => $cust->name,
-                'lat' => (float) $cust->latitude,
-                'lng' => (float) $cust->longitude,
-                'address' => $cust->address,
-                'type' => 'customer',
-                'status' => $cust->status,
-                'details' => [
-                    'Paket' => $cust->package ? $cust->package->name : 'N/A',
-                    'ODP' => $cust->odp ? $cust->odp->name : 'N/A',
-                    'Telepon' => $cust->phone,
-                ]
-            ];
-        });
-        $locations = $locations->merge($customers);
-
-        // Filter lokasi yang valid (punya lat/lng)
-        $validLocations = $locations->filter(function ($loc) {
-            return !empty($loc['lat']) && !empty($loc['lng']);
-        })->values();
-
-        return response()->json($validLocations);
+        $validated = $request->validate([
+            'north' => 'required|numeric|between:-90,90',
+            'south' => 'required|numeric|between:-90,90|lte:north',
+            'east' => 'required|numeric|between:-180,180',
+            // west > east = viewport melewati antimeridian (zoom sangat rendah), ditangani NetworkMapService
+            'west' => 'required|numeric|between:-180,180',
+            'zoom' => 'required|integer|between:0,22',
+            'type' => 'nullable|in:all,olt,odc,odp,customer',
+            'status' => 'nullable|string|max:20',
+            'search' => 'nullable|string|max:100',
+        ]);
+
+        $params = $map->normalize($validated);
+
+        // Viewport & data belum berubah => 304 tanpa query
+        $response = new JsonResponse();
+        $response->setCache(['etag' => $map->etag($params), 'private' => true, 'no_cache' => true]);
+
+        if ($response->isNotModified($request)) {
+            return $response;
+        }
+
+        return $response->setData(array_merge($map->viewport($params), [
+            'bounds' => array_intersect_key($params, array_flip(['south', 'west', 'north', 'east'])),
+            'totals' => $map->totals(),
+        ]));
+    }
+
+    /**
+     * Export CSV semua lokasi sesuai filter (bukan hanya viewport), lengkap dengan alamat
+     */
+    public function export(Request $request, NetworkMapService $map)
+    {
+        $validated = $request->validate([
+            'type' => 'nullable|in:all,olt,odc,odp,customer',
+            'status' => 'nullable|string|max:20',
+            'search' => 'nullable|string|max:100',
+        ]);
+
+        $rows = $map->export(
+            $validated['type'] ?? 'all',
+            $validated['status'] ?? 'all',
+            trim((string) ($validated['search'] ?? ''))
+        );
+
+        return response()->streamDownload(function () use ($rows) {
+            $output = fopen('php://output', 'w');
+            fputcsv($output, ['Nama', 'Tipe', 'Status', 'Alamat', 'Latitude', 'Longitude']);
+
+            foreach ($rows as $row) {
+                fputcsv($output, [
+                    $row->name,
+                    strtoupper($row->type),
+                    $row->status ?: '-',
+                    $row->address ?: '-',
+                    $row->lat,
+                    $row->lng,
+                ]);
+            }
+
+            fclose($output);
+        }, 'network-infrastructure.csv', ['Content-Type' => 'text/csv']);
+    }
+
+    /**
+     * Detail satu marker (dipanggil saat marker diklik), id format lama: olt-1, odc-2, odp-3, cust-4
+     */
+    public function show($id, NetworkMapService $map)
+    {
+        $parsed = $map->parseId($id);
+        if (!$parsed) {
+            return response()->json(['message' => 'Lokasi tidak ditemukan'], 404);
+        }
+
+        [$type, $key] = $parsed;
+
+        $location = match ($type) {
+            'olt' => $this->oltLocation(Olt::findOrFail($key)),
+            'odc' => $this->odcLocation(Odc::with('olt')->findOrFail($key)),
+            'odp' => $this->odpLocation(Odp::with('odc')->findOrFail($key)),
+            'customer' => $this->customerLocation(Customer::with(['odp', 'package'])->findOrFail($key)),
+        };
+
+        return response()->json($location);
+    }
+
+    protected function oltLocation(Olt $olt): array
+    {
+        return [
+            'id' => 'olt-' . $olt->id, // Prefix ID biar unik di frontend
+            'name' => $olt->name,
+            'lat' => (float) $olt->latitude,
+            'lng' => (float) $olt->longitude,
+            'address' => $olt->location,
+            'type' => 'olt',
+            'status' => $olt->status,
+            'details' => [
+                'Merek' => $olt->brand . ' ' . $olt->model,
+                'IP Address' => $olt->ip_address,
+                'Total Port' => $olt->total_ports,
+                'Port Terpakai' => $olt->used_ports,
+            ]
+        ];
+    }
+
+    protected function odcLocation(Odc $odc): array
+    {
+        return [
+            'id' => 'odc-' . $odc->id,
+            'name' => $odc->name,
+            'lat' => (float) $odc->latitude,
+            'lng' => (float) $odc->longitude,
+            'address' => $odc->location,
+            'type' => 'odc',
+            'status' => $odc->status,
+            'details' => [
+                'Induk OLT' => $odc->olt ? $odc->olt->name : 'N/A',
+                'Kapasitas' => $odc->capacity,
+                'Terpakai' => $odc->used_capacity,
+            ]
+        ];
+    }
+
+    protected function odpLocation(Odp $odp): array
+    {
+        return [
+            'id' => 'odp-' . $odp->id,
+            'name' => $odp->name,
+            'lat' => (float) $odp->latitude,
+            'lng' => (float) $odp->longitude,
+            'address' => $odp->location,
+            'type' => 'odp',
+            'status' => $odp->status,
+            'details' => [
+                'Induk ODC' => $odp->odc ? $odp->odc->name : 'N/A',
+                'Kapasitas' => $odp->capacity,
+                'Terpakai' => $odp->used_capacity,
+            ]
+        ];
+    }
+
+    protected function customerLocation(Customer $cust): array
+    {
+        return [
+            'id' => 'cust-' . $cust->id,
+            'name' => $cust->name,
+            'lat' => (float) $cust->latitude,
+            'lng' => (float) $cust->longitude,
+            'address' => $cust->address,
+            'type' => 'customer',
+            'status' => $cust->status,
+            'details' => [
+                'Paket' => $cust->package ? $cust->package->name : 'N/A',
+                'ODP' => $cust->odp ? $cust->odp->name . ($cust->odp_port ? " (Port {$cust->odp_port})" : '') : 'N/A',
+                'Telepon' => $cust->phone,
+            ]
+        ];
     }
 }
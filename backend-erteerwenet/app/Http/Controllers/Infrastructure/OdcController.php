@@ -56,7 +56,6 @@ public function store(Request $request)
             'location' => 'required|string',
             'olt_id' => 'required|exists:olts,id', // Pastikan OLT ID ada di tabel olts
             'capacity' => 'required|integer|min:1',
-            'used_capacity' => 'required|integer|min:0|lte:capacity',
             'status' => 'required|in:active,inactive,maintenance',
             'latitude' => 'nullable|numeric',
             'longitude' => 'nullable|numeric',
@@ -82,7 +81,6 @@ public function update(Request $request, $id)
             'location' => 'sometimes|required|string',
             'olt_id' => 'sometimes|required|exists:olts,id',
             'capacity' => 'sometimes|required|integer|min:1',
-            'used_capacity' => 'sometimes|required|integer|min:0',
             'status' => 'sometimes|required|in:active,inactive,maintenance',
             'latitude' => 'nullable|numeric',
             'longitude' => 'nullable|numeric',
@@ -55,7 +55,6 @@ public function store(Request $request)
             'location' => 'required|string',
             'odc_id' => 'required|exists:odcs,id', // Pastikan ODC ID valid
             'capacity' => 'required|integer|min:1',
-            'used_capacity' => 'required|integer|min:0|lte:capacity',
             'status' => 'required|in:active,inactive,maintenance',
             'latitude' => 'nullable|numeric',
             'longitude' => 'nullable|numeric',
@@ -79,8 +78,8 @@ public function update(Request $request, $id)
             'name' => 'sometimes|required|string|max:255',
             'location' => 'sometimes|required|string',
             'odc_id' => 'sometimes|required|exists:odcs,id',
-            'capacity' => 'sometimes|required|integer|min:1',
-            'used_capacity' => 'sometimes|required|integer|min:0',
+            // Kapasitas tidak boleh lebih kecil dari nomor port yang sedang dipakai
+            'capacity' => 'sometimes|required|integer|min:' . max(1, (int) $odp->customers()->max('odp_port')),
             'status' => 'sometimes|required|in:active,inactive,maintenance',
             'latitude' => 'nullable|numeric',
             'longitude' => 'nullable|numeric',
@@ -109,8 +108,11 @@ public function getByOdc($odcId)
     // Endpoint: Ambil ODP yang masih punya slot kosong (untuk pendaftaran pelanggan)
     public function getAvailable()
     {
-        // Cari ODP yang used_capacity < capacity
-        $odps = Odp::whereRaw('used_capacity < capacity')->get();
+        // used_capacity = jumlah port terisi (customers.odp_port), dijaga PortService
+        $odps = Odp::whereColumn('used_capacity', '<', 'capacity')
+            ->get()
+            ->each(fn ($odp) => $odp->setAttribute('available_ports', $odp->capacity - $odp->used_capacity));
+
         return response()->json($odps);
     }
 }
\ No newline at end of file
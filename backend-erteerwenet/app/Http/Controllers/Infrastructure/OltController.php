@@ -51,7 +51,6 @@ public function store(Request $request)
             'brand' => 'required|string',
             'model' => 'required|string',
             'total_ports' => 'required|integer|min:1',
-            'used_ports' => 'required|integer|min:0|lte:total_ports',
             'status' => 'required|in:active,inactive,maintenance',
             'latitude' => 'nullable|numeric',
             'longitude' => 'nullable|numeric',
@@ -78,7 +77,6 @@ public function update(Request $request, $id)
             'brand' => 'sometimes|required|string',
             'model' => 'sometimes|required|string',
             'total_ports' => 'sometimes|required|integer|min:1',
-            'used_ports' => 'sometimes|required|integer|min:0', // Validasi lte:total_ports agak tricky di update partial, bisa diskip atau dicek manual
             'status' => 'sometimes|required|in:active,inactive,maintenance',
             'latitude' => 'nullable|numeric',
             'longitude' => 'nullable|numeric',
@@ -99,9 +97,10 @@ public function destroy($id)
 
     public function getAvailablePorts($id)
     {
+        // used_ports = jumlah ODC di OLT ini, dijaga PortService
         $olt = Olt::findOrFail($id);
-        $available = $olt->total_ports - $olt->used_ports;
-        
+        $available = max(0, $olt->total_ports - $olt->used_ports);
+
         return response()->json(['available_ports' => $available]);
     }
 }
\ No newline at end of file
@@ -4,68 +4,131 @@
 
 use App\Http\Controllers\Controller;
 use App\Models\Odp;
-use App\Models\Customer;
+use App\Services\PortService;
 use Illuminate\Http\Request;
+use Illuminate\Support\Facades\DB;
 
 class PortMonitoringController extends Controller
 {
-    public function index(Request $request)
+    public function index(Request $request, PortService $ports)
     {
-        // Ambil semua ODP beserta relasi ODC dan Customer
-        // Kita perlu data customer untuk tahu port mana saja yang dipakai
-        $odps = Odp::with(['odc', 'customers'])->get();
-
-        // Transformasi data agar sesuai dengan kebutuhan chart frontend
-        $data = $odps->map(function ($odp) {
-            $ports = [];
-            // Loop sebanyak kapasitas ODP (misal 8 port)
-            for ($i = 1; $i <= $odp->capacity; $i++) {
-                // Cari customer yang pakai port ini (Logic sederhana: asumsi kita nanti simpan port_number di customer)
-                // *Catatan: Di tabel customer saat ini belum ada kolom 'port_number'. 
-                // Untuk sekarang kita simulasi saja berdasarkan urutan atau random agar tidak error.
-                // Idealnya nanti tambah kolom 'odp_port_number' di tabel customers.
-
-                // Simulasi logic port:
-                // Kita anggap customer yang terhubung ke ODP ini memakan port secara berurutan
-                $customer = $odp->customers->skip($i - 1)->first();
-
-                if ($odp->status === 'maintenance') {
-                    $status = 'maintenance';
-                } elseif ($customer) {
-                    $status = $customer->status === 'active' ? 'used' : 'maintenance'; // inactive dianggap maintenance/problem
-                } else {
-                    $status = 'available';
-                }
-
-                $ports[] = [
-                    'portNumber' => $i,
-                    'status' => $status,
-                    'customerName' => $customer ? $customer->name : null,
-                    'customerId' => $customer ? $customer->id : null,
-                ];
+        $query = Odp::query();
+
+        // 1. Filter Search (Nama / Lokasi ODP)
+        if ($request->filled('search')) {
+            $search = $request->search;
+            $query->where(function ($q) use ($search) {
+                $q->where('name', 'like', "%{$search}%")
+                  ->orWhere('location', 'like', "%{$search}%");
+            });
+        }
+
+        // 2. Filter Status ODP
+        if ($request->filled('status') && $request->status != 'all') {
+            $query->where('status', $request->status);
+        }
+
+        // 3. Filter ODC / OLT
+        if ($request->filled('odc_id') && $request->odc_id != 'all') {
+            $query->where('odc_id', $request->odc_id);
+        }
+        if ($request->filled('olt_id') && $request->olt_id != 'all') {
+            $query->whereIn('odc_id', fn ($q) => $q->select('id')->from('odcs')->where('olt_id', $request->olt_id));
+        }
+
+        // 4. Filter Utilisasi (counter used_capacity, dijaga PortService)
+        $rate = 'used_capacity * 100 / NULLIF(capacity, 0)';
+        match ($request->input('utilization')) {
+            'high' => $query->whereRaw("{$rate} >= ?", [PortService::HIGH_UTILIZATION]),
+            'medium' => $query->whereRaw("{$rate} >= ? AND {$rate} < ?", [PortService::MEDIUM_UTILIZATION, PortService::HIGH_UTILIZATION]),
+            'low' => $query->whereRaw("COALESCE({$rate}, 0) < ?", [PortService::MEDIUM_UTILIZATION]),
+            default => null,
+        };
+
+        // 5. Ringkasan seluruh hasil filter dalam satu query agregat
+        $totals = (clone $query)->toBase()->first([
+            DB::raw('COUNT(*) as odps'),
+            DB::raw('COALESCE(SUM(capacity), 0) as total_ports'),
+            DB::raw('COALESCE(SUM(LEAST(used_capacity, capacity)), 0) as used_ports'),
+            DB::raw("COALESCE(SUM(CASE WHEN status = 'maintenance' THEN capacity ELSE 0 END), 0) as maintenance_ports"),
+            DB::raw("SUM(CASE WHEN {$rate} >= " . PortService::HIGH_UTILIZATION . ' THEN 1 ELSE 0 END) as high_odps'),
+            DB::raw('SUM(CASE WHEN used_capacity >= capacity THEN 1 ELSE 0 END) as full_odps'),
+        ]);
+
+        // 6. Pagination
+        $size = min((int) $request->input('size', 10), 100);
+        $page = $request->input('page', 1);
+
+        $odps = $query->with('odc:id,name')->orderBy('name')->paginate($size, ['*'], 'page', $page);
+
+        // Okupansi halaman ini: satu GROUP BY, peta port hanya jika diminta
+        $ids = collect($odps->items())->pluck('id')->all();
+        $occupancy = $ports->occupancy($ids);
+        $portMaps = $request->boolean('with_ports') ? $ports->portMaps($ids) : null;
+
+        $data = collect($odps->items())->map(function ($odp) use ($ports, $occupancy, $portMaps) {
+            $row = $this->summarize($odp, $occupancy->get($odp->id));
+
+            if ($portMaps) {
+                $row['ports'] = $ports->ports($odp, $portMaps->get($odp->id, collect()));
             }
 
-            // Hitung utilisasi
-            $utilizationRate = $odp->capacity > 0 ? ($odp->used_capacity / $odp->capacity) * 100 : 0;
-
-            return [
-                'id' => $odp->id,
-                'name' => $odp->name,
-                'location' => $odp->location,
-                'capacity' => $odp->capacity,
-                'usedPorts' => $odp->used_capacity,
-                'odcId' => $odp->odc_id,
-                'odcName' => $odp->odc ? $odp->odc->name : 'Unknown',
-                'odcPort' => 0, // Data ini belum ada di DB, default 0
-                'status' => $odp->status, // active, inactive, maintenance
-                'type' => 'distribution', // Default dulu
-                'customerCount' => $odp->customers->count(),
-                'ports' => $ports,
-                'utilizationRate' => $utilizationRate,
-                'availablePorts' => $odp->capacity - $odp->used_capacity
-            ];
+            return $row;
         });
 
-        return response()->json($data);
+        $totalPorts = (int) $totals->total_ports;
+        $usedPorts = (int) $totals->used_ports;
+
+        return response()->json([
+            'data' => $data,
+            'total' => $odps->total(),
+            'page' => $odps->currentPage(),
+            'size' => $odps->perPage(),
+            'summary' => [
+                'totalOdps' => (int) $totals->odps,
+                'totalPorts' => $totalPorts,
+                'usedPorts' => $usedPorts,
+                'availablePorts' => $totalPorts - $usedPorts,
+                'maintenancePorts' => (int) $totals->maintenance_ports,
+                'utilizationRate' => $totalPorts > 0 ? ($usedPorts / $totalPorts) * 100 : 0,
+                'highUtilizationOdps' => (int) $totals->high_odps,
+                'fullOdps' => (int) $totals->full_odps,
+            ],
+        ]);
+    }
+
+    /**
+     * Detail port satu ODP (grid port di halaman monitoring)
+     */
+    public function show($id, PortService $ports)
+    {
+        $odp = Odp::with('odc:id,name')->findOrFail($id);
+
+        $row = $this->summarize($odp, $ports->occupancy([$odp->id])->get($odp->id));
+        $row['ports'] = $ports->ports($odp, $ports->portMaps([$odp->id])->get($odp->id, collect()));
+
+        return response()->json($row);
+    }
+
+    protected function summarize(Odp $odp, $occupancy): array
+    {
+        $used = (int) ($occupancy->used ?? 0);
+
+        return [
+            'id' => $odp->id,
+            'name' => $odp->name,
+            'location' => $odp->location,
+            'capacity' => $odp->capacity,
+            'usedPorts' => $used,
+            'odcId' => $odp->odc_id,
+            'odcName' => $odp->odc ? $odp->odc->name : 'Unknown',
+            'odcPort' => 0, // Data ini belum ada di DB, default 0
+            'status' => $odp->status, // active, inactive, maintenance
+            'type' => 'distribution', // Default dulu
+            'customerCount' => $used,
+            'activeCustomers' => (int) ($occupancy->active ?? 0),
+            'utilizationRate' => $odp->capacity > 0 ? ($used / $odp->capacity) * 100 : 0,
+            'availablePorts' => max(0, $odp->capacity - $used),
+        ];
     }
 }
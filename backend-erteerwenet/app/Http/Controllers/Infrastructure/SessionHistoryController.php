@@ -0,0 +1,69 @@
+<?php
+
+namespace App\Http\Controllers\Infrastructure;
+
+use App\Http\Controllers\Controller;
+use App\Models\Customer;
+use App\Services\PppoeHistoryService;
+use Illuminate\Http\Request;
+
+class SessionHistoryController extends Controller
+{
+    protected $history;
+
+    public function __construct(PppoeHistoryService $history)
+    {
+        $this->history = $history;
+    }
+
+    /**
+     * Uptime / SLA satu pelanggan (default 30 hari)
+     */
+    public function customerUptime(Request $request, $id)
+    {
+        $customer = Customer::findOrFail($id);
+        $days = min(365, max(1, (int) $request->input('days', 30)));
+
+        return response()->json([
+            'status' => 'success',
+            'data' => array_merge(
+                ['customer_id' => $customer->id, 'name' => $customer->name],
+                $this->history->customerUptime($customer, $days)
+            ),
+        ]);
+    }
+
+    /**
+     * Availability per ODP / ODC / OLT (paling sering putus di atas)
+     */
+    public function availability(Request $request)
+    {
+        $request->validate([
+            'level' => 'nullable|in:odp,odc,olt',
+            'days' => 'nullable|integer|min:1|max:365',
+        ]);
+
+        $level = $request->input('level', 'odp');
+        $days = (int) $request->input('days', 7);
+
+        return response()->json([
+            'status' => 'success',
+            'level' => $level,
+            'days' => $days,
+            'data' => $this->history->availability($level, $days),
+        ]);
+    }
+
+    /**
+     * Puncak sesi bersamaan per hari (seluruh jaringan)
+     */
+    public function network(Request $request)
+    {
+        $days = min(365, max(1, (int) $request->input('days', 30)));
+
+        return response()->json([
+            'status' => 'success',
+            'data' => $this->history->network($days),
+        ]);
+    }
+}
@@ -8,6 +8,7 @@
 use Illuminate\Http\Request;
 use App\Models\CustomerPppoeAccount;
 use Illuminate\Support\Facades\Log;
+use Illuminate\Support\LazyCollection;
 
 class MikrotikController extends Controller
 {
@@ -24,14 +25,14 @@ public function __construct(MikrotikService $mikrotik)
     public function index()
     {
         try {
-            // 1. Ambil Data dari MikroTik
-            $secrets = $this->mikrotik->getPppSecrets();
+            // 1. Ambil Data dari MikroTik (diiterasi per baris)
+            $secrets = LazyCollection::make(fn () => $this->mikrotik->streamPppSecrets());
 
             // 2. Ambil Data Mapping dari Database (Eager Load Customer)
             // Kita ambil semua dan jadikan Key-Value pair berdasarkan username biar pencarian cepat
             $dbAccounts = CustomerPppoeAccount::with('customer')->get()->keyBy('username');
 
-            $data = collect($secrets)->map(function ($secret) use ($dbAccounts) {
+            $data = $secrets->map(function ($secret) use ($dbAccounts) {
                 $name = $secret['name'] ?? 'Unknown';
 
                 // Cek apakah ada di database berdasarkan username
@@ -67,13 +68,16 @@ public function index()
     public function syncCustomers()
     {
         try {
-            // 1. Ambil data dari MikroTik
-            $secrets = $this->mikrotik->getPppSecrets();
-
             $synced = 0;
             $new = 0;
+            $total = 0;
+            $preview = [];
+
+            // 1. Ambil data dari MikroTik (diiterasi per baris)
+            foreach ($this->mikrotik->streamPppSecrets() as $secret) {
+                $total++;
+                if (count($preview) < 5) $preview[] = $secret;
 
-            foreach ($secrets as $secret) {
                 // Asumsi: 'name' di secret adalah ID Pelanggan atau Username unik
                 // Kita coba cari customer berdasarkan name (username di mikrotik)
                 // Atau jika belum ada, kita bisa buat (opsional)
@@ -100,11 +104,11 @@ public function syncCustomers()
             return response()->json([
                 'message' => "Sinkronisasi selesai.",
                 'details' => [
-                    'total_mikrotik' => count($secrets),
+                    'total_mikrotik' => $total,
                     'synced_db' => $synced,
                     'new_db' => $new
                 ],
-                'data_preview' => array_slice($secrets, 0, 5) // Kirim 5 data sampel buat debug
+                'data_preview' => $preview // Kirim 5 data sampel buat debug
             ]);
         } catch (\Exception $e) {
             return response()->json(['message' => 'Error: ' . $e->getMessage()], 500);
@@ -2,29 +2,43 @@
 
 namespace App\Http\Controllers\Services;
 
+use App\Http\Controllers\Concerns\CursorListing;
 use App\Http\Controllers\Controller;
+use App\Jobs\GenerateInvoices;
 use App\Models\Payment;
 use App\Models\Customer;
 use App\Models\Subscription;
+use App\Services\StatsService;
 use Illuminate\Http\Request;
 use Illuminate\Support\Str;
 use Carbon\Carbon;
+use Illuminate\Support\Facades\Cache;
 use Illuminate\Support\Facades\DB;
 
 class PaymentController extends Controller
 {
-    // List Pembayaran
-    public function index(Request $request)
+    use CursorListing;
+
+    // Kolom & relasi yang boleh diminta lewat ?fields=
+    const LIST_COLUMNS = [
+        'customer_id', 'subscription_id', 'amount', 'payment_date', 'due_date', 'status', 'payment_method',
+        'token', 'token_status', 'token_expiry', 'billing_month', 'billing_year', 'description', 'created_at', 'updated_at',
+    ];
+
+    const LIST_RELATIONS = [
+        'customer' => ['local' => 'customer_id', 'foreign' => 'id', 'columns' => ['id', 'customer_number', 'name', 'phone', 'address']],
+        'subscription' => ['local' => 'subscription_id', 'foreign' => 'id', 'columns' => ['id', 'package_id', 'status']],
+    ];
+
+    // List Pembayaran (cursor pagination)
+    public function index(Request $request, StatsService $stats)
     {
-        $query = Payment::with(['customer', 'subscription.package']);
-
-        // Search
-        if ($request->has('search') && $request->search != '') {
-            $search = $request->search;
-            $query->whereHas('customer', function ($q) use ($search) {
-                $q->where('name', 'like', "%{$search}%")
-                    ->orWhere('customer_number', 'like', "%{$search}%");
-            });
+        $query = Payment::query();
+        $this->applyFields($query, $request, self::LIST_COLUMNS, self::LIST_RELATIONS, ['customer', 'subscription.package']);
+
+        // Search: cari pelanggan dulu (FULLTEXT / prefix), lalu filter customer_id (index)
+        if ($request->filled('search')) {
+            $query->whereIn('customer_id', Customer::search($request->search)->select('customers.id'));
         }
 
         // Filter Status
@@ -32,10 +46,32 @@ public function index(Request $request)
             $query->where('status', $request->status);
         }
 
-        return response()->json($query->latest()->get());
+        // Filter Periode Tagihan
+        if ($request->filled('billing_month') && $request->billing_month != 'all') {
+            $query->where('billing_month', $request->billing_month);
+        }
+        if ($request->filled('billing_year') && $request->billing_year != 'all') {
+            $query->where('billing_year', $request->billing_year);
+        }
+
+        if ($request->filled('customer_id')) {
+            $query->where('customer_id', $request->customer_id);
+        }
+
+        // Ringkasan nominal per status dari cache statistik (seluruh data, bukan hanya halaman ini)
+        $payments = $stats->get('payments');
+
+        return $this->cursorResponse($query, $request, [
+            'summary' => [
+                'paid_amount' => $payments['total_revenue'],
+                'pending_amount' => $payments['pending_amount'],
+                'overdue_amount' => $payments['overdue_amount'],
+                'pending_count' => $payments['pending'],
+            ],
+        ]);
     }
 
-    // Generate Tagihan Bulanan (Bulk)
+    // Generate Tagihan Bulanan (Bulk) - dijalankan di queue, progress via generateStatus
     public function generateBilling(Request $request)
     {
         $request->validate([
@@ -43,45 +79,40 @@ public function generateBilling(Request $request)
             'year' => 'required|integer|min:2020',
         ]);
 
-        $month = $request->month;
-        $year = $request->year;
-
-        // Ambil semua customer aktif yang punya paket
-        $customers = Customer::where('status', 'active')
-            ->whereNotNull('package_id')
-            ->with('package')
-            ->get();
-
-        $count = 0;
-        foreach ($customers as $customer) {
-            // Cek apakah tagihan bulan ini sudah ada?
-            $exists = Payment::where('customer_id', $customer->id)
-                ->where('billing_month', $month)
-                ->where('billing_year', $year)
-                ->exists();
-
-            if (!$exists && $customer->package) {
-                $status = 'pending';
-                // Jika harga 0, otomatis LUNAS
-                if ($customer->package->price <= 0) {
-                    $status = 'paid';
-                }
-                // Buat tagihan baru
-                Payment::create([
-                    'customer_id' => $customer->id,
-                    'amount' => $customer->package->price, // Ambil harga dari paket saat ini
-                    'due_date' => Carbon::create($year, $month, 20), // Jatuh tempo tgl 20
-                    'status' => $status,
-                    'billing_month' => $month,
-                    'billing_year' => $year,
-                    'description' => "Tagihan Internet {$customer->package->name} Periode {$month}/{$year}",
-                    'token_status' => 'unused'
-                ]);
-                $count++;
-            }
+        $month = (int) $request->month;
+        $year = (int) $request->year;
+
+        $progress = GenerateInvoices::queue($month, $year);
+
+        // Masih jalan / antri untuk periode ini (unique lock dipegang job lain)
+        if (!$progress) {
+            return response()->json([
+                'message' => "Generate tagihan {$month}/{$year} sedang berjalan.",
+                'progress' => Cache::get(GenerateInvoices::progressKey($month, $year)),
+            ], 202);
+        }
+
+        return response()->json([
+            'message' => "Generate tagihan {$month}/{$year} diproses di background.",
+            'progress' => $progress,
+        ], 202);
+    }
+
+    // Progress generate tagihan (polling dari frontend)
+    public function generateStatus(Request $request)
+    {
+        $request->validate([
+            'month' => 'required|integer|min:1|max:12',
+            'year' => 'required|integer|min:2020',
+        ]);
+
+        $progress = Cache::get(GenerateInvoices::progressKey((int) $request->month, (int) $request->year));
+
+        if (!$progress) {
+            return response()->json(['message' => 'Belum ada proses generate untuk periode ini'], 404);
         }
 
-        return response()->json(['message' => "Berhasil generate {$count} tagihan baru.", 'count' => $count]);
+        return response()->json($progress);
     }
 
     // Proses Pembayaran (Bayar & Generate Token)
@@ -113,68 +144,26 @@ public function pay(Request $request, $id)
     }
 
     // METHOD BARU: Monitoring Stats
-    public function monitoring(Request $request)
+    public function monitoring(StatsService $stats)
     {
-        // 1. Statistik Ringkasan (Card Atas)
-        $totalRevenue = Payment::where('status', 'paid')->sum('amount');
-        $totalPayments = Payment::count();
-        $paidCount = Payment::where('status', 'paid')->count();
-        $pendingCount = Payment::where('status', 'pending')->count();
-        $overdueCount = Payment::where('status', 'overdue')->count();
+        // Dari cache statistik (dihitung ulang saat payment/customer berubah)
+        $payments = $stats->get('payments');
 
         // Rata-rata pembayaran
-        $avgPayment = $paidCount > 0 ? $totalRevenue / $paidCount : 0;
-
-        // 2. Data Grafik Bulanan (Last 12 Months)
-        $monthlyStats = Payment::select(
-            DB::raw('billing_year as year'),
-            DB::raw('billing_month as month'),
-            DB::raw('SUM(amount) as totalRevenue'),
-            DB::raw('COUNT(*) as totalPayments'),
-            DB::raw('SUM(CASE WHEN status = "paid" THEN 1 ELSE 0 END) as paidCount'),
-            DB::raw('SUM(CASE WHEN status = "pending" THEN 1 ELSE 0 END) as pendingCount'),
-            DB::raw('SUM(CASE WHEN status = "overdue" THEN 1 ELSE 0 END) as overdueCount')
-        )
-            ->groupBy('billing_year', 'billing_month')
-            ->orderBy('billing_year', 'desc')
-            ->orderBy('billing_month', 'desc')
-            ->limit(12)
-            ->get();
-
-        // 3. Data Distribusi Metode Pembayaran
-        $methodStats = Payment::where('status', 'paid')
-            ->select('payment_method', DB::raw('count(*) as count'), DB::raw('sum(amount) as value'))
-            ->groupBy('payment_method')
-            ->get();
-
-        // 4. Top Customer (Berdasarkan total bayar)
-        $customerStats = Payment::where('payments.status', 'paid')
-            ->join('customers', 'payments.customer_id', '=', 'customers.id')
-            ->select(
-                'customers.id',
-                'customers.name as customerName',
-                'customers.customer_number as customerId',
-                DB::raw('count(payments.id) as totalPayments'),
-                DB::raw('sum(payments.amount) as totalAmount'),
-                DB::raw('max(payments.payment_date) as lastPayment')
-            )
-            ->groupBy('customers.id', 'customers.name', 'customers.customer_number')
-            ->orderByDesc('totalAmount')
-            ->limit(10)
-            ->get();
+        $avgPayment = $payments['paid'] > 0 ? $payments['total_revenue'] / $payments['paid'] : 0;
 
         return response()->json([
             'summary' => [
-                'totalRevenue' => $totalRevenue,
-                'totalPayments' => $totalPayments,
-                'paidCount' => $paidCount,
-                'pendingCount' => $pendingCount,
-                'overdueCount' => $overdueCount,
+                'totalRevenue' => $payments['total_revenue'],
+                'totalPayments' => $payments['total'],
+                'paidCount' => $payments['paid'],
+                'pendingCount' => $payments['pending'],
+                'overdueCount' => $payments['overdue'],
                 'averagePayment' => round($avgPayment),
             ],
-            'monthly' => $monthlyStats,
-            'methods' => $methodStats,
-            'customers' => $customerStats
+            'monthly' => $payments['monthly'],
+            'methods' => $payments['methods'],
+            'customers' => $payments['top_customers'],
         ]);
     }
 
@@ -2,62 +2,86 @@
 
 namespace App\Imports;
 
-use App\Models\Customer;
-use Illuminate\Support\Facades\Hash;
-use Maatwebsite\Excel\Concerns\ToModel;
+use App\Services\CustomerImportService;
+use Illuminate\Support\Collection;
+use Maatwebsite\Excel\Concerns\ToCollection;
+use Maatwebsite\Excel\Concerns\WithChunkReading;
+use Maatwebsite\Excel\Concerns\WithEvents;
 use Maatwebsite\Excel\Concerns\WithHeadingRow;
-use Maatwebsite\Excel\Concerns\WithValidation;
+use Maatwebsite\Excel\Events\BeforeImport;
 
-class CustomersImport implements ToModel, WithHeadingRow, WithValidation
+/**
+ * Baca file per CHUNK_SIZE baris (memori tetap kecil), tiap chunk diproses CustomerImportService.
+ * Kolom: name, email, phone, address, latitude, longitude (lihat template di frontend).
+ */
+class CustomersImport implements ToCollection, WithHeadingRow, WithChunkReading, WithEvents
 {
-    private $lastId = 0;
+    public $report = [
+        'total' => null,
+        'processed' => 0,
+        'created' => 0,
+        'failed' => 0,
+        'errors' => [],
+        'errors_truncated' => false,
+    ];
 
-    public function __construct()
+    protected $service;
+
+    protected $progress;
+
+    // Email yang sudah dibaca (deteksi duplikat antar chunk): email => nomor baris
+    protected $seen = [];
+
+    // Jumlah baris data yang sudah dibaca (penomoran baris error)
+    protected $rowsRead = 0;
+
+    public function __construct(CustomerImportService $service, ?callable $progress = null)
+    {
+        $this->service = $service;
+        $this->progress = $progress;
+    }
+
+    public function collection(Collection $rows)
     {
-        // Cari ID terakhir yang ada di DB saat inisialisasi
-        $lastCustomer = Customer::where('customer_number', 'like', '79%')
-            ->orderBy('customer_number', 'desc')
-            ->first();
+        // Baris 1 = heading, data mulai baris 2
+        $firstRow = $this->headingRow() + 1 + $this->rowsRead;
+        $this->rowsRead += $rows->count();
 
-        $this->lastId = $lastCustomer ? intval($lastCustomer->customer_number) : 790000;
+        $result = $this->service->importChunk($rows->toArray(), $firstRow, $this->seen);
+
+        $this->report['processed'] += $result['processed'];
+        $this->report['created'] += $result['created'];
+        $this->report['failed'] += count($result['errors']);
+
+        $room = CustomerImportService::MAX_ERRORS - count($this->report['errors']);
+        if (count($result['errors']) > $room) {
+            $this->report['errors_truncated'] = true;
+        }
+        array_push($this->report['errors'], ...array_slice($result['errors'], 0, max(0, $room)));
+
+        if ($this->progress) {
+            ($this->progress)($this->report);
+        }
+    }
+
+    public function chunkSize(): int
+    {
+        return CustomerImportService::CHUNK_SIZE;
     }
 
-    public function model(array $row)
+    public function headingRow(): int
     {
-        $this->lastId++;
-        $newId = (string) $this->lastId;
-
-        return new Customer([
-            'name'            => $row['name'],
-            'email'           => $row['email'],
-            'phone'           => $row['phone'],
-            'address'         => $row['address'],
-
-            // PERUBAHAN DISINI:
-            'latitude'        => $row['latitude'] ?? null,  // Ambil lat dari excel
-            'longitude'       => $row['longitude'] ?? null, // Ambil long dari excel
-            'odp_id'          => null, // Kosongkan dulu
-            'package_id'      => null, // Kosongkan dulu
-
-            'status'          => 'pending', // Ubah ke pending karena belum ada Paket/ODP
-            'is_active'       => true,
-            'customer_number' => $newId,
-            'password'        => Hash::make($newId),
-            'must_change_password' => true,
-            'installation_date' => now(),
-        ]);
+        return 1;
     }
 
-    public function rules(): array
+    public function registerEvents(): array
     {
         return [
-            'name'      => 'required',
-            'email'     => 'required|email|unique:customers,email',
-            'phone'     => 'required',
-            'address'   => 'required',
-            // Validasi ODP & Paket dihapus, ganti validasi koordinat (opsional)
-            'latitude'  => 'nullable|numeric',
-            'longitude' => 'nullable|numeric',
+            // Total baris untuk progress (tanpa heading)
+            BeforeImport::class => function (BeforeImport $event) {
+                $sheets = $event->getReader()->getTotalRows();
+                $this->report['total'] = max(0, (int) reset($sheets) - $this->headingRow());
+            },
         ];
     }
 }
@@ -0,0 +1,126 @@
+<?php
+
+namespace App\Jobs;
+
+use App\Services\BillingService;
+use Illuminate\Bus\UniqueLock;
+use Illuminate\Contracts\Bus\Dispatcher;
+use Illuminate\Contracts\Cache\Repository;
+use Illuminate\Contracts\Queue\ShouldBeUnique;
+use Illuminate\Contracts\Queue\ShouldQueue;
+use Illuminate\Foundation\Queue\Queueable;
+use Illuminate\Support\Facades\Cache;
+use Illuminate\Support\Facades\Log;
+
+/**
+ * Generate tagihan satu periode di queue. Progress disimpan di cache (lihat progressKey),
+ * dibaca lewat GET /services/payments/generate/status.
+ */
+class GenerateInvoices implements ShouldQueue, ShouldBeUnique
+{
+    use Queueable;
+
+    public $tries = 1;
+
+    // Harus lebih pendek dari retry_after koneksi long-running (config/queue.php)
+    public $timeout = 1800;
+
+    public $uniqueFor = 1800;
+
+    public function __construct(public int $month, public int $year, public string $label = 'Tagihan Internet')
+    {
+        $this->onConnection(config('queue.long_running'));
+    }
+
+    // Satu job per periode: klik ganda / scheduler bentrok tidak antri dua kali
+    public function uniqueId(): string
+    {
+        return "{$this->year}-{$this->month}";
+    }
+
+    public static function progressKey(int $month, int $year): string
+    {
+        return "billing:generate:{$year}-{$month}";
+    }
+
+    /**
+     * Antrikan job dan tandai 'queued', hanya jika unique lock periode ini berhasil diambil.
+     * Null = sudah ada job untuk periode ini (lock dipegang job itu sampai selesai).
+     */
+    public static function queue(int $month, int $year, string $label = 'Tagihan Internet'): ?array
+    {
+        $job = new static($month, $year, $label);
+        $lock = new UniqueLock(app(Repository::class));
+
+        // Lock diambil sendiri (bukan lewat dispatch()) supaya status baru ditulis setelah pasti masuk antrian;
+        // worker tetap melepasnya setelah job selesai / gagal seperti job unique biasa
+        if (!$lock->acquire($job)) {
+            return null;
+        }
+
+        $progress = self::markQueued($month, $year);
+
+        try {
+            app(Dispatcher::class)->dispatch($job);
+        } catch (\Throwable $e) {
+            $lock->release($job);
+            Cache::forget(self::progressKey($month, $year));
+            throw $e;
+        }
+
+        return $progress;
+    }
+
+    protected static function markQueued(int $month, int $year): array
+    {
+        $progress = [
+            'status' => 'queued',
+            'month' => $month,
+            'year' => $year,
+            'total' => null,
+            'processed' => 0,
+            'created' => 0,
+            'queued_at' => now()->toIso8601String(),
+        ];
+
+        Cache::put(self::progressKey($month, $year), $progress, now()->addDay());
+
+        return $progress;
+    }
+
+    public function handle(BillingService $billing): void
+    {
+        $key = self::progressKey($this->month, $this->year);
+        $progress = array_merge(Cache::get($key, []), [
+            'status' => 'running',
+            'month' => $this->month,
+            'year' => $this->year,
+            'total' => $billing->countMissing($this->month, $this->year),
+            'started_at' => now()->toIso8601String(),
+        ]);
+        Cache::put($key, $progress, now()->addDay());
+
+        $report = $billing->generate($this->month, $this->year, $this->label, function ($processed, $created) use ($key, &$progress) {
+            $progress['processed'] = $processed;
+            $progress['created'] = $created;
+            Cache::put($key, $progress, now()->addDay());
+        });
+
+        Cache::put($key, array_merge($progress, $report, [
+            'status' => 'done',
+            'finished_at' => now()->toIso8601String(),
+        ]), now()->addDay());
+
+        Log::info("Generate tagihan {$this->month}/{$this->year}: {$report['created']} tagihan baru ({$report['duration_ms']} ms).");
+    }
+
+    public function failed(\Throwable $e): void
+    {
+        $key = self::progressKey($this->month, $this->year);
+
+        Cache::put($key, array_merge(Cache::get($key, []), [
+            'status' => 'failed',
+            'error' => $e->getMessage(),
+        ]), now()->addDay());
+    }
+}
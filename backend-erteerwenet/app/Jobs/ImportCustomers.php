@@ -0,0 +1,89 @@
+<?php
+
+namespace App\Jobs;
+
+use App\Services\CustomerImportService;
+use Illuminate\Contracts\Queue\ShouldQueue;
+use Illuminate\Foundation\Queue\Queueable;
+use Illuminate\Support\Facades\Cache;
+use Illuminate\Support\Facades\Log;
+use Illuminate\Support\Facades\Storage;
+
+/**
+ * Import pelanggan di queue. Progress & laporan error per baris disimpan di cache (lihat progressKey),
+ * dibaca lewat GET /customers/import/{importId}.
+ */
+class ImportCustomers implements ShouldQueue
+{
+    use Queueable;
+
+    public $tries = 1;
+
+    // Harus lebih pendek dari retry_after koneksi long-running (config/queue.php)
+    public $timeout = 3600;
+
+    public function __construct(public string $importId, public string $path)
+    {
+        $this->onConnection(config('queue.long_running'));
+    }
+
+    public static function progressKey(string $importId): string
+    {
+        return "customers:import:{$importId}";
+    }
+
+    public static function markQueued(string $importId, string $filename): array
+    {
+        $progress = [
+            'id' => $importId,
+            'status' => 'queued',
+            'file' => $filename,
+            'total' => null,
+            'processed' => 0,
+            'created' => 0,
+            'failed' => 0,
+            'errors' => [],
+            'queued_at' => now()->toIso8601String(),
+        ];
+
+        Cache::put(self::progressKey($importId), $progress, now()->addDay());
+
+        return $progress;
+    }
+
+    public function handle(CustomerImportService $importer): void
+    {
+        $key = self::progressKey($this->importId);
+        $progress = array_merge(Cache::get($key, []), [
+            'status' => 'running',
+            'started_at' => now()->toIso8601String(),
+        ]);
+        Cache::put($key, $progress, now()->addDay());
+
+        try {
+            $report = $importer->import($this->path, function (array $report) use ($key, &$progress) {
+                $progress = array_merge($progress, $report);
+                Cache::put($key, $progress, now()->addDay());
+            });
+        } finally {
+            Storage::delete($this->path);
+        }
+
+        Cache::put($key, array_merge($progress, $report, [
+            'status' => 'done',
+            'finished_at' => now()->toIso8601String(),
+        ]), now()->addDay());
+
+        Log::info("Import pelanggan {$this->importId}: {$report['created']} baru, {$report['failed']} gagal ({$report['duration_ms']} ms).");
+    }
+
+    public function failed(\Throwable $e): void
+    {
+        $key = self::progressKey($this->importId);
+
+        Cache::put($key, array_merge(Cache::get($key, []), [
+            'status' => 'failed',
+            'error' => $e->getMessage(),
+        ]), now()->addDay());
+    }
+}
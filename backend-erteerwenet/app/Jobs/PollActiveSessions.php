@@ -0,0 +1,76 @@
+<?php
+
+namespace App\Jobs;
+
+use App\Models\MikrotikRouter;
+use App\Services\MikrotikService;
+use App\Services\MikrotikSyncService;
+use App\Services\PppoeHistoryService;
+use Illuminate\Contracts\Queue\ShouldBeUnique;
+use Illuminate\Contracts\Queue\ShouldQueue;
+use Illuminate\Foundation\Queue\Queueable;
+use Illuminate\Support\Facades\Cache;
+use Illuminate\Support\Facades\Log;
+
+/**
+ * Poll /ppp/active/print secara berkala (dijadwalkan di routes/console.php).
+ * ShouldBeUnique memastikan tidak ada dua poll yang antri/berjalan bersamaan.
+ */
+class PollActiveSessions implements ShouldQueue, ShouldBeUnique
+{
+    use Queueable;
+
+    // Key cache untuk hasil poll terakhir (dibaca monitorCustomers)
+    const SNAPSHOT_KEY = 'mikrotik:active-sessions:last-poll';
+
+    public $tries = 1;
+
+    // Harus lebih pendek dari retry_after koneksi mikrotik-poll (config/queue.php)
+    public $timeout = 120;
+
+    // Lock unik dilepas otomatis jika worker mati di tengah jalan
+    public $uniqueFor = 300;
+
+    public function __construct()
+    {
+        // Koneksi sendiri: tidak antri di belakang import / generate tagihan
+        $this->onConnection(config('mikrotik.poll_connection'));
+    }
+
+    public function handle(MikrotikSyncService $syncer, MikrotikService $mikrotik, PppoeHistoryService $history): void
+    {
+        $previous = Cache::get(self::SNAPSHOT_KEY, []);
+        $routers = [];
+        $errors = [];
+
+        // Satu worker memakai sesi long-lived per router (lihat MikrotikConnectionManager)
+        foreach (MikrotikRouter::where('is_active', true)->get() as $router) {
+            try {
+                $report = $syncer->forRouter($router)->syncActiveSessions();
+
+                // Sampel counter traffic lebih jarang dari poll sesi (history.sample_interval)
+                $report['samples'] = $history->sampleIfDue($mikrotik->forRouter($router));
+
+                $routers[$router->id] = array_merge($report, [
+                    'polled_at' => now()->toIso8601String(),
+                ]);
+            } catch (\Exception $e) {
+                // Router down: simpan error, data lama router ini tetap dipakai monitoring (tidak ditandai offline)
+                Log::warning("Poll PPP Active {$router->name} gagal: " . $e->getMessage());
+
+                $errors[] = "{$router->name}: " . $e->getMessage();
+                $routers[$router->id] = array_merge($previous['routers'][$router->id] ?? [], [
+                    'error' => $e->getMessage(),
+                    'failed_at' => now()->toIso8601String(),
+                ]);
+            }
+        }
+
+        Cache::forever(self::SNAPSHOT_KEY, [
+            'polled_at' => empty($errors) ? now()->toIso8601String() : ($previous['polled_at'] ?? null),
+            'error' => empty($errors) ? null : implode('; ', $errors),
+            'online' => array_sum(array_column($routers, 'online')),
+            'routers' => $routers,
+        ]);
+    }
+}
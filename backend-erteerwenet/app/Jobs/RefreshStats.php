@@ -0,0 +1,36 @@
+<?php
+
+namespace App\Jobs;
+
+use App\Services\StatsService;
+use Illuminate\Contracts\Queue\ShouldBeUniqueUntilProcessing;
+use Illuminate\Contracts\Queue\ShouldQueue;
+use Illuminate\Foundation\Queue\Queueable;
+
+/**
+ * Hitung ulang satu section statistik di queue. Selama job antri/berjalan, endpoint tetap
+ * melayani nilai cache sebelumnya. Unik per section sampai mulai diproses dan didispatch dengan
+ * jeda (StatsService::REFRESH_DELAY): semua perubahan dalam jeda digabung jadi satu job,
+ * perubahan saat job sedang berjalan mengantrikan satu job berikutnya.
+ */
+class RefreshStats implements ShouldQueue, ShouldBeUniqueUntilProcessing
+{
+    use Queueable;
+
+    // Lebih lama dari REFRESH_DELAY, supaya lock tidak lepas sebelum job sempat jalan
+    public $uniqueFor = 300;
+
+    public function __construct(public string $section)
+    {
+    }
+
+    public function uniqueId(): string
+    {
+        return $this->section;
+    }
+
+    public function handle(StatsService $stats): void
+    {
+        $stats->recompute($this->section);
+    }
+}
@@ -4,6 +4,7 @@
 
 use Illuminate\Foundation\Auth\User as Authenticatable;
 use Illuminate\Database\Eloquent\Factories\HasFactory;
+use Illuminate\Support\Facades\Hash;
 use Laravel\Sanctum\HasApiTokens; // Tambahkan ini
 use Illuminate\Notifications\Notifiable;
 
@@ -22,6 +23,7 @@ class Customer extends Authenticatable
         'latitude',
         'longitude',
         'odp_id',
+        'odp_port',
         'package_id',
         'status',
         'installation_date',
@@ -66,4 +68,60 @@ public function pppoe_account()
     {
         return $this->hasOne(CustomerPppoeAccount::class);
     }
+
+    /**
+     * Cek password portal. Pelanggan hasil import belum punya hash (password awal = ID pelanggan),
+     * hash bcrypt baru dibuat saat password itu pertama kali dipakai.
+     */
+    public function verifyPassword(string $password): bool
+    {
+        if (is_null($this->password)) {
+            if (!$this->must_change_password || !$this->customer_number || !hash_equals($this->customer_number, $password)) {
+                return false;
+            }
+
+            $this->password = $password; // cast 'hashed' => di-hash otomatis
+            $this->save();
+
+            return true;
+        }
+
+        return Hash::check($password, $this->password);
+    }
+
+    /**
+     * Pencarian pelanggan yang tetap pakai index:
+     * angka => prefix customer_number / phone, ada '@' => prefix email,
+     * selain itu FULLTEXT (name, email, address) mode boolean dengan prefix per kata.
+     */
+    public function scopeSearch($query, ?string $search)
+    {
+        $search = trim((string) $search);
+        if ($search === '') {
+            return $query;
+        }
+
+        $table = $this->getTable();
+
+        if (preg_match('/^\+?[0-9]+$/', $search)) {
+            $prefix = ltrim($search, '+');
+
+            return $query->where(function ($q) use ($table, $prefix) {
+                $q->where("{$table}.customer_number", 'like', "{$prefix}%")
+                    ->orWhere("{$table}.phone", 'like', "{$prefix}%");
+            });
+        }
+
+        if (str_contains($search, '@')) {
+            return $query->where("{$table}.email", 'like', addcslashes($search, '%_\\') . '%');
+        }
+
+        // Operator boolean MySQL dibuang, tiap kata wajib ada (+kata*)
+        $words = preg_split('/\s+/', preg_replace('/[+\-<>()~*"@]+/', ' ', $search), -1, PREG_SPLIT_NO_EMPTY);
+        $terms = implode(' ', array_map(fn ($word) => "+{$word}*", $words));
+
+        return $terms === ''
+            ? $query
+            : $query->whereFullText(["{$table}.name", "{$table}.email", "{$table}.address"], $terms, ['mode' => 'boolean']);
+    }
 }
@@ -11,6 +11,7 @@ class CustomerPppoeAccount extends Model
 
     protected $fillable = [
         'customer_id',
+        'mikrotik_router_id',
         'username',
         'password',
         'profile',
@@ -25,11 +26,41 @@ class CustomerPppoeAccount extends Model
         'limit_bytes_in',
         'limit_bytes_out',
         'radius',
+        'connected_at',
         'last_seen_at'
     ];
 
+    protected $casts = [
+        'connected_at' => 'datetime',
+        'last_seen_at' => 'datetime',
+    ];
+
     public function customer()
     {
         return $this->belongsTo(Customer::class);
     }
+
+    public function sessionEvents()
+    {
+        return $this->hasMany(PppoeSessionEvent::class);
+    }
+
+    public function router()
+    {
+        return $this->belongsTo(MikrotikRouter::class, 'mikrotik_router_id');
+    }
+
+    /**
+     * Akun milik router tertentu (akun tanpa router dianggap milik router default)
+     */
+    public function scopeForRouter($query, MikrotikRouter $router)
+    {
+        return $query->where(function ($q) use ($router) {
+            $q->where('mikrotik_router_id', $router->id);
+
+            if ($router->is(MikrotikRouter::default())) {
+                $q->orWhereNull('mikrotik_router_id');
+            }
+        });
+    }
 }
@@ -0,0 +1,79 @@
+<?php
+
+namespace App\Models;
+
+use Illuminate\Database\Eloquent\Factories\HasFactory;
+use Illuminate\Database\Eloquent\Model;
+
+class MikrotikRouter extends Model
+{
+    use HasFactory;
+
+    protected $fillable = [
+        'olt_id',
+        'name',
+        'host',
+        'port',
+        'username',
+        'password',
+        'is_default',
+        'is_active',
+    ];
+
+    // Kredensial router tidak pernah ikut di response JSON
+    protected $hidden = [
+        'password',
+    ];
+
+    protected $casts = [
+        'port' => 'integer',
+        'password' => 'encrypted',
+        'is_default' => 'boolean',
+        'is_active' => 'boolean',
+    ];
+
+    // Relasi ke OLT (opsional)
+    public function olt()
+    {
+        return $this->belongsTo(Olt::class);
+    }
+
+    public function pppoeAccounts()
+    {
+        return $this->hasMany(CustomerPppoeAccount::class);
+    }
+
+    /**
+     * Router default: yang ditandai is_default, atau router aktif pertama
+     */
+    public static function default(): ?self
+    {
+        return static::where('is_active', true)
+            ->orderByDesc('is_default')
+            ->orderBy('id')
+            ->first();
+    }
+
+    /**
+     * Router untuk pelanggan: ikut OLT dari ODP -> ODC pelanggan, fallback ke router default
+     */
+    public static function forCustomer(Customer $customer): ?self
+    {
+        $oltId = $customer->odp?->odc?->olt_id;
+
+        if ($oltId) {
+            $router = static::where('is_active', true)->where('olt_id', $oltId)->first();
+            if ($router) return $router;
+        }
+
+        return static::default();
+    }
+
+    /**
+     * Key koneksi & circuit breaker (router yang belum disimpan tetap punya key)
+     */
+    public function connectionKey(): string
+    {
+        return $this->host . ':' . $this->port;
+    }
+}
@@ -16,7 +16,7 @@ class Odc extends Model
         'longitude',
         'olt_id',
         'capacity',
-        'used_capacity',
+        // used_capacity tidak diisi manual: jumlah ODP, dihitung PortService
         'status',
     ];
 
@@ -16,7 +16,7 @@ class Odp extends Model
         'longitude',
         'odc_id',
         'capacity',
-        'used_capacity',
+        // used_capacity tidak diisi manual: jumlah pelanggan ber-port, dihitung PortService
         'status',
     ];
 
@@ -18,7 +18,7 @@ class Olt extends Model
         'brand',
         'model',
         'total_ports',
-        'used_ports',
+        // used_ports tidak diisi manual: jumlah ODC, dihitung PortService
         'status',
     ];
 
@@ -26,4 +26,10 @@ public function odcs()
     {
         return $this->hasMany(Odc::class);
     }
+
+    // Router MikroTik yang melayani pelanggan di OLT ini
+    public function mikrotikRouter()
+    {
+        return $this->hasOne(MikrotikRouter::class);
+    }
 }
\ No newline at end of file
@@ -0,0 +1,23 @@
+<?php
+
+namespace App\Models;
+
+use Illuminate\Database\Eloquent\Model;
+
+class PppoeCounterSample extends Model
+{
+    // Append-only, cukup sampled_at (tanpa created_at/updated_at)
+    public $timestamps = false;
+
+    protected $fillable = [
+        'customer_pppoe_account_id',
+        'sampled_at',
+        'bytes_in',
+        'bytes_out',
+        'uptime_seconds',
+    ];
+
+    protected $casts = [
+        'sampled_at' => 'datetime',
+    ];
+}
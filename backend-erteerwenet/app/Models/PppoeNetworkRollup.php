@@ -0,0 +1,21 @@
+<?php
+
+namespace App\Models;
+
+use Illuminate\Database\Eloquent\Model;
+
+class PppoeNetworkRollup extends Model
+{
+    public $timestamps = false;
+
+    protected $fillable = [
+        'period',         // hour, day
+        'period_start',
+        'peak_online',
+        'avg_online',
+    ];
+
+    protected $casts = [
+        'period_start' => 'datetime',
+    ];
+}
@@ -0,0 +1,30 @@
+<?php
+
+namespace App\Models;
+
+use Illuminate\Database\Eloquent\Model;
+
+class PppoeSessionEvent extends Model
+{
+    // Append-only, cukup occurred_at (tanpa created_at/updated_at)
+    public $timestamps = false;
+
+    protected $fillable = [
+        'customer_pppoe_account_id',
+        'customer_id',
+        'event',          // connect, disconnect
+        'session_id',
+        'remote_address',
+        'caller_id',
+        'occurred_at',
+    ];
+
+    protected $casts = [
+        'occurred_at' => 'datetime',
+    ];
+
+    public function account()
+    {
+        return $this->belongsTo(CustomerPppoeAccount::class, 'customer_pppoe_account_id');
+    }
+}
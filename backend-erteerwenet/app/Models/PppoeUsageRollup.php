@@ -0,0 +1,28 @@
+<?php
+
+namespace App\Models;
+
+use Illuminate\Database\Eloquent\Model;
+
+class PppoeUsageRollup extends Model
+{
+    public $timestamps = false;
+
+    protected $fillable = [
+        'customer_pppoe_account_id',
+        'customer_id',
+        'odp_id',
+        'period',         // hour, day
+        'period_start',
+        'online_seconds',
+        'connects',
+        'disconnects',
+        'bytes_in',
+        'bytes_out',
+        'samples',
+    ];
+
+    protected $casts = [
+        'period_start' => 'datetime',
+    ];
+}
@@ -0,0 +1,32 @@
+<?php
+
+namespace App\Observers;
+
+use App\Services\NetworkMapService;
+use Illuminate\Contracts\Events\ShouldHandleEventsAfterCommit;
+use Illuminate\Database\Eloquent\Model;
+
+/**
+ * Naikkan versi data peta jaringan (ETag & cache viewport) saat marker berubah
+ */
+class MapObserver implements ShouldHandleEventsAfterCommit
+{
+    protected $map;
+
+    public function __construct(NetworkMapService $map)
+    {
+        $this->map = $map;
+    }
+
+    public function saved(Model $model): void
+    {
+        if ($model->wasRecentlyCreated || $model->wasChanged(NetworkMapService::WATCHED)) {
+            $this->map->touch();
+        }
+    }
+
+    public function deleted(Model $model): void
+    {
+        $this->map->touch();
+    }
+}
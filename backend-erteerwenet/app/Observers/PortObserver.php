@@ -0,0 +1,69 @@
+<?php
+
+namespace App\Observers;
+
+use App\Models\Customer;
+use App\Models\Odc;
+use App\Models\Odp;
+use App\Services\PortService;
+use Illuminate\Database\Eloquent\Model;
+
+/**
+ * Jaga customers.odp_port & counter okupansi ODP/ODC/OLT tetap konsisten.
+ * Sengaja TIDAK after-commit: berjalan di dalam transaksi yang sama dengan penyimpanannya.
+ */
+class PortObserver
+{
+    protected $ports;
+
+    public function __construct(PortService $ports)
+    {
+        $this->ports = $ports;
+    }
+
+    public function saving(Model $model): void
+    {
+        if ($model instanceof Customer) {
+            $this->ports->assign($model);
+        }
+    }
+
+    public function saved(Model $model): void
+    {
+        [$parent, $refresh] = $this->parentOf($model);
+
+        if (!$model->wasRecentlyCreated && !$model->wasChanged($model instanceof Customer ? ['odp_id', 'odp_port'] : $parent)) {
+            return;
+        }
+
+        // Induk lama (kalau pindah) dan induk baru
+        $this->ports->{$refresh}([$model->getPrevious()[$parent] ?? null, $model->{$parent}]);
+    }
+
+    public function deleting(Model $model): void
+    {
+        // FK customers.odp_id => set null, port ikut dilepas
+        if ($model instanceof Odp) {
+            Customer::where('odp_id', $model->id)->update(['odp_port' => null]);
+        }
+    }
+
+    public function deleted(Model $model): void
+    {
+        [$parent, $refresh] = $this->parentOf($model);
+
+        $this->ports->{$refresh}([$model->{$parent}]);
+    }
+
+    /**
+     * Kolom induk & method refresh counter induknya
+     */
+    protected function parentOf(Model $model): array
+    {
+        return match (true) {
+            $model instanceof Customer => ['odp_id', 'refreshOdps'],
+            $model instanceof Odp => ['odc_id', 'refreshOdcs'],
+            $model instanceof Odc => ['olt_id', 'refreshOlts'],
+        };
+    }
+}
@@ -0,0 +1,37 @@
+<?php
+
+namespace App\Observers;
+
+use App\Services\StatsService;
+use Illuminate\Contracts\Events\ShouldHandleEventsAfterCommit;
+use Illuminate\Database\Eloquent\Model;
+
+/**
+ * Antrikan hitung ulang statistik yang terdampak saat data berubah (setelah transaksi commit)
+ */
+class StatsObserver implements ShouldHandleEventsAfterCommit
+{
+    protected $stats;
+
+    public function __construct(StatsService $stats)
+    {
+        $this->stats = $stats;
+    }
+
+    public function saved(Model $model): void
+    {
+        $dependency = StatsService::DEPENDENCIES[get_class($model)];
+
+        // Update kolom yang tidak dipakai statistik (alamat, password, token, ...) tidak memicu hitung ulang
+        if (!$model->wasRecentlyCreated && !$model->wasChanged($dependency['columns'])) {
+            return;
+        }
+
+        $this->stats->refresh($dependency['sections']);
+    }
+
+    public function deleted(Model $model): void
+    {
+        $this->stats->refresh(StatsService::DEPENDENCIES[get_class($model)]['sections']);
+    }
+}
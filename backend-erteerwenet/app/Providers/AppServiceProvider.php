@@ -2,6 +2,16 @@
 
 namespace App\Providers;
 
+use App\Models\Customer;
+use App\Models\Odc;
+use App\Models\Odp;
+use App\Observers\MapObserver;
+use App\Observers\PortObserver;
+use App\Observers\StatsObserver;
+use App\Services\MikrotikConnectionManager;
+use App\Services\MikrotikService;
+use App\Services\NetworkMapService;
+use App\Services\StatsService;
 use Illuminate\Support\ServiceProvider;
 
 class AppServiceProvider extends ServiceProvider
@@ -11,7 +21,9 @@ class AppServiceProvider extends ServiceProvider
      */
     public function register(): void
     {
-        //
+        // Pool koneksi MikroTik: satu per request HTTP, long-lived di queue worker
+        $this->app->singleton(MikrotikConnectionManager::class);
+        $this->app->singleton(MikrotikService::class);
     }
 
     /**
@@ -19,6 +31,19 @@ public function register(): void
      */
     public function boot(): void
     {
-        //
+        // Cache statistik dashboard dibuang per section saat data sumbernya berubah
+        foreach (array_keys(StatsService::DEPENDENCIES) as $model) {
+            $model::observe(StatsObserver::class);
+        }
+
+        // Port ODP pelanggan & counter okupansi ODP/ODC/OLT (lihat PortService)
+        foreach ([Customer::class, Odp::class, Odc::class] as $model) {
+            $model::observe(PortObserver::class);
+        }
+
+        // ETag / cache viewport peta jaringan
+        foreach (NetworkMapService::TYPES as $type) {
+            $type['model']::observe(MapObserver::class);
+        }
     }
 }
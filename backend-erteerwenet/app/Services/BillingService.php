@@ -0,0 +1,112 @@
+<?php
+
+namespace App\Services;
+
+use App\Models\Customer;
+use App\Models\Payment;
+use Carbon\Carbon;
+use Illuminate\Support\Facades\DB;
+
+/**
+ * Engine generate tagihan bulanan (dipakai billing:auto-generate & POST /services/payments/generate).
+ * Pelanggan yang belum punya tagihan dicari dengan satu anti-join, lalu di-insert per chunk.
+ * Unique key (customer_id, billing_month, billing_year) membuat generate ulang aman.
+ */
+class BillingService
+{
+    const CHUNK_SIZE = 1000;
+
+    // Jatuh tempo tanggal 20 bulan tagihan
+    const DUE_DAY = 20;
+
+    protected $stats;
+
+    public function __construct(StatsService $stats)
+    {
+        $this->stats = $stats;
+    }
+
+    /**
+     * Jumlah pelanggan aktif berpaket yang belum punya tagihan periode ini
+     */
+    public function countMissing(int $month, int $year): int
+    {
+        return $this->missingInvoices($month, $year)->count();
+    }
+
+    /**
+     * Generate tagihan yang belum ada. $progress dipanggil tiap chunk: fn (int $processed, int $created)
+     */
+    public function generate(int $month, int $year, string $label = 'Tagihan Internet', ?callable $progress = null): array
+    {
+        $started = microtime(true);
+        $dueDate = Carbon::create($year, $month, self::DUE_DAY)->toDateString();
+        $now = now()->toDateTimeString();
+        $processed = 0;
+        $created = 0;
+
+        $this->missingInvoices($month, $year)
+            ->select([
+                'customers.id',
+                'internet_packages.name as package_name',
+                'internet_packages.price',
+            ])
+            ->chunkById(self::CHUNK_SIZE, function ($customers) use ($month, $year, $label, $dueDate, $now, $progress, &$processed, &$created) {
+                $rows = [];
+
+                foreach ($customers as $customer) {
+                    $rows[] = [
+                        'customer_id' => $customer->id,
+                        'amount' => $customer->price, // Ambil harga dari paket saat ini
+                        'due_date' => $dueDate,
+                        // Jika harga 0, otomatis LUNAS
+                        'status' => $customer->price <= 0 ? 'paid' : 'pending',
+                        'billing_month' => $month,
+                        'billing_year' => $year,
+                        'description' => "{$label} {$customer->package_name} Periode {$month}/{$year}",
+                        'token_status' => 'unused',
+                        'created_at' => $now,
+                        'updated_at' => $now,
+                    ];
+                }
+
+                // insertOrIgnore: baris yang keburu dibuat proses lain (unique key) dilewati
+                $created += DB::transaction(fn () => Payment::insertOrIgnore($rows));
+                $processed += count($rows);
+
+                if ($progress) {
+                    $progress($processed, $created);
+                }
+            }, 'customers.id', 'id');
+
+        // Bulk insert tidak memicu model event, statistik dihitung ulang manual
+        if ($created > 0) {
+            $this->stats->refresh(['payments']);
+        }
+
+        return [
+            'month' => $month,
+            'year' => $year,
+            'processed' => $processed,
+            'created' => $created,
+            'skipped' => $processed - $created,
+            'duration_ms' => round((microtime(true) - $started) * 1000, 1),
+        ];
+    }
+
+    /**
+     * Anti-join: pelanggan aktif berpaket TANPA tagihan di periode ini
+     */
+    protected function missingInvoices(int $month, int $year)
+    {
+        return Customer::query()->toBase()
+            ->join('internet_packages', 'internet_packages.id', '=', 'customers.package_id')
+            ->leftJoin('payments', function ($join) use ($month, $year) {
+                $join->on('payments.customer_id', '=', 'customers.id')
+                    ->where('payments.billing_month', $month)
+                    ->where('payments.billing_year', $year);
+            })
+            ->where('customers.status', 'active')
+            ->whereNull('payments.id');
+    }
+}
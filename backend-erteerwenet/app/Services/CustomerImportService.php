@@ -0,0 +1,207 @@
+<?php
+
+namespace App\Services;
+
+use App\Imports\CustomersImport;
+use App\Models\Customer;
+use Illuminate\Database\QueryException;
+use Illuminate\Database\UniqueConstraintViolationException;
+use Illuminate\Support\Facades\DB;
+use Illuminate\Support\Facades\Validator;
+use Maatwebsite\Excel\Facades\Excel;
+
+/**
+ * Import pelanggan dari Excel/CSV per chunk (dipakai job ImportCustomers & customers:import-benchmark).
+ * Per chunk: validasi tanpa query, satu query cek email terdaftar, satu pemesanan range ID pelanggan,
+ * satu bulk insert. Password awal (= ID pelanggan) baru di-hash saat login pertama (Customer::verifyPassword).
+ */
+class CustomerImportService
+{
+    const CHUNK_SIZE = 1000;
+
+    // Error per baris yang disimpan di laporan (jumlah total tetap dihitung)
+    const MAX_ERRORS = 1000;
+
+    const RULES = [
+        'name' => 'required|string|max:255',
+        'email' => 'required|email|max:255',
+        'phone' => 'required|string|max:20',
+        'address' => 'required|string',
+        'latitude' => 'nullable|numeric|between:-90,90',
+        'longitude' => 'nullable|numeric|between:-180,180',
+    ];
+
+    protected $numbers;
+
+    protected $stats;
+
+    protected $map;
+
+    public function __construct(CustomerNumberService $numbers, StatsService $stats, NetworkMapService $map)
+    {
+        $this->numbers = $numbers;
+        $this->stats = $stats;
+        $this->map = $map;
+    }
+
+    /**
+     * Import satu file (path di disk default). $progress dipanggil tiap chunk dengan laporan sementara.
+     */
+    public function import(string $path, ?callable $progress = null): array
+    {
+        $started = microtime(true);
+        $import = new CustomersImport($this, $progress);
+
+        Excel::import($import, $path);
+
+        // Bulk insert tidak memicu model event
+        if ($import->report['created'] > 0) {
+            $this->stats->refresh(['customers']);
+            $this->map->touch();
+        }
+
+        return array_merge($import->report, [
+            'duration_ms' => round((microtime(true) - $started) * 1000, 1),
+        ]);
+    }
+
+    /**
+     * Validasi & insert satu chunk. $firstRow = nomor baris Excel dari baris pertama chunk,
+     * $seen = email yang sudah diproses di chunk sebelumnya (duplikat dalam file).
+     */
+    public function importChunk(array $rows, int $firstRow, array &$seen): array
+    {
+        $valid = [];
+        $errors = [];
+
+        foreach ($rows as $index => $row) {
+            $rowNumber = $firstRow + $index;
+            $data = $this->normalize($row);
+
+            // Baris kosong (biasanya di akhir sheet) dilewati tanpa error
+            if (!array_filter($data, fn ($value) => $value !== null)) {
+                continue;
+            }
+
+            $validator = Validator::make($data, self::RULES);
+            if ($validator->fails()) {
+                $errors[] = $this->error($rowNumber, $data, $validator->errors()->all());
+                continue;
+            }
+
+            $email = strtolower($data['email']);
+            if (isset($seen[$email])) {
+                $errors[] = $this->error($rowNumber, $data, ["Email duplikat dengan baris {$seen[$email]}."]);
+                continue;
+            }
+
+            $seen[$email] = $rowNumber;
+            $valid[$rowNumber] = $data;
+        }
+
+        // Satu query untuk semua email di chunk (pengganti rule unique per baris)
+        if ($valid) {
+            $existing = Customer::whereIn('email', array_column($valid, 'email'))
+                ->pluck('email')
+                ->mapWithKeys(fn ($email) => [strtolower($email) => true]);
+
+            foreach ($valid as $rowNumber => $data) {
+                if (isset($existing[strtolower($data['email'])])) {
+                    $errors[] = $this->error($rowNumber, $data, ['Email sudah terdaftar.']);
+                    unset($valid[$rowNumber]);
+                }
+            }
+        }
+
+        $processed = count($valid) + count($errors);
+        $created = $valid ? $this->insert($valid, $errors) : 0;
+        usort($errors, fn ($a, $b) => $a['row'] <=> $b['row']);
+
+        return [
+            'processed' => $processed,
+            'created' => $created,
+            'errors' => $errors,
+        ];
+    }
+
+    /**
+     * Bulk insert baris valid dengan range ID pelanggan yang sudah dipesan
+     */
+    protected function insert(array $valid, array &$errors): int
+    {
+        $number = $this->numbers->reserve(count($valid));
+        $now = now()->toDateTimeString();
+        $today = now()->toDateString();
+        $records = [];
+
+        foreach ($valid as $rowNumber => $data) {
+            $records[$rowNumber] = array_merge($data, [
+                'customer_number' => (string) $number++,
+                'odp_id' => null, // Kosongkan dulu
+                'package_id' => null, // Kosongkan dulu
+                'status' => 'pending', // Pending karena belum ada Paket/ODP
+                'is_active' => true,
+                'password' => null, // Di-hash saat login pertama (password awal = ID pelanggan)
+                'must_change_password' => true,
+                'installation_date' => $today,
+                'created_at' => $now,
+                'updated_at' => $now,
+            ]);
+        }
+
+        try {
+            DB::transaction(fn () => Customer::insert(array_values($records)));
+
+            return count($records);
+        } catch (QueryException $e) {
+            // Satu baris gagal membatalkan seluruh chunk: ulangi per baris supaya penyebabnya ketahuan
+            return $this->insertEach($records, $errors);
+        }
+    }
+
+    /**
+     * Insert per baris (jalur error). Baris yang gagal dilaporkan beserta alasannya.
+     */
+    protected function insertEach(array $records, array &$errors): int
+    {
+        $created = 0;
+
+        foreach ($records as $rowNumber => $record) {
+            try {
+                Customer::insert($record);
+                $created++;
+            } catch (UniqueConstraintViolationException $e) {
+                // Email keburu didaftarkan proses lain setelah dicek
+                $errors[] = $this->error($rowNumber, $record, ['Email sudah terdaftar.']);
+            } catch (QueryException $e) {
+                $errors[] = $this->error($rowNumber, $record, ['Gagal disimpan: ' . ($e->errorInfo[2] ?? $e->getMessage())]);
+            }
+        }
+
+        return $created;
+    }
+
+    protected function normalize(array $row): array
+    {
+        $data = [];
+
+        foreach (array_keys(self::RULES) as $field) {
+            $value = $row[$field] ?? null;
+            // Nomor HP dari Excel sering terbaca sebagai angka
+            $value = is_scalar($value) ? trim((string) $value) : null;
+            $data[$field] = $value === '' ? null : $value;
+        }
+
+        return $data;
+    }
+
+    protected function error(int $row, array $data, array $messages): array
+    {
+        return [
+            'row' => $row,
+            'name' => $data['name'] ?? null,
+            'email' => $data['email'] ?? null,
+            'errors' => $messages,
+        ];
+    }
+}
@@ -0,0 +1,37 @@
+<?php
+
+namespace App\Services;
+
+use Illuminate\Support\Facades\DB;
+
+/**
+ * Penomoran ID pelanggan (79xxxx) dari tabel sequences.
+ * Baris counter dikunci selama pemesanan, jadi aktivasi & import paralel tidak bisa dapat nomor yang sama.
+ */
+class CustomerNumberService
+{
+    const SEQUENCE = 'customer_number';
+
+    /**
+     * Pesan $count nomor berurutan, kembalikan nomor pertama
+     */
+    public function reserve(int $count = 1): int
+    {
+        return DB::transaction(function () use ($count) {
+            $last = DB::table('sequences')->where('name', self::SEQUENCE)->lockForUpdate()->value('value');
+
+            if ($last === null) {
+                throw new \Exception('Sequence customer_number belum ada, jalankan migrasi.');
+            }
+
+            DB::table('sequences')->where('name', self::SEQUENCE)->update(['value' => $last + $count]);
+
+            return $last + 1;
+        });
+    }
+
+    public function next(): string
+    {
+        return (string) $this->reserve();
+    }
+}
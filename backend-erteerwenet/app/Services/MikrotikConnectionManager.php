@@ -0,0 +1,145 @@
+<?php
+
+namespace App\Services;
+
+use App\Models\MikrotikRouter;
+use Exception;
+use Illuminate\Support\Facades\Cache;
+use Illuminate\Support\Facades\Log;
+use RouterOS\Client;
+
+/**
+ * Pool koneksi RouterOS API (satu Client per router, dibuka saat pertama dipakai).
+ *
+ * Di-register sebagai singleton: di request HTTP hidup selama satu request,
+ * di queue worker hidup selama proses worker (sesi long-lived).
+ * Circuit breaker disimpan di cache supaya berlaku lintas proses.
+ */
+class MikrotikConnectionManager
+{
+    protected $clients = [];
+
+    protected $lastUsed = [];
+
+    /**
+     * Ambil Client untuk router (lazy connect)
+     */
+    public function client(MikrotikRouter $router): Client
+    {
+        $key = $router->connectionKey();
+
+        if (isset($this->clients[$key]) && !$this->isStale($key)) {
+            $this->lastUsed[$key] = time();
+            return $this->clients[$key];
+        }
+
+        $this->disconnect($router);
+        $this->guardCircuit($router);
+
+        try {
+            $client = new Client($this->clientConfig($router));
+        } catch (Exception $e) {
+            $this->recordFailure($router);
+            throw new Exception("Gagal terkoneksi ke MikroTik {$router->name} ({$key}): " . $e->getMessage(), 0, $e);
+        }
+
+        $this->recordSuccess($router);
+        $this->lastUsed[$key] = time();
+
+        return $this->clients[$key] = $client;
+    }
+
+    /**
+     * Jalankan query. Jika sesi long-lived ternyata sudah putus, buka ulang sekali lalu ulangi,
+     * tapi hanya untuk query $retryable (print): perintah add/set/remove bisa saja sudah diterapkan
+     * router sebelum koneksinya putus, jadi tidak boleh dikirim dua kali.
+     */
+    public function run(MikrotikRouter $router, callable $callback, bool $retryable = false)
+    {
+        $reused = isset($this->clients[$router->connectionKey()]);
+
+        try {
+            return $callback($this->client($router));
+        } catch (Exception $e) {
+            $this->disconnect($router);
+
+            if (!$retryable || !$reused || $this->isCircuitOpen($router)) {
+                throw $e;
+            }
+
+            Log::info("Sesi MikroTik {$router->connectionKey()} putus, reconnect: " . $e->getMessage());
+
+            return $callback($this->client($router));
+        }
+    }
+
+    public function disconnect(MikrotikRouter $router): void
+    {
+        $key = $router->connectionKey();
+        unset($this->clients[$key], $this->lastUsed[$key]);
+    }
+
+    public function isCircuitOpen(MikrotikRouter $router): bool
+    {
+        return Cache::get($this->circuitKey($router, 'open_until'), 0) > time();
+    }
+
+    protected function guardCircuit(MikrotikRouter $router): void
+    {
+        $openUntil = Cache::get($this->circuitKey($router, 'open_until'), 0);
+
+        if ($openUntil > time()) {
+            $wait = $openUntil - time();
+            throw new Exception("MikroTik {$router->name} sedang tidak bisa dihubungi. Coba lagi dalam {$wait} detik.");
+        }
+    }
+
+    protected function recordFailure(MikrotikRouter $router): void
+    {
+        $cooldown = config('mikrotik.circuit.cooldown');
+        $failuresKey = $this->circuitKey($router, 'failures');
+
+        Cache::add($failuresKey, 0, $cooldown * 10);
+        $failures = Cache::increment($failuresKey);
+
+        if ($failures >= config('mikrotik.circuit.failure_threshold')) {
+            Cache::put($this->circuitKey($router, 'open_until'), time() + $cooldown, $cooldown);
+            Cache::forget($failuresKey);
+            Log::warning("Circuit MikroTik {$router->connectionKey()} dibuka selama {$cooldown} detik.");
+        }
+    }
+
+    protected function recordSuccess(MikrotikRouter $router): void
+    {
+        Cache::forget($this->circuitKey($router, 'failures'));
+        Cache::forget($this->circuitKey($router, 'open_until'));
+    }
+
+    protected function isStale(string $key): bool
+    {
+        return time() - ($this->lastUsed[$key] ?? 0) > config('mikrotik.max_idle');
+    }
+
+    protected function clientConfig(MikrotikRouter $router): array
+    {
+        // Request HTTP: timeout pendek & 1x coba. Queue worker / artisan: lebih sabar.
+        $profile = app()->runningInConsole() ? 'worker' : 'interactive';
+        $options = config("mikrotik.connections.{$profile}");
+
+        return [
+            'host' => $router->host,
+            'user' => $router->username,
+            'pass' => $router->password,
+            'port' => (int) $router->port,
+            'timeout' => $options['timeout'],
+            'socket_timeout' => $options['socket_timeout'],
+            'attempts' => $options['attempts'],
+            'delay' => 1,
+        ];
+    }
+
+    protected function circuitKey(MikrotikRouter $router, string $suffix): string
+    {
+        return 'mikrotik:circuit:' . $router->connectionKey() . ':' . $suffix;
+    }
+}
@@ -2,58 +2,63 @@
 
 namespace App\Services;
 
+use App\Models\MikrotikRouter;
 use RouterOS\Client;
 use RouterOS\Query;
-use Illuminate\Support\Facades\Log;
 use Exception;
 
 class MikrotikService
 {
-    protected $client;
+    protected $connections;
 
-    public function __construct()
+    // Router target, null = router default (dicari saat pertama dipakai)
+    protected $router;
+
+    public function __construct(MikrotikConnectionManager $connections)
     {
+        // Tidak ada koneksi di sini: koneksi baru dibuka saat method router dipanggil
+        $this->connections = $connections;
+    }
 
-        try {
-            $this->client = new Client([
-                'host' => env('MIKROTIK_HOST'),
-                'user' => env('MIKROTIK_USER'),
-                'pass' => env('MIKROTIK_PASS'),
-                'port' => (int) env('MIKROTIK_PORT', 8728),
-                'timeout' => 60, // Tambahkan timeout biar ga nunggu lama
-                'attempts' => 3, // Coba 1x saja dul
-            ]);
-        } catch (Exception $e) {
-            // --- EDIT BAGIAN INI UNTUK LIHAT ERROR ASLI ---
-            // Jangan di throw dulu, kita dd (dump and die) biar kelihatan di network tab preview
-            // dd([
-            //     'Pesan Error' => $e->getMessage(),
-            //     'Host' => env('MIKROTIK_HOST'),
-            //     'Port' => env('MIKROTIK_PORT'),
-            // ]);
-            // ----------------------------------------------
-            // Biarkan null jika koneksi gagal, nanti dicek di method
-            $this->client = null;
+    /**
+     * Service yang sama untuk router lain (kredensial dari tabel mikrotik_routers)
+     */
+    public function forRouter(MikrotikRouter $router): static
+    {
+        $service = clone $this;
+        $service->router = $router;
+
+        return $service;
+    }
+
+    public function router(): MikrotikRouter
+    {
+        // Router default tidak di-cache: service ini singleton & hidup lama di queue worker
+        $router = $this->router ?? MikrotikRouter::default();
+
+        if (!$router) {
+            throw new Exception("Belum ada router MikroTik yang dikonfigurasi. Tambahkan di menu Server > Router MikroTik.");
         }
+
+        return $router;
     }
 
     public function isConnected()
     {
-        return $this->client !== null;
+        try {
+            $this->connections->client($this->router());
+            return true;
+        } catch (Exception $e) {
+            return false;
+        }
     }
 
     /**
-     * Ambil semua data PPP Secrets
+     * Iterasi PPP Secrets per baris (hanya kolom yang diminta, untuk sync massal)
      */
-    public function getPppSecrets()
+    public function streamPppSecrets(?array $fields = null)
     {
-        if (!$this->client) {
-            throw new Exception("Gagal terkoneksi ke MikroTik. Cek konfigurasi .env");
-        }
-
-        // Query ke /ppp/secret/print
-        $query = new Query('/ppp/secret/print');
-        return $this->client->query($query)->read();
+        return $this->stream(new Query('/ppp/secret/print'), $fields);
     }
 
     /**
@@ -61,16 +66,35 @@ public function getPppSecrets()
      */
     public function getActivePppConnections()
     {
-        if (!$this->client) {
-            throw new Exception("Koneksi ke MikroTik terputus atau gagal inisialisasi.");
-        }
+        return iterator_to_array($this->streamActivePppConnections(), false);
+    }
 
-        $query = new Query('/ppp/active/print');
+    /**
+     * Ambil Active Connection satu user (difilter di router, bukan dari seluruh daftar)
+     */
+    public function getActivePppConnection($name)
+    {
+        $result = $this->read((new Query('/ppp/active/print'))->where('name', $name));
 
-        // Baca response
-        $result = $this->client->query($query)->read();
+        return $result[0] ?? null;
+    }
 
-        return $result;
+    /**
+     * Iterasi PPP Active Connection per baris
+     */
+    public function streamActivePppConnections(?array $fields = null)
+    {
+        return $this->stream(new Query('/ppp/active/print'), $fields);
+    }
+
+    /**
+     * Iterasi interface dinamis PPPoE server (<pppoe-username>) beserta counter rx/tx byte
+     */
+    public function streamPppoeInterfaces()
+    {
+        $query = (new Query('/interface/print'))->where('type', 'pppoe-in');
+
+        return $this->stream($query, ['name', 'rx-byte', 'tx-byte']);
     }
 
     /**
@@ -78,14 +102,7 @@ public function getActivePppConnections()
      */
     public function getPppProfiles()
     {
-        if (!$this->client) {
-            // Coba reconnect atau throw error
-            throw new Exception("Koneksi MikroTik terputus/belum diinisialisasi.");
-        }
-
-        // Query yang benar untuk ambil profile
-        $query = new Query('/ppp/profile/print');
-        return $this->client->query($query)->read();
+        return $this->read(new Query('/ppp/profile/print'));
     }
 
     /**
@@ -93,10 +110,6 @@ public function getPppProfiles()
      */
     public function createPppSecret($data)
     {
-        if (!$this->client) {
-            throw new Exception("Gagal koneksi ke MikroTik");
-        }
-
         $query = (new Query('/ppp/secret/add'))
             ->equal('name', $data['name'])
             ->equal('password', $data['password'])
@@ -104,7 +117,7 @@ public function createPppSecret($data)
             ->equal('service', 'pppoe')
             ->equal('comment', $data['comment']); // Nama Pelanggan
 
-        return $this->client->query($query)->read();
+        return $this->write($query);
     }
 
     /**
@@ -112,8 +125,6 @@ public function createPppSecret($data)
      */
     public function addPppProfile($data)
     {
-        if (!$this->client) throw new Exception("Gagal koneksi MikroTik");
-
         $query = (new Query('/ppp/profile/add'))
             ->equal('name', $data['name'])
             ->equal('local-address', $data['local_address'] ?? null)
@@ -121,7 +132,7 @@ public function addPppProfile($data)
             ->equal('rate-limit', $data['rate_limit'] ?? null)
             ->equal('dns-server', $data['dns_server'] ?? null);
 
-        return $this->client->query($query)->read();
+        return $this->write($query);
     }
 
     /**
@@ -130,11 +141,9 @@ public function addPppProfile($data)
      */
     public function setPppProfile($name, $data)
     {
-        if (!$this->client) throw new Exception("Gagal koneksi MikroTik");
-
         // Cari ID dulu berdasarkan nama
         $findQuery = (new Query('/ppp/profile/print'))->where('name', $name);
-        $result = $this->client->query($findQuery)->read();
+        $result = $this->read($findQuery);
 
         if (empty($result)) throw new Exception("Profile tidak ditemukan di Router");
         $id = $result[0]['.id'];
@@ -148,7 +157,7 @@ public function setPppProfile($name, $data)
         if (isset($data['rate_limit'])) $query->equal('rate-limit', $data['rate_limit']);
         if (isset($data['dns_server'])) $query->equal('dns-server', $data['dns_server']);
 
-        return $this->client->query($query)->read();
+        return $this->write($query);
     }
 
     /**
@@ -156,19 +165,65 @@ public function setPppProfile($name, $data)
      */
     public function removePppProfile($name)
     {
-        if (!$this->client) throw new Exception("Gagal koneksi MikroTik");
-
         // Cari ID dulu
         $findQuery = (new Query('/ppp/profile/print'))->where('name', $name);
-        $result = $this->client->query($findQuery)->read();
+        $result = $this->read($findQuery);
 
         if (!empty($result)) {
             $id = $result[0]['.id'];
             // Hapus
             $query = (new Query('/ppp/profile/remove'))->equal('.id', $id);
-            return $this->client->query($query)->read();
+            return $this->write($query);
         }
 
         return null; // Anggap sukses jika tidak ditemukan (sudah terhapus)
     }
+
+    /**
+     * Query print, hasil langsung di-parse jadi array (aman diulang jika sesi putus)
+     */
+    protected function read(Query $query)
+    {
+        return $this->connections->run($this->router(), function (Client $client) use ($query) {
+            return $client->query($query)->read();
+        }, true);
+    }
+
+    /**
+     * Perintah add/set/remove: tidak diulang otomatis supaya tidak diterapkan dua kali
+     */
+    protected function write(Query $query)
+    {
+        return $this->connections->run($this->router(), function (Client $client) use ($query) {
+            return $client->query($query)->read();
+        });
+    }
+
+    /**
+     * Query print massal. Catatan: readAsIterator (routeros-api-php 1.6) tetap membaca seluruh balasan
+     * dari socket dulu (readRAW), jadi balasan mentah tetap ada di memori; yang ditunda hanya parsing
+     * per sentence, sehingga array hasil parse tidak dibangun sekaligus. Karena pembacaan socket selesai
+     * di dalam run(), putus koneksi saat membaca ikut di-retry. Ukuran balasan ditekan lewat '.proplist'.
+     */
+    protected function stream(Query $query, ?array $fields = null)
+    {
+        if ($fields) {
+            $query->equal('.proplist', implode(',', $fields));
+        }
+
+        $iterator = $this->connections->run($this->router(), function (Client $client) use ($query) {
+            return $client->query($query)->readAsIterator();
+        }, true);
+
+        foreach ($iterator as $row) {
+            if (!is_array($row) || empty($row)) continue;
+
+            // !trap dari router
+            if (isset($row['after']['message'])) {
+                throw new Exception("MikroTik error: " . $row['after']['message']);
+            }
+
+            yield $row;
+        }
+    }
 }
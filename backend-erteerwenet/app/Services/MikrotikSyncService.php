@@ -0,0 +1,571 @@
+<?php
+
+namespace App\Services;
+
+use App\Models\Customer;
+use App\Models\CustomerPppoeAccount;
+use App\Models\MikrotikProfile;
+use App\Models\MikrotikRouter;
+use App\Models\PppoeSessionEvent;
+use Illuminate\Support\Facades\Cache;
+use Illuminate\Support\Facades\DB;
+use Illuminate\Support\Facades\Log;
+
+/**
+ * Engine sinkronisasi MikroTik -> Database Lokal.
+ *
+ * Semua data lokal di-preload ke map (key: username / nama profile / customer_number),
+ * selisihnya dihitung di memori, lalu ditulis dengan upsert per-chunk dalam satu transaksi.
+ * Jumlah query tidak lagi bertambah per secret.
+ */
+class MikrotikSyncService
+{
+    // Jumlah baris per statement upsert / whereIn
+    const CHUNK_SIZE = 500;
+
+    // Kolom akun PPPoE yang ditulis saat sync secret (data statis).
+    // Kolom sesi hanya ditulis syncActiveSessions, supaya setiap connect/disconnect tercatat di riwayat.
+    const ACCOUNT_COLUMNS = [
+        'customer_id',
+        'mikrotik_router_id',
+        'password',
+        'profile',
+        'local_address',
+        'remote_address',
+        'caller_id',
+    ];
+
+    // Kolom sesi yang ditulis poller active connection
+    const SESSION_COLUMNS = [
+        'service',
+        'uptime',
+        'session_id',
+        'connected_at',
+        'encoding',
+        'limit_bytes_in',
+        'limit_bytes_out',
+        'radius',
+        'caller_id',
+        'remote_address',
+        'last_seen_at',
+    ];
+
+    // Kolom yang diminta dari router (.proplist)
+    const SECRET_FIELDS = ['name', 'password', 'profile', 'local-address', 'remote-address', 'caller-id'];
+    const ACTIVE_FIELDS = ['.id', 'name', 'service', 'caller-id', 'address', 'uptime', 'encoding', 'limit-bytes-in', 'limit-bytes-out', 'radius'];
+
+    // Kolom profile yang ditulis saat sync profile
+    const PROFILE_COLUMNS = [
+        'local_address',
+        'remote_address',
+        'rate_limit',
+        'dns_server',
+        'default',
+    ];
+
+    protected $mikrotik;
+
+    public function __construct(MikrotikService $mikrotik)
+    {
+        $this->mikrotik = $mikrotik;
+    }
+
+    /**
+     * Engine yang sama untuk router tertentu
+     */
+    public function forRouter(MikrotikRouter $router): static
+    {
+        return new static($this->mikrotik->forRouter($router));
+    }
+
+    /**
+     * Sync PPP Secret ke tabel customer_pppoe_accounts, lalu data Active Connection
+     * lewat syncActiveSessions (yang sama dengan poller, termasuk event connect/disconnect)
+     */
+    public function syncSecrets(): array
+    {
+        // 1. Fetch dari Router (diparse per baris, langsung masuk map)
+        $started = microtime(true);
+        $router = $this->mikrotik->router();
+
+        $secretMap = [];
+        foreach ($this->mikrotik->streamPppSecrets(self::SECRET_FIELDS) as $secret) {
+            if (!empty($secret['name'])) {
+                $secretMap[$secret['name']] = $secret;
+            }
+        }
+        $timings = ['router_fetch_ms' => $this->elapsed($started)];
+
+        // 2. Diff di memori
+        $started = microtime(true);
+
+        $usernames = array_keys($secretMap);
+        $customerMap = $this->customerIdsByNumber($usernames);
+        $accountMap = $this->accountsByUsername($usernames);
+
+        $inserts = [];
+        $updates = [];
+        $unchanged = 0;
+
+        foreach ($secretMap as $name => $secret) {
+            $current = $accountMap[$name] ?? null;
+            $row = $this->buildAccountRow($secret, $current, $customerMap[$name] ?? null);
+            $row['mikrotik_router_id'] = $router->id;
+
+            if (!$current) {
+                $inserts[] = $row;
+            } elseif ($this->rowChanged($current, $row, self::ACCOUNT_COLUMNS)) {
+                $updates[] = $row;
+            } else {
+                $unchanged++;
+            }
+        }
+
+        $timings['diff_ms'] = $this->elapsed($started);
+
+        // 3. Tulis ke DB (upsert per chunk, satu transaksi)
+        $started = microtime(true);
+        $this->upsertChunks(CustomerPppoeAccount::class, array_merge($inserts, $updates), ['username'], self::ACCOUNT_COLUMNS);
+        $timings['write_ms'] = $this->elapsed($started);
+
+        // 4. Data sesi (akun baru ikut masuk snapshot karena mikrotik_router_id sudah terisi)
+        $sessions = $this->syncActiveSessions();
+        $timings['sessions_ms'] = array_sum($sessions['timings']);
+
+        return [
+            'total' => count($secretMap),
+            'inserted' => count($inserts),
+            'updated' => count($updates),
+            'unchanged' => $unchanged,
+            'sessions' => $sessions,
+            'timings' => $timings,
+        ];
+    }
+
+    /**
+     * Sync PPP Active Connection: bandingkan dengan snapshot sebelumnya (session_id di DB),
+     * lalu tulis hanya sesi yang connect, disconnect, atau berubah.
+     * Dikunci per router: poller & sync manual tidak boleh membaca snapshot yang sama lalu mencatat event dobel.
+     */
+    public function syncActiveSessions(): array
+    {
+        $router = $this->mikrotik->router();
+
+        return Cache::lock("mikrotik:active-sessions:{$router->id}", 120)
+            ->block(30, fn () => $this->diffActiveSessions($router));
+    }
+
+    protected function diffActiveSessions(MikrotikRouter $router): array
+    {
+        $started = microtime(true);
+
+        $activeMap = [];
+        foreach ($this->mikrotik->streamActivePppConnections(self::ACTIVE_FIELDS) as $conn) {
+            if (isset($conn['name'])) {
+                $activeMap[$conn['name']] = $conn;
+            }
+        }
+        $timings = ['router_fetch_ms' => $this->elapsed($started)];
+
+        $started = microtime(true);
+
+        // Snapshot sebelumnya: akun milik router ini yang tercatat online
+        $snapshot = CustomerPppoeAccount::forRouter($router)->toBase()
+            ->get(['id', 'customer_id', 'username', 'session_id', 'connected_at', 'remote_address', 'caller_id'])
+            ->keyBy('username');
+        $now = now()->toDateTimeString();
+
+        $connected = [];
+        $changed = [];
+        $online = [];
+        $events = [];
+
+        foreach ($activeMap as $username => $active) {
+            // Abaikan user yang belum ada di DB lokal (belum di-sync dari Secret)
+            if (!isset($snapshot[$username])) continue;
+
+            $online[$username] = true;
+            $current = $snapshot[$username];
+
+            if (is_null($current->session_id)) {
+                $row = $this->buildSessionRow($username, $active, $current, $now);
+                $connected[] = $row;
+                $events[] = $this->buildSessionEvent($current, 'connect', $row['session_id'], $row['remote_address'], $row['caller_id'], $row['connected_at']);
+            } elseif (
+                $current->session_id !== ($active['.id'] ?? null)
+                || $current->remote_address !== ($active['address'] ?? null)
+                || $current->caller_id !== ($active['caller-id'] ?? null)
+            ) {
+                $row = $this->buildSessionRow($username, $active, $current, $now);
+                $changed[] = $row;
+
+                // Sesi baru di antara dua poll: putus lalu connect lagi
+                if ($current->session_id !== $row['session_id']) {
+                    $events[] = $this->buildSessionEvent($current, 'disconnect', $current->session_id, $current->remote_address, $current->caller_id, $row['connected_at']);
+                    $events[] = $this->buildSessionEvent($current, 'connect', $row['session_id'], $row['remote_address'], $row['caller_id'], $row['connected_at']);
+                }
+            }
+        }
+
+        $disconnected = [];
+        foreach ($snapshot as $username => $account) {
+            if (!is_null($account->session_id) && !isset($online[$username])) {
+                $disconnected[] = $username;
+                $events[] = $this->buildSessionEvent($account, 'disconnect', $account->session_id, $account->remote_address, $account->caller_id, $now);
+            }
+        }
+
+        $timings['diff_ms'] = $this->elapsed($started);
+
+        $started = microtime(true);
+        DB::transaction(function () use ($connected, $changed, $disconnected, $events, $now) {
+            foreach (array_chunk(array_merge($connected, $changed), self::CHUNK_SIZE) as $chunk) {
+                CustomerPppoeAccount::upsert($chunk, ['username'], self::SESSION_COLUMNS);
+            }
+
+            // Offline: reset data sesi, last_seen_at = terakhir kali terlihat online
+            foreach (array_chunk($disconnected, self::CHUNK_SIZE) as $chunk) {
+                CustomerPppoeAccount::whereIn('username', $chunk)->update([
+                    'uptime' => null,
+                    'session_id' => null,
+                    'connected_at' => null,
+                    'encoding' => null,
+                    'last_seen_at' => $now,
+                ]);
+            }
+
+            // Riwayat append-only (dibaca lewat rollup oleh PppoeHistoryService)
+            foreach (array_chunk($events, self::CHUNK_SIZE) as $chunk) {
+                PppoeSessionEvent::insert($chunk);
+            }
+        });
+        $timings['write_ms'] = $this->elapsed($started);
+
+        return [
+            'online' => count($online),
+            'connected' => count($connected),
+            'disconnected' => count($disconnected),
+            'changed' => count($changed),
+            'unchanged' => count($online) - count($connected) - count($changed),
+            'events' => count($events),
+            'timings' => $timings,
+        ];
+    }
+
+    /**
+     * Sync PPP Profile ke tabel mikrotik_profiles
+     */
+    public function syncProfiles(): array
+    {
+        $started = microtime(true);
+        $profiles = $this->mikrotik->getPppProfiles();
+        $timings = ['router_fetch_ms' => $this->elapsed($started)];
+
+        $started = microtime(true);
+        $existing = MikrotikProfile::query()->toBase()
+            ->get(array_merge(['name'], self::PROFILE_COLUMNS))
+            ->keyBy('name');
+
+        $inserts = [];
+        $updates = [];
+        $unchanged = 0;
+
+        foreach ($profiles as $p) {
+            if (empty($p['name'])) continue;
+
+            $row = [
+                'name' => $p['name'],
+                'local_address' => $p['local-address'] ?? null,
+                'remote_address' => $p['remote-address'] ?? null,
+                'rate_limit' => $p['rate-limit'] ?? null,
+                'dns_server' => $p['dns-server'] ?? null,
+                'default' => ($p['default'] ?? 'false') === 'true',
+            ];
+
+            $current = $existing[$p['name']] ?? null;
+            if (!$current) {
+                $inserts[] = $row;
+            } elseif ($this->rowChanged($current, $row, self::PROFILE_COLUMNS)) {
+                $updates[] = $row;
+            } else {
+                $unchanged++;
+            }
+        }
+
+        $timings['diff_ms'] = $this->elapsed($started);
+
+        $started = microtime(true);
+        $this->upsertChunks(MikrotikProfile::class, array_merge($inserts, $updates), ['name'], self::PROFILE_COLUMNS);
+        $timings['write_ms'] = $this->elapsed($started);
+
+        return [
+            'total' => count($inserts) + count($updates) + $unchanged,
+            'inserted' => count($inserts),
+            'updated' => count($updates),
+            'unchanged' => $unchanged,
+            'timings' => $timings,
+        ];
+    }
+
+    /**
+     * Tandai catatan Customer sesuai Profile di MikroTik (Mapping: secret 'name' == 'customer_number')
+     */
+    public function syncCustomerNotes(): array
+    {
+        $started = microtime(true);
+        $notesByNumber = [];
+        $preview = [];
+        $total = 0;
+        foreach ($this->mikrotik->streamPppSecrets(self::SECRET_FIELDS) as $secret) {
+            $total++;
+            if (count($preview) < 5) $preview[] = $secret;
+
+            if (!empty($secret['name'])) {
+                $notesByNumber[$secret['name']] = "Synced from MikroTik Profile: " . ($secret['profile'] ?? '-');
+            }
+        }
+        $timings = ['router_fetch_ms' => $this->elapsed($started)];
+
+        $started = microtime(true);
+
+        $currentNotes = [];
+        foreach (array_chunk(array_keys($notesByNumber), self::CHUNK_SIZE) as $chunk) {
+            $currentNotes += Customer::whereIn('customer_number', $chunk)
+                ->pluck('notes', 'customer_number')
+                ->all();
+        }
+
+        // Kelompokkan per isi catatan, jadi satu UPDATE per profile (bukan per customer)
+        $numbersByNote = [];
+        $unmatched = [];
+        foreach ($notesByNumber as $number => $note) {
+            if (!array_key_exists($number, $currentNotes)) {
+                $unmatched[] = $number;
+            } elseif ($currentNotes[$number] !== $note) {
+                $numbersByNote[$note][] = $number;
+            }
+        }
+        $timings['diff_ms'] = $this->elapsed($started);
+
+        $started = microtime(true);
+        DB::transaction(function () use ($numbersByNote) {
+            foreach ($numbersByNote as $note => $numbers) {
+                foreach (array_chunk($numbers, self::CHUNK_SIZE) as $chunk) {
+                    Customer::whereIn('customer_number', $chunk)->update(['notes' => $note]);
+                }
+            }
+        });
+        $timings['write_ms'] = $this->elapsed($started);
+
+        if (!empty($unmatched)) {
+            Log::info(count($unmatched) . " MikroTik Secret tidak ditemukan di database lokal.", [
+                'sample' => array_slice($unmatched, 0, 20),
+            ]);
+        }
+
+        return [
+            'total_mikrotik' => $total,
+            'synced_db' => count($currentNotes),
+            'updated' => array_sum(array_map('count', $numbersByNote)),
+            'unmatched' => count($unmatched),
+            'new_db' => 0,
+            'timings' => $timings,
+            'preview' => $preview,
+        ];
+    }
+
+    /**
+     * Susun baris akun dari Secret (statis). Data sesi diisi syncActiveSessions.
+     */
+    protected function buildAccountRow(array $secret, $current, $matchedCustomerId): array
+    {
+        // Sanitasi: Ubah '-' jadi null
+        $remoteAddress = $this->dashToNull($secret['remote-address'] ?? null);
+        $callerId = $this->dashToNull($secret['caller-id'] ?? null);
+
+        // Sedang online: Address & Caller ID live dari poller dipertahankan
+        if ($current && !is_null($current->session_id)) {
+            $remoteAddress = $current->remote_address;
+            $callerId = $current->caller_id;
+        }
+
+        // Auto-connect: hanya isi customer_id jika akun belum terhubung ke customer
+        $customerId = $current->customer_id ?? null;
+        if (is_null($customerId)) {
+            $customerId = $matchedCustomerId;
+        }
+
+        return [
+            'username' => $secret['name'],
+            'customer_id' => $customerId,
+            'password' => $secret['password'] ?? '',
+            'profile' => $secret['profile'] ?? 'default',
+            'local_address' => $this->dashToNull($secret['local-address'] ?? null),
+            'remote_address' => $remoteAddress,
+            'caller_id' => $callerId,
+        ];
+    }
+
+    /**
+     * Baris pppoe_session_events untuk satu connect / disconnect
+     */
+    protected function buildSessionEvent($account, string $event, $sessionId, $remoteAddress, $callerId, string $occurredAt): array
+    {
+        return [
+            'customer_pppoe_account_id' => $account->id,
+            'customer_id' => $account->customer_id,
+            'event' => $event,
+            'session_id' => $sessionId,
+            'remote_address' => $remoteAddress,
+            'caller_id' => $callerId,
+            'occurred_at' => $occurredAt,
+        ];
+    }
+
+    /**
+     * Data dinamis dari satu Active Connection
+     */
+    protected function buildSessionData(array $active, $current, string $now): array
+    {
+        $sessionId = $active['.id'] ?? null;
+
+        // Sesi yang sama: pertahankan connected_at agar baris tidak dianggap berubah
+        $connectedAt = ($current && $current->session_id === $sessionId && $current->connected_at)
+            ? $current->connected_at
+            : now()->subSeconds(self::uptimeToSeconds($active['uptime'] ?? null))->toDateTimeString();
+
+        return [
+            'service' => $active['service'] ?? 'pppoe',
+            'uptime' => $active['uptime'] ?? null,
+            'session_id' => $sessionId,
+            'connected_at' => $connectedAt,
+            'encoding' => $active['encoding'] ?? null,
+            'limit_bytes_in' => $active['limit-bytes-in'] ?? '0',
+            'limit_bytes_out' => $active['limit-bytes-out'] ?? '0',
+            'radius' => $active['radius'] ?? 'false',
+            'last_seen_at' => $now,
+        ];
+    }
+
+    protected function buildSessionRow(string $username, array $active, $current, string $now): array
+    {
+        return array_merge(['username' => $username], $this->buildSessionData($active, $current, $now), [
+            'caller_id' => $active['caller-id'] ?? null,
+            'remote_address' => $active['address'] ?? null, // IP Client
+        ]);
+    }
+
+    /**
+     * Ubah format uptime RouterOS ("1w2d03:04:05" / "1d2h3m4s") jadi detik
+     */
+    public static function uptimeToSeconds(?string $uptime): int
+    {
+        if (!$uptime) return 0;
+
+        $units = ['w' => 604800, 'd' => 86400, 'h' => 3600, 'm' => 60, 's' => 1];
+        $seconds = 0;
+
+        if (preg_match('/(\d+):(\d+):(\d+)$/', $uptime, $clock)) {
+            $seconds += $clock[1] * 3600 + $clock[2] * 60 + $clock[3];
+            $uptime = substr($uptime, 0, -strlen($clock[0]));
+        }
+
+        preg_match_all('/(\d+)([wdhms])/', $uptime, $parts, PREG_SET_ORDER);
+        foreach ($parts as $part) {
+            $seconds += (int) $part[1] * $units[$part[2]];
+        }
+
+        return $seconds;
+    }
+
+    /**
+     * Kebalikan uptimeToSeconds, format ringkas RouterOS ("1d2h3m4s")
+     */
+    public static function secondsToUptime(int $seconds): string
+    {
+        $result = '';
+        foreach (['w' => 604800, 'd' => 86400, 'h' => 3600, 'm' => 60] as $unit => $size) {
+            if ($seconds >= $size) {
+                $result .= intdiv($seconds, $size) . $unit;
+                $seconds %= $size;
+            }
+        }
+
+        return $result . $seconds . 's';
+    }
+
+    protected function rowChanged($current, array $row, array $columns): bool
+    {
+        foreach ($columns as $column) {
+            $old = $current->{$column} ?? null;
+            $new = $row[$column] ?? null;
+
+            if (is_bool($new)) {
+                $new = (int) $new;
+            }
+
+            if (is_null($old) || is_null($new)) {
+                if ($old !== $new) return true;
+            } elseif ((string) $old !== (string) $new) {
+                return true;
+            }
+        }
+
+        return false;
+    }
+
+    /**
+     * Map customer_number => customer id untuk daftar username
+     */
+    protected function customerIdsByNumber(array $numbers): array
+    {
+        $map = [];
+        foreach (array_chunk($numbers, self::CHUNK_SIZE) as $chunk) {
+            $map += Customer::whereIn('customer_number', $chunk)
+                ->pluck('id', 'customer_number')
+                ->all();
+        }
+
+        return $map;
+    }
+
+    /**
+     * Map username => baris akun lokal (plain object, tanpa hydrate model)
+     */
+    protected function accountsByUsername(array $usernames): array
+    {
+        $map = [];
+        foreach (array_chunk($usernames, self::CHUNK_SIZE) as $chunk) {
+            $rows = CustomerPppoeAccount::whereIn('username', $chunk)
+                ->toBase()
+                ->get(array_merge(['username', 'session_id'], self::ACCOUNT_COLUMNS));
+
+            foreach ($rows as $row) {
+                $map[$row->username] = $row;
+            }
+        }
+
+        return $map;
+    }
+
+    protected function upsertChunks(string $model, array $rows, array $uniqueBy, array $updateColumns): void
+    {
+        if (empty($rows)) return;
+
+        DB::transaction(function () use ($model, $rows, $uniqueBy, $updateColumns) {
+            foreach (array_chunk($rows, self::CHUNK_SIZE) as $chunk) {
+                $model::upsert($chunk, $uniqueBy, $updateColumns);
+            }
+        });
+    }
+
+    protected function dashToNull($value)
+    {
+        return ($value ?? '-') === '-' ? null : $value;
+    }
+
+    protected function elapsed(float $started): float
+    {
+        return round((microtime(true) - $started) * 1000, 1);
+    }
+}
@@ -0,0 +1,276 @@
+<?php
+
+namespace App\Services;
+
+use App\Models\Customer;
+use App\Models\Odc;
+use App\Models\Odp;
+use App\Models\Olt;
+use Illuminate\Support\Facades\Cache;
+use Illuminate\Support\Facades\DB;
+
+/**
+ * Data peta jaringan per viewport (bounding box + zoom).
+ * Zoom rendah => cluster grid dihitung MySQL (GROUP BY sel), zoom tinggi => titik individual.
+ * Hasil di-cache per ETag; versi data dinaikkan MapObserver saat koordinat/status/nama berubah.
+ */
+class NetworkMapService
+{
+    const VERSION_KEY = 'map:version';
+
+    // Mulai zoom ini titik dikirim satu per satu (kalau jumlahnya <= MAX_POINTS)
+    const POINTS_MIN_ZOOM = 15;
+
+    const MAX_POINTS = 1500;
+
+    // Jumlah sel cluster per lebar tile (256px) => sel ~64px di layar
+    const CELLS_PER_TILE = 4;
+
+    const RESPONSE_TTL = 600;
+
+    // Tipe marker => model & prefix id (sama dengan format id lama: olt-1, cust-1, ...)
+    const TYPES = [
+        'olt' => ['model' => Olt::class, 'prefix' => 'olt'],
+        'odc' => ['model' => Odc::class, 'prefix' => 'odc'],
+        'odp' => ['model' => Odp::class, 'prefix' => 'odp'],
+        'customer' => ['model' => Customer::class, 'prefix' => 'cust'],
+    ];
+
+    // Kolom yang ikut menentukan isi peta (selain itu tidak membuang cache)
+    const WATCHED = ['name', 'latitude', 'longitude', 'status'];
+
+    public function version(): string
+    {
+        return Cache::rememberForever(self::VERSION_KEY, fn () => (string) microtime(true));
+    }
+
+    /**
+     * Naikkan versi data peta: semua ETag & cache viewport lama otomatis tidak berlaku
+     */
+    public function touch(): void
+    {
+        Cache::forever(self::VERSION_KEY, (string) microtime(true));
+    }
+
+    /**
+     * Bulatkan bounding box keluar ke batas tile zoom tsb, supaya geser peta sedikit
+     * tetap menghasilkan ETag & cache yang sama.
+     * west > east berarti viewport melewati antimeridian (dua rentang longitude).
+     */
+    public function normalize(array $params): array
+    {
+        $zoom = (int) $params['zoom'];
+        $tile = 360 / (2 ** $zoom);
+
+        $west = max(-180, floor($params['west'] / $tile) * $tile);
+        $east = min(180, ceil($params['east'] / $tile) * $tile);
+
+        // Viewport melewati antimeridian tapi setelah dibulatkan kedua sisi bertemu => seluruh bumi
+        if ($params['west'] > $params['east'] && $west <= $east) {
+            [$west, $east] = [-180, 180];
+        }
+
+        return [
+            'zoom' => $zoom,
+            'south' => max(-90, floor($params['south'] / $tile) * $tile),
+            'west' => $west,
+            'north' => min(90, ceil($params['north'] / $tile) * $tile),
+            'east' => $east,
+            'type' => $params['type'] ?? 'all',
+            'status' => $params['status'] ?? 'all',
+            'search' => trim((string) ($params['search'] ?? '')),
+        ];
+    }
+
+    public function etag(array $params): string
+    {
+        return md5($this->version() . '|' . json_encode($params));
+    }
+
+    public function viewport(array $params): array
+    {
+        return Cache::remember('map:viewport:' . $this->etag($params), self::RESPONSE_TTL, function () use ($params) {
+            $points = $this->points($params);
+
+            if ($params['zoom'] >= self::POINTS_MIN_ZOOM) {
+                $rows = (clone $points)->limit(self::MAX_POINTS + 1)->get();
+
+                if ($rows->count() <= self::MAX_POINTS) {
+                    return [
+                        'mode' => 'points',
+                        'points' => $rows->map(fn ($row) => $this->point($row))->all(),
+                        'clusters' => [],
+                        'total' => $rows->count(),
+                    ];
+                }
+            }
+
+            return $this->clusters($points, $params['zoom']);
+        });
+    }
+
+    /**
+     * Jumlah lokasi (yang punya koordinat) per tipe & status, untuk kartu statistik.
+     * Key ikut versi data; pakai TTL seperti viewport supaya key versi lama kedaluwarsa sendiri.
+     */
+    public function totals(): array
+    {
+        return Cache::remember('map:totals:' . $this->version(), self::RESPONSE_TTL, function () {
+            $sources = collect(self::TYPES)->keys()->map(fn ($type) => $this->located($type)
+                ->select([DB::raw("'{$type}' as type"), 'status', DB::raw('COUNT(*) as total')])
+                ->groupBy('status'));
+
+            $rows = $sources->slice(1)->reduce(fn ($union, $q) => $union->unionAll($q), $sources->first())->get();
+
+            return [
+                'total' => (int) $rows->sum('total'),
+                'types' => collect(self::TYPES)->keys()
+                    ->mapWithKeys(fn ($type) => [$type => (int) $rows->where('type', $type)->sum('total')])
+                    ->all(),
+                'statuses' => $rows->groupBy('status')->map(fn ($group) => (int) $group->sum('total'))->all(),
+            ];
+        });
+    }
+
+    /**
+     * Semua lokasi berkoordinat yang lolos filter (tanpa batas viewport) beserta alamat,
+     * diiterasi per baris dengan cursor untuk export CSV
+     */
+    public function export(string $type = 'all', string $status = 'all', string $search = '')
+    {
+        $types = $type === 'all' ? array_keys(self::TYPES) : [$type];
+
+        $sources = collect($types)->map(fn ($type) => $this->located($type, $search)
+            ->when($status !== 'all', fn ($q) => $q->where('status', $status))
+            ->select([
+                DB::raw("'{$type}' as type"),
+                'name',
+                'status',
+                // Pelanggan: kolom address, infrastruktur: kolom location
+                $type === 'customer' ? 'address' : DB::raw('location as address'),
+                DB::raw('latitude as lat'),
+                DB::raw('longitude as lng'),
+            ]));
+
+        return $sources->slice(1)->reduce(fn ($union, $q) => $union->unionAll($q), $sources->first())->cursor();
+    }
+
+    /**
+     * Pecah id marker (olt-1, cust-12) jadi [tipe, id]
+     */
+    public function parseId(string $markerId): ?array
+    {
+        [$prefix, $id] = array_pad(explode('-', $markerId, 2), 2, null);
+        $type = collect(self::TYPES)->search(fn ($config) => $config['prefix'] === $prefix);
+
+        return $type && ctype_digit((string) $id) ? [$type, (int) $id] : null;
+    }
+
+    /**
+     * UNION ALL titik semua tipe di dalam bounding box (index latitude, longitude)
+     */
+    protected function points(array $params)
+    {
+        $types = $params['type'] === 'all' ? array_keys(self::TYPES) : [$params['type']];
+
+        $sources = collect($types)->map(function ($type) use ($params) {
+            return $this->located($type, $params['search'])
+                ->whereBetween('latitude', [$params['south'], $params['north']])
+                ->when(
+                    $params['west'] <= $params['east'],
+                    fn ($q) => $q->whereBetween('longitude', [$params['west'], $params['east']]),
+                    // Melewati antimeridian: west..180 atau -180..east
+                    fn ($q) => $q->where(fn ($q) => $q->where('longitude', '>=', $params['west'])->orWhere('longitude', '<=', $params['east']))
+                )
+                ->when($params['status'] !== 'all', fn ($q) => $q->where('status', $params['status']))
+                ->select([
+                    DB::raw("'{$type}' as type"),
+                    'id',
+                    'name',
+                    'status',
+                    DB::raw('latitude as lat'),
+                    DB::raw('longitude as lng'),
+                ]);
+        });
+
+        return $sources->slice(1)->reduce(fn ($union, $q) => $union->unionAll($q), $sources->first());
+    }
+
+    /**
+     * Grid cluster: satu baris per sel yang berisi titik, sel berisi 1 titik dikirim sebagai titik
+     */
+    protected function clusters($points, int $zoom): array
+    {
+        $cell = 360 / (2 ** $zoom) / self::CELLS_PER_TILE;
+
+        $perType = collect(self::TYPES)->keys()
+            ->map(fn ($type) => "SUM(CASE WHEN type = '{$type}' THEN 1 ELSE 0 END) as {$type}_count")
+            ->implode(', ');
+
+        $cells = DB::query()->fromSub($points, 'points')
+            ->selectRaw('FLOOR(lat / ?) as cell_y, FLOOR(lng / ?) as cell_x', [$cell, $cell])
+            ->selectRaw('COUNT(*) as count, AVG(lat) as lat, AVG(lng) as lng')
+            ->selectRaw('MIN(lat) as south, MAX(lat) as north, MIN(lng) as west, MAX(lng) as east')
+            ->selectRaw($perType)
+            // Hanya bermakna untuk sel berisi 1 titik
+            ->selectRaw('MAX(type) as type, MAX(id) as id, MAX(name) as name, MAX(status) as status')
+            ->groupBy('cell_y', 'cell_x')
+            ->get();
+
+        [$singles, $groups] = $cells->partition(fn ($row) => (int) $row->count === 1);
+
+        return [
+            'mode' => 'clusters',
+            'points' => $singles->map(fn ($row) => $this->point($row))->values()->all(),
+            'clusters' => $groups->map(fn ($row) => [
+                'id' => "cluster-{$zoom}-{$row->cell_y}-{$row->cell_x}",
+                'lat' => (float) $row->lat,
+                'lng' => (float) $row->lng,
+                'count' => (int) $row->count,
+                'bounds' => [
+                    'south' => (float) $row->south,
+                    'west' => (float) $row->west,
+                    'north' => (float) $row->north,
+                    'east' => (float) $row->east,
+                ],
+                'counts' => collect(self::TYPES)->keys()
+                    ->mapWithKeys(fn ($type) => [$type => (int) $row->{"{$type}_count"}])
+                    ->all(),
+            ])->values()->all(),
+            'total' => (int) $cells->sum('count'),
+        ];
+    }
+
+    /**
+     * Baris yang punya koordinat valid (0 dianggap kosong, sama seperti sebelumnya)
+     */
+    protected function located(string $type, string $search = '')
+    {
+        $model = self::TYPES[$type]['model'];
+        $query = $model::query();
+
+        if ($search !== '') {
+            $type === 'customer'
+                ? $query->search($search)
+                : $query->where(fn ($q) => $q->where('name', 'like', "%{$search}%")->orWhere('location', 'like', "%{$search}%"));
+        }
+
+        return $query->toBase()
+            ->whereNotNull('latitude')
+            ->whereNotNull('longitude')
+            ->where('latitude', '!=', 0)
+            ->where('longitude', '!=', 0);
+    }
+
+    protected function point($row): array
+    {
+        return [
+            'id' => self::TYPES[$row->type]['prefix'] . '-' . $row->id,
+            'name' => $row->name,
+            'lat' => (float) $row->lat,
+            'lng' => (float) $row->lng,
+            'type' => $row->type,
+            'status' => $row->status,
+        ];
+    }
+}
@@ -0,0 +1,220 @@
+<?php
+
+namespace App\Services;
+
+use App\Models\Customer;
+use App\Models\Odp;
+use Illuminate\Support\Collection;
+use Illuminate\Support\Facades\DB;
+use Illuminate\Validation\ValidationException;
+
+/**
+ * Model okupansi port: pelanggan menyimpan nomor port di ODP-nya (customers.odp_port).
+ * Counter odps.used_capacity, odcs.used_capacity & olts.used_ports diturunkan dari situ
+ * (pelanggan ber-port per ODP, ODP per ODC, ODC per OLT) dan dihitung ulang oleh PortObserver.
+ */
+class PortService
+{
+    // Batas utilisasi untuk filter & ringkasan (persen)
+    const HIGH_UTILIZATION = 80;
+    const MEDIUM_UTILIZATION = 50;
+
+    /**
+     * Tentukan odp_port sebelum pelanggan disimpan. Dipanggil di dalam transaksi:
+     * baris ODP dikunci supaya dua pendaftaran bersamaan tidak mengambil port yang sama.
+     * Hanya jalan jika odp_id / odp_port ikut diubah: save lain (mis. rehash password saat login)
+     * tidak pernah gagal karena ODP-nya penuh.
+     */
+    public function assign(Customer $customer): void
+    {
+        if (!$customer->odp_id) {
+            $customer->odp_port = null;
+            return;
+        }
+
+        $odpChanged = $customer->isDirty('odp_id');
+        $portChanged = $customer->isDirty('odp_port') && $customer->odp_port !== null;
+
+        if (!$odpChanged && !$customer->isDirty('odp_port')) {
+            return;
+        }
+
+        $odp = Odp::whereKey($customer->odp_id)->lockForUpdate()->first(['id', 'capacity']);
+        $used = $this->usedPorts($odp->id, $customer->id);
+
+        // Port dipilih manual (form pelanggan)
+        if ($portChanged) {
+            $port = (int) $customer->odp_port;
+
+            if ($port < 1 || $port > $odp->capacity) {
+                throw ValidationException::withMessages(['odp_port' => "Port harus antara 1 dan {$odp->capacity}"]);
+            }
+            if (isset($used[$port])) {
+                throw ValidationException::withMessages(['odp_port' => "Port {$port} sudah dipakai pelanggan lain"]);
+            }
+
+            return;
+        }
+
+        $port = $this->firstFree($odp->capacity, $used);
+        if ($port === null) {
+            throw ValidationException::withMessages(['odp_id' => 'Semua port ODP ini sudah terpakai']);
+        }
+
+        $customer->odp_port = $port;
+    }
+
+    /**
+     * Port kosong dengan nomor terkecil, null jika ODP penuh
+     */
+    public function firstFree(int $capacity, array $used): ?int
+    {
+        for ($port = 1; $port <= $capacity; $port++) {
+            if (!isset($used[$port])) {
+                return $port;
+            }
+        }
+
+        return null;
+    }
+
+    /**
+     * Hitung ulang used_capacity ODP dari customers.odp_port
+     */
+    public function refreshOdps(array $odpIds): void
+    {
+        $odpIds = array_values(array_unique(array_filter($odpIds)));
+        if (!$odpIds) {
+            return;
+        }
+
+        DB::table('odps')->whereIn('id', $odpIds)->update([
+            'used_capacity' => DB::raw('(SELECT COUNT(*) FROM customers WHERE customers.odp_id = odps.id AND customers.odp_port IS NOT NULL)'),
+        ]);
+    }
+
+    /**
+     * Hitung ulang used_capacity ODC dari jumlah ODP di bawahnya
+     */
+    public function refreshOdcs(array $odcIds): void
+    {
+        $odcIds = array_values(array_unique(array_filter($odcIds)));
+        if (!$odcIds) {
+            return;
+        }
+
+        DB::table('odcs')->whereIn('id', $odcIds)->update([
+            'used_capacity' => DB::raw('(SELECT COUNT(*) FROM odps WHERE odps.odc_id = odcs.id)'),
+        ]);
+    }
+
+    /**
+     * Hitung ulang used_ports OLT dari jumlah ODC di bawahnya
+     */
+    public function refreshOlts(array $oltIds): void
+    {
+        $oltIds = array_values(array_unique(array_filter($oltIds)));
+        if (!$oltIds) {
+            return;
+        }
+
+        DB::table('olts')->whereIn('id', $oltIds)->update([
+            'used_ports' => DB::raw('(SELECT COUNT(*) FROM odcs WHERE odcs.olt_id = olts.id)'),
+        ]);
+    }
+
+    /**
+     * Sinkronkan semua counter (migrasi & ports:refresh)
+     */
+    public function refreshAll(): void
+    {
+        DB::table('odps')->update([
+            'used_capacity' => DB::raw('(SELECT COUNT(*) FROM customers WHERE customers.odp_id = odps.id AND customers.odp_port IS NOT NULL)'),
+        ]);
+        DB::table('odcs')->update([
+            'used_capacity' => DB::raw('(SELECT COUNT(*) FROM odps WHERE odps.odc_id = odcs.id)'),
+        ]);
+        DB::table('olts')->update([
+            'used_ports' => DB::raw('(SELECT COUNT(*) FROM odcs WHERE odcs.olt_id = olts.id)'),
+        ]);
+    }
+
+    /**
+     * Okupansi per ODP dalam satu query GROUP BY: odp_id => {used, active}
+     */
+    public function occupancy(array $odpIds): Collection
+    {
+        if (!$odpIds) {
+            return collect();
+        }
+
+        return Customer::whereIn('odp_id', $odpIds)
+            ->whereNotNull('odp_port')
+            ->groupBy('odp_id')
+            ->toBase()
+            ->get([
+                'odp_id',
+                DB::raw('COUNT(*) as used'),
+                DB::raw("SUM(CASE WHEN status = 'active' THEN 1 ELSE 0 END) as active"),
+            ])
+            ->keyBy('odp_id');
+    }
+
+    /**
+     * Peta port beberapa ODP sekaligus: odp_id => [port => pelanggan], lookup O(1) per port
+     */
+    public function portMaps(array $odpIds): Collection
+    {
+        if (!$odpIds) {
+            return collect();
+        }
+
+        return Customer::whereIn('odp_id', $odpIds)
+            ->whereNotNull('odp_port')
+            ->toBase()
+            ->get(['id', 'name', 'status', 'odp_id', 'odp_port'])
+            ->groupBy('odp_id')
+            ->map(fn ($customers) => $customers->keyBy('odp_port'));
+    }
+
+    /**
+     * Daftar port 1..capacity sebuah ODP untuk tampilan monitoring
+     */
+    public function ports(Odp $odp, Collection $customersByPort): array
+    {
+        $ports = [];
+
+        for ($i = 1; $i <= $odp->capacity; $i++) {
+            $customer = $customersByPort->get($i);
+
+            if ($odp->status === 'maintenance') {
+                $status = 'maintenance';
+            } elseif ($customer) {
+                $status = $customer->status === 'active' ? 'used' : 'maintenance'; // inactive dianggap maintenance/problem
+            } else {
+                $status = 'available';
+            }
+
+            $ports[] = [
+                'portNumber' => $i,
+                'status' => $status,
+                'customerName' => $customer->name ?? null,
+                'customerId' => $customer->id ?? null,
+            ];
+        }
+
+        return $ports;
+    }
+
+    /**
+     * Nomor port terpakai di ODP (sebagai key), kecuali milik pelanggan yang sedang disimpan
+     */
+    protected function usedPorts(int $odpId, ?int $exceptCustomerId): array
+    {
+        return Customer::where('odp_id', $odpId)
+            ->whereNotNull('odp_port')
+            ->when($exceptCustomerId, fn ($q) => $q->where('id', '!=', $exceptCustomerId))
+            ->pluck('odp_port', 'odp_port')
+            ->all();
+    }
+}
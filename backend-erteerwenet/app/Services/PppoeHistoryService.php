@@ -0,0 +1,540 @@
+<?php
+
+namespace App\Services;
+
+use App\Models\Customer;
+use App\Models\CustomerPppoeAccount;
+use App\Models\MikrotikRouter;
+use App\Models\Odc;
+use App\Models\Odp;
+use App\Models\Olt;
+use App\Models\PppoeCounterSample;
+use App\Models\PppoeNetworkRollup;
+use App\Models\PppoeSessionEvent;
+use App\Models\PppoeUsageRollup;
+use Carbon\Carbon;
+use Illuminate\Support\Facades\Cache;
+use Illuminate\Support\Facades\DB;
+
+/**
+ * Riwayat sesi & traffic PPPoE: sampel counter, rollup jam/hari, retensi,
+ * dan query uptime/availability (selalu dari tabel rollup, bukan data mentah).
+ */
+class PppoeHistoryService
+{
+    const CHUNK_SIZE = 1000;
+
+    /**
+     * Ambil sampel counter jika interval sampling router ini sudah lewat
+     */
+    public function sampleIfDue(MikrotikService $mikrotik): int
+    {
+        $interval = config('mikrotik.history.sample_interval');
+        $key = 'pppoe:sample-due:' . $mikrotik->router()->connectionKey();
+
+        // Cache::add hanya berhasil sekali per interval
+        if (!Cache::add($key, true, $interval)) {
+            return 0;
+        }
+
+        return $this->sample($mikrotik);
+    }
+
+    /**
+     * Simpan satu sampel per akun online: delta byte sejak sampel sebelumnya + uptime
+     */
+    public function sample(MikrotikService $mikrotik): int
+    {
+        $router = $mikrotik->router();
+        $counterKey = 'pppoe:last-counters:' . $router->connectionKey();
+
+        $counters = [];
+        foreach ($mikrotik->streamPppoeInterfaces() as $interface) {
+            if (preg_match('/^<pppoe-(.+)>$/', $interface['name'] ?? '', $m)) {
+                $counters[$m[1]] = [(int) ($interface['rx-byte'] ?? 0), (int) ($interface['tx-byte'] ?? 0)];
+            }
+        }
+
+        $accounts = CustomerPppoeAccount::forRouter($router)
+            ->whereNotNull('session_id')
+            ->toBase()
+            ->get(['id', 'username', 'session_id', 'connected_at']);
+
+        $previous = Cache::get($counterKey, []);
+        $current = [];
+        $rows = [];
+        $now = now();
+
+        foreach ($accounts as $account) {
+            [$in, $out] = $counters[$account->username] ?? [0, 0];
+            $last = $previous[$account->username] ?? null;
+
+            // Counter interface reset tiap sesi baru: sampel pertama sesi = nilai counter itu sendiri
+            $sameSession = $last && $last[0] === $account->session_id;
+            $rows[] = [
+                'customer_pppoe_account_id' => $account->id,
+                'sampled_at' => $now->toDateTimeString(),
+                'bytes_in' => $sameSession ? max(0, $in - $last[1]) : $in,
+                'bytes_out' => $sameSession ? max(0, $out - $last[2]) : $out,
+                'uptime_seconds' => $account->connected_at ? max(0, $now->getTimestamp() - strtotime($account->connected_at)) : 0,
+            ];
+
+            $current[$account->username] = [$account->session_id, $in, $out];
+        }
+
+        foreach (array_chunk($rows, self::CHUNK_SIZE) as $chunk) {
+            PppoeCounterSample::insert($chunk);
+        }
+
+        Cache::forever($counterKey, $current);
+
+        return count($rows);
+    }
+
+    /**
+     * Rollup jam yang sudah selesai, lalu rollup hari yang sudah selesai. Aman diulang (upsert).
+     */
+    public function rollup(): array
+    {
+        $hours = 0;
+        $lastHour = PppoeUsageRollup::where('period', 'hour')->max('period_start');
+        $firstSample = PppoeCounterSample::min('sampled_at');
+
+        if ($firstSample) {
+            // Ulang jam terakhir juga, siapa tahu ada sampel telat masuk
+            $hour = $lastHour ? Carbon::parse($lastHour) : Carbon::parse($firstSample)->startOfHour();
+            $until = now()->startOfHour();
+
+            for (; $hour->lt($until); $hour->addHour()) {
+                $this->rollupHour($hour->copy());
+                $hours++;
+            }
+        }
+
+        $days = 0;
+        $lastDay = PppoeUsageRollup::where('period', 'day')->max('period_start');
+        $firstHour = PppoeUsageRollup::where('period', 'hour')->min('period_start');
+
+        if ($firstHour) {
+            $day = $lastDay ? Carbon::parse($lastDay) : Carbon::parse($firstHour)->startOfDay();
+            $until = now()->startOfDay();
+
+            for (; $day->lt($until); $day->addDay()) {
+                $this->rollupDay($day->copy());
+                $days++;
+            }
+        }
+
+        return ['hours' => $hours, 'days' => $days];
+    }
+
+    protected function rollupHour(Carbon $start): void
+    {
+        $end = $start->copy()->addHour();
+
+        $samples = PppoeCounterSample::whereBetween('sampled_at', [$start, $end->copy()->subSecond()])
+            ->groupBy('customer_pppoe_account_id')
+            ->toBase()
+            ->get([
+                'customer_pppoe_account_id',
+                DB::raw('COUNT(*) as samples'),
+                DB::raw('SUM(bytes_in) as bytes_in'),
+                DB::raw('SUM(bytes_out) as bytes_out'),
+            ])
+            ->keyBy('customer_pppoe_account_id');
+
+        $events = PppoeSessionEvent::whereBetween('occurred_at', [$start, $end->copy()->subSecond()])
+            ->groupBy('customer_pppoe_account_id')
+            ->toBase()
+            ->get([
+                'customer_pppoe_account_id',
+                DB::raw("SUM(CASE WHEN event = 'connect' THEN 1 ELSE 0 END) as connects"),
+                DB::raw("SUM(CASE WHEN event = 'disconnect' THEN 1 ELSE 0 END) as disconnects"),
+            ])
+            ->keyBy('customer_pppoe_account_id');
+
+        // Waktu online & sesi bersamaan dari event connect/disconnect (bukan jumlah sampel x interval)
+        $sessions = $this->sessionTimeline($start, $end);
+
+        $accountIds = $samples->keys()->merge($events->keys())->merge(array_keys($sessions['seconds']))
+            ->unique()->values()->all();
+        $owners = $this->accountOwners($accountIds);
+        $rows = [];
+
+        foreach ($accountIds as $accountId) {
+            $sample = $samples[$accountId] ?? null;
+            $event = $events[$accountId] ?? null;
+
+            $rows[] = [
+                'customer_pppoe_account_id' => $accountId,
+                'customer_id' => $owners[$accountId]->customer_id ?? null,
+                'odp_id' => $owners[$accountId]->odp_id ?? null,
+                'period' => 'hour',
+                'period_start' => $start->toDateTimeString(),
+                'online_seconds' => $sessions['seconds'][$accountId] ?? 0,
+                'connects' => (int) ($event->connects ?? 0),
+                'disconnects' => (int) ($event->disconnects ?? 0),
+                'bytes_in' => (int) ($sample->bytes_in ?? 0),
+                'bytes_out' => (int) ($sample->bytes_out ?? 0),
+                'samples' => (int) ($sample->samples ?? 0),
+            ];
+        }
+
+        DB::transaction(function () use ($rows, $start, $sessions) {
+            foreach (array_chunk($rows, self::CHUNK_SIZE) as $chunk) {
+                PppoeUsageRollup::upsert($chunk, ['customer_pppoe_account_id', 'period', 'period_start'], [
+                    'customer_id', 'odp_id', 'online_seconds', 'connects', 'disconnects', 'bytes_in', 'bytes_out', 'samples',
+                ]);
+            }
+
+            PppoeNetworkRollup::upsert([[
+                'period' => 'hour',
+                'period_start' => $start->toDateTimeString(),
+                'peak_online' => $sessions['peak'],
+                'avg_online' => $sessions['avg'],
+            ]], ['period', 'period_start'], ['peak_online', 'avg_online']);
+        });
+    }
+
+    /**
+     * Detik online per akun dalam [start, end) plus puncak & rata-rata sesi bersamaan,
+     * dihitung dari event connect/disconnect yang ditulis poller.
+     */
+    protected function sessionTimeline(Carbon $start, Carbon $end): array
+    {
+        $from = $start->getTimestamp();
+        $to = $end->getTimestamp();
+
+        // Status di awal jam: event terakhir sebelumnya; kalau belum ada, event pertama sesudahnya
+        // (disconnect = sedang online); kalau tidak ada event sama sekali, sesi yang masih berjalan
+        $before = $this->edgeEvents('<', $start, 'MAX');
+        $after = $this->edgeEvents('>=', $start, 'MIN');
+        $running = CustomerPppoeAccount::whereNotNull('session_id')
+            ->where('connected_at', '<=', $start)
+            ->pluck('id')
+            ->flip();
+
+        $hourEvents = PppoeSessionEvent::where('occurred_at', '>=', $start)
+            ->where('occurred_at', '<', $end)
+            ->orderBy('occurred_at')
+            ->orderBy('id')
+            ->toBase()
+            ->get(['customer_pppoe_account_id', 'event', 'occurred_at'])
+            ->groupBy('customer_pppoe_account_id');
+
+        $accountIds = collect(array_keys($before))->merge(array_keys($after))
+            ->merge($hourEvents->keys())->merge($running->keys())->unique();
+
+        $seconds = [];
+        $changes = [];
+        $onlineAtStart = 0;
+
+        foreach ($accountIds as $accountId) {
+            if (isset($before[$accountId])) {
+                $online = $before[$accountId] === 'connect';
+            } elseif (isset($after[$accountId])) {
+                $online = $after[$accountId] === 'disconnect';
+            } else {
+                $online = isset($running[$accountId]);
+            }
+
+            $onlineAtStart += (int) $online;
+            $since = $from;
+            $total = 0;
+
+            foreach ($hourEvents->get($accountId, []) as $event) {
+                $at = strtotime($event->occurred_at);
+
+                if ($event->event === 'connect' && !$online) {
+                    [$online, $since] = [true, $at];
+                    $changes[] = [$at, 1];
+                } elseif ($event->event === 'disconnect' && $online) {
+                    $online = false;
+                    $total += $at - $since;
+                    $changes[] = [$at, -1];
+                }
+            }
+
+            if ($online) {
+                $total += $to - $since;
+            }
+
+            if ($total > 0) {
+                $seconds[$accountId] = min(3600, $total);
+            }
+        }
+
+        // Puncak: sapu perubahan berurutan (disconnect dulu jika waktunya sama)
+        usort($changes, fn ($a, $b) => [$a[0], $a[1]] <=> [$b[0], $b[1]]);
+        $current = $peak = $onlineAtStart;
+        foreach ($changes as [, $delta]) {
+            $current += $delta;
+            $peak = max($peak, $current);
+        }
+
+        return [
+            'seconds' => $seconds,
+            'peak' => $peak,
+            // Rata-rata berbobot waktu
+            'avg' => (int) round(array_sum($seconds) / max(1, $to - $from)),
+        ];
+    }
+
+    /**
+     * Event terakhir (MAX) sebelum / pertama (MIN) sejak $at per akun: account id => connect|disconnect.
+     * MAX/MIN per grup memakai index (customer_pppoe_account_id, occurred_at).
+     */
+    protected function edgeEvents(string $operator, Carbon $at, string $aggregate): array
+    {
+        $edges = PppoeSessionEvent::where('occurred_at', $operator, $at)
+            ->groupBy('customer_pppoe_account_id')
+            ->select('customer_pppoe_account_id', DB::raw("{$aggregate}(occurred_at) as edge"));
+
+        // Beberapa event di detik yang sama: pluck menyimpan yang terakhir diurutkan
+        return PppoeSessionEvent::joinSub($edges, 'edges', function ($join) {
+                $join->on('edges.customer_pppoe_account_id', '=', 'pppoe_session_events.customer_pppoe_account_id')
+                    ->on('edges.edge', '=', 'pppoe_session_events.occurred_at');
+            })
+            ->orderBy('pppoe_session_events.id', $aggregate === 'MAX' ? 'asc' : 'desc')
+            ->toBase()
+            ->pluck('pppoe_session_events.event', 'pppoe_session_events.customer_pppoe_account_id')
+            ->all();
+    }
+
+    protected function rollupDay(Carbon $start): void
+    {
+        $end = $start->copy()->addDay()->subSecond();
+
+        $rows = PppoeUsageRollup::where('period', 'hour')
+            ->whereBetween('period_start', [$start, $end])
+            ->groupBy('customer_pppoe_account_id')
+            ->toBase()
+            ->get([
+                'customer_pppoe_account_id',
+                DB::raw('MAX(customer_id) as customer_id'),
+                DB::raw('MAX(odp_id) as odp_id'),
+                DB::raw('SUM(online_seconds) as online_seconds'),
+                DB::raw('SUM(connects) as connects'),
+                DB::raw('SUM(disconnects) as disconnects'),
+                DB::raw('SUM(bytes_in) as bytes_in'),
+                DB::raw('SUM(bytes_out) as bytes_out'),
+                DB::raw('SUM(samples) as samples'),
+            ])
+            ->map(fn ($row) => array_merge((array) $row, [
+                'period' => 'day',
+                'period_start' => $start->toDateTimeString(),
+            ]))
+            ->all();
+
+        $network = PppoeNetworkRollup::where('period', 'hour')
+            ->whereBetween('period_start', [$start, $end])
+            ->toBase()
+            ->first([DB::raw('MAX(peak_online) as peak_online'), DB::raw('AVG(avg_online) as avg_online')]);
+
+        DB::transaction(function () use ($rows, $start, $network) {
+            foreach (array_chunk($rows, self::CHUNK_SIZE) as $chunk) {
+                PppoeUsageRollup::upsert($chunk, ['customer_pppoe_account_id', 'period', 'period_start'], [
+                    'customer_id', 'odp_id', 'online_seconds', 'connects', 'disconnects', 'bytes_in', 'bytes_out', 'samples',
+                ]);
+            }
+
+            PppoeNetworkRollup::upsert([[
+                'period' => 'day',
+                'period_start' => $start->toDateTimeString(),
+                'peak_online' => (int) ($network->peak_online ?? 0),
+                'avg_online' => (int) round($network->avg_online ?? 0),
+            ]], ['period', 'period_start'], ['peak_online', 'avg_online']);
+        });
+    }
+
+    /**
+     * Hapus data lama per batch (tidak mengunci tabel lama-lama)
+     */
+    public function prune(): array
+    {
+        $retention = config('mikrotik.history.retention');
+
+        return [
+            'samples' => $this->deleteInBatches(PppoeCounterSample::where('sampled_at', '<', now()->subDays($retention['samples']))),
+            'events' => $this->deleteInBatches(PppoeSessionEvent::where('occurred_at', '<', now()->subDays($retention['events']))),
+            'hourly' => $this->deleteInBatches(PppoeUsageRollup::where('period', 'hour')->where('period_start', '<', now()->subDays($retention['hourly'])))
+                + $this->deleteInBatches(PppoeNetworkRollup::where('period', 'hour')->where('period_start', '<', now()->subDays($retention['hourly']))),
+            'daily' => $this->deleteInBatches(PppoeUsageRollup::where('period', 'day')->where('period_start', '<', now()->subDays($retention['daily'])))
+                + $this->deleteInBatches(PppoeNetworkRollup::where('period', 'day')->where('period_start', '<', now()->subDays($retention['daily']))),
+        ];
+    }
+
+    /**
+     * Uptime / SLA pelanggan: harian dari rollup 'day', hari ini dari rollup 'hour'
+     */
+    public function customerUptime(Customer $customer, int $days = 30): array
+    {
+        $from = now()->startOfDay()->subDays($days - 1);
+        $accountIds = CustomerPppoeAccount::where('customer_id', $customer->id)->pluck('id');
+
+        $daily = PppoeUsageRollup::whereIn('customer_pppoe_account_id', $accountIds)
+            ->where('period', 'day')
+            ->where('period_start', '>=', $from)
+            ->groupBy('period_start')
+            ->orderBy('period_start')
+            ->toBase()
+            ->get([
+                'period_start',
+                DB::raw('SUM(online_seconds) as online_seconds'),
+                DB::raw('SUM(disconnects) as disconnects'),
+                DB::raw('SUM(bytes_in) as bytes_in'),
+                DB::raw('SUM(bytes_out) as bytes_out'),
+            ])
+            ->keyBy(fn ($row) => substr($row->period_start, 0, 10));
+
+        $today = PppoeUsageRollup::whereIn('customer_pppoe_account_id', $accountIds)
+            ->where('period', 'hour')
+            ->where('period_start', '>=', now()->startOfDay())
+            ->toBase()
+            ->first([
+                DB::raw('SUM(online_seconds) as online_seconds'),
+                DB::raw('SUM(disconnects) as disconnects'),
+                DB::raw('SUM(bytes_in) as bytes_in'),
+                DB::raw('SUM(bytes_out) as bytes_out'),
+            ]);
+
+        $series = [];
+        $onlineTotal = 0;
+        $windowTotal = 0;
+
+        for ($day = $from->copy(); $day->lte(now()); $day->addDay()) {
+            $key = $day->toDateString();
+            $row = $day->isToday() ? $today : ($daily[$key] ?? null);
+            // Hari ini hanya dihitung sampai jam rollup terakhir
+            $window = $day->isToday() ? (int) $day->diffInSeconds(now()->startOfHour()) : 86400;
+
+            $online = (int) ($row->online_seconds ?? 0);
+            $onlineTotal += $online;
+            $windowTotal += $window;
+
+            $series[] = [
+                'date' => $key,
+                'online_seconds' => $online,
+                'uptime_percent' => $window > 0 ? round(min(100, $online / $window * 100), 2) : null,
+                'disconnects' => (int) ($row->disconnects ?? 0),
+                'bytes_in' => (int) ($row->bytes_in ?? 0),
+                'bytes_out' => (int) ($row->bytes_out ?? 0),
+            ];
+        }
+
+        // "Kapan terakhir putus?" cukup beberapa event terakhir (index account + occurred_at)
+        $recentEvents = PppoeSessionEvent::whereIn('customer_pppoe_account_id', $accountIds)
+            ->orderByDesc('occurred_at')
+            ->limit(20)
+            ->get(['event', 'remote_address', 'caller_id', 'occurred_at']);
+
+        return [
+            'days' => $days,
+            'sla_percent' => $windowTotal > 0 ? round(min(100, $onlineTotal / $windowTotal * 100), 2) : null,
+            'online_seconds' => $onlineTotal,
+            'disconnects' => array_sum(array_column($series, 'disconnects')),
+            'daily' => $series,
+            'recent_events' => $recentEvents,
+        ];
+    }
+
+    /**
+     * Availability per ODP / ODC / OLT dari rollup harian (hari yang sudah selesai)
+     */
+    public function availability(string $level, int $days = 7): array
+    {
+        $from = now()->startOfDay()->subDays($days);
+        $until = now()->startOfDay();
+        $window = $days * 86400;
+
+        [$groupColumn, $names] = match ($level) {
+            'odc' => ['odps.odc_id', Odc::pluck('name', 'id')],
+            'olt' => ['odcs.olt_id', Olt::pluck('name', 'id')],
+            default => ['odps.id', Odp::pluck('name', 'id')],
+        };
+
+        $usage = PppoeUsageRollup::where('period', 'day')
+            ->where('period_start', '>=', $from)
+            ->where('period_start', '<', $until)
+            ->join('odps', 'odps.id', '=', 'pppoe_usage_rollups.odp_id')
+            ->join('odcs', 'odcs.id', '=', 'odps.odc_id')
+            ->groupBy($groupColumn)
+            ->toBase()
+            ->get([
+                DB::raw("{$groupColumn} as group_id"),
+                DB::raw('SUM(pppoe_usage_rollups.online_seconds) as online_seconds'),
+                DB::raw('SUM(pppoe_usage_rollups.disconnects) as disconnects'),
+            ])
+            ->keyBy('group_id');
+
+        // Jumlah akun PPPoE per grup (penyebut availability)
+        $accounts = CustomerPppoeAccount::join('customers', 'customers.id', '=', 'customer_pppoe_accounts.customer_id')
+            ->join('odps', 'odps.id', '=', 'customers.odp_id')
+            ->join('odcs', 'odcs.id', '=', 'odps.odc_id')
+            ->groupBy($groupColumn)
+            ->toBase()
+            ->pluck(DB::raw('COUNT(*) as total'), DB::raw("{$groupColumn} as group_id"));
+
+        $result = [];
+        foreach ($accounts as $groupId => $total) {
+            $online = (int) ($usage[$groupId]->online_seconds ?? 0);
+
+            $result[] = [
+                'id' => (int) $groupId,
+                'name' => $names[$groupId] ?? 'Unknown',
+                'accounts' => (int) $total,
+                'availability_percent' => round(min(100, $online / max(1, $total * $window) * 100), 2),
+                'disconnects' => (int) ($usage[$groupId]->disconnects ?? 0),
+            ];
+        }
+
+        // Paling bermasalah di atas
+        usort($result, fn ($a, $b) => $a['availability_percent'] <=> $b['availability_percent']);
+
+        return $result;
+    }
+
+    /**
+     * Puncak & rata-rata sesi bersamaan per hari
+     */
+    public function network(int $days = 7): array
+    {
+        return PppoeNetworkRollup::where('period', 'day')
+            ->where('period_start', '>=', now()->startOfDay()->subDays($days))
+            ->orderBy('period_start')
+            ->get(['period_start', 'peak_online', 'avg_online'])
+            ->all();
+    }
+
+    /**
+     * Map account id => (customer_id, odp_id) untuk denormalisasi rollup
+     */
+    protected function accountOwners(array $accountIds): array
+    {
+        $owners = [];
+        foreach (array_chunk($accountIds, self::CHUNK_SIZE) as $chunk) {
+            $rows = CustomerPppoeAccount::whereIn('customer_pppoe_accounts.id', $chunk)
+                ->leftJoin('customers', 'customers.id', '=', 'customer_pppoe_accounts.customer_id')
+                ->toBase()
+                ->get(['customer_pppoe_accounts.id', 'customer_pppoe_accounts.customer_id', 'customers.odp_id']);
+
+            foreach ($rows as $row) {
+                $owners[$row->id] = $row;
+            }
+        }
+
+        return $owners;
+    }
+
+    protected function deleteInBatches($query, int $batch = 5000): int
+    {
+        $deleted = 0;
+
+        do {
+            $count = (clone $query)->limit($batch)->delete();
+            $deleted += $count;
+        } while ($count === $batch);
+
+        return $deleted;
+    }
+}
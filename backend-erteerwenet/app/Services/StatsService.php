@@ -0,0 +1,312 @@
+<?php
+
+namespace App\Services;
+
+use App\Jobs\RefreshStats;
+use App\Models\Customer;
+use App\Models\InternetPackage;
+use App\Models\Odc;
+use App\Models\Odp;
+use App\Models\Olt;
+use App\Models\Payment;
+use Carbon\Carbon;
+use Illuminate\Support\Facades\Cache;
+use Illuminate\Support\Facades\DB;
+
+/**
+ * Agregat dashboard & monitoring pembayaran, dihitung per "section" dengan query GROUP BY
+ * sekali jalan lalu disimpan di cache. Endpoint selalu membaca cache; model event hanya
+ * mengantrikan RefreshStats untuk section yang terdampak (nilai lama tetap dilayani sampai
+ * job selesai), stats:rebuild (terjadwal) menghitung ulang semuanya.
+ */
+class StatsService
+{
+    const PREFIX = 'stats';
+
+    // Jeda sebelum RefreshStats jalan: semua perubahan dalam jeda ini digabung jadi satu hitung ulang
+    const REFRESH_DELAY = 60;
+
+    const SECTIONS = ['customers', 'packages', 'payments', 'network'];
+
+    // Model => section yang harus dihitung ulang + kolom yang mempengaruhi angka
+    const DEPENDENCIES = [
+        Payment::class => [
+            'sections' => ['payments'],
+            'columns' => ['customer_id', 'amount', 'status', 'payment_date', 'payment_method', 'billing_month', 'billing_year'],
+        ],
+        Customer::class => [
+            'sections' => ['customers', 'packages', 'payments'],
+            'columns' => ['name', 'customer_number', 'status', 'package_id'],
+        ],
+        InternetPackage::class => [
+            'sections' => ['packages'],
+            'columns' => ['name', 'is_active'],
+        ],
+        Olt::class => ['sections' => ['network'], 'columns' => ['status']],
+        Odc::class => ['sections' => ['network'], 'columns' => ['status']],
+        Odp::class => ['sections' => ['network'], 'columns' => ['status']],
+    ];
+
+    const CHART_COLORS = ['#3B82F6', '#10B981', '#8B5CF6', '#F59E0B', '#EF4444'];
+
+    public function get(string $section): array
+    {
+        $cached = $this->cache()->get($this->key($section));
+
+        if (!is_null($cached)) {
+            return $cached;
+        }
+
+        // Cache kosong (deploy / cache:clear): satu proses menghitung, request lain menunggu hasilnya
+        return Cache::lock($this->lockKey($section), 120)->block(30, function () use ($section) {
+            return $this->cache()->rememberForever($this->key($section), fn () => $this->compute($section));
+        });
+    }
+
+    /**
+     * Antrikan hitung ulang section tertentu (dipanggil StatsObserver & bulk insert).
+     * Job unik per section & ditunda REFRESH_DELAY detik: rentetan save (pembayaran massal,
+     * edit beruntun) hanya menghasilkan satu hitung ulang per section per jeda.
+     */
+    public function refresh(array $sections): void
+    {
+        foreach ($sections as $section) {
+            RefreshStats::dispatch($section)->delay(now()->addSeconds(self::REFRESH_DELAY));
+        }
+    }
+
+    /**
+     * Hitung ulang satu section dan timpa cache (tanpa jeda cache kosong)
+     */
+    public function recompute(string $section): float
+    {
+        return Cache::lock($this->lockKey($section), 120)->block(30, function () use ($section) {
+            $started = microtime(true);
+            $this->cache()->forever($this->key($section), $this->compute($section));
+
+            return round((microtime(true) - $started) * 1000, 1);
+        });
+    }
+
+    public function flush(): void
+    {
+        foreach (self::SECTIONS as $section) {
+            $this->cache()->forget($this->key($section));
+        }
+    }
+
+    /**
+     * Hitung ulang semua section
+     */
+    public function rebuild(): array
+    {
+        $timings = [];
+
+        foreach (self::SECTIONS as $section) {
+            $timings[$section] = $this->recompute($section);
+        }
+
+        return $timings;
+    }
+
+    protected function compute(string $section): array
+    {
+        return match ($section) {
+            'customers' => $this->customerStats(),
+            'packages' => $this->packageStats(),
+            'payments' => $this->paymentStats(),
+            'network' => $this->networkStats(),
+        };
+    }
+
+    protected function customerStats(): array
+    {
+        $byStatus = Customer::query()->toBase()
+            ->groupBy('status')
+            ->pluck(DB::raw('COUNT(*) as total'), 'status');
+
+        // Registrasi 6 bulan terakhir (termasuk bulan ini)
+        $from = now()->startOfMonth()->subMonths(5);
+        $growth = Customer::where('created_at', '>=', $from)
+            ->groupBy(DB::raw('YEAR(created_at)'), DB::raw('MONTH(created_at)'))
+            ->orderBy(DB::raw('YEAR(created_at)'))
+            ->orderBy(DB::raw('MONTH(created_at)'))
+            ->toBase()
+            ->get([
+                DB::raw('YEAR(created_at) as year'),
+                DB::raw('MONTH(created_at) as month'),
+                DB::raw('COUNT(*) as newCustomers'),
+            ]);
+
+        // Running total dihitung dari jumlah pelanggan sebelum periode grafik
+        $runningTotal = Customer::where('created_at', '<', $from)->count();
+        $growthData = $growth->map(function ($row) use (&$runningTotal) {
+            $runningTotal += $row->newCustomers;
+
+            return [
+                'month' => Carbon::create($row->year, $row->month)->format('M'),
+                'newCustomers' => (int) $row->newCustomers,
+                'totalCustomers' => $runningTotal,
+            ];
+        })->all();
+
+        return [
+            'total' => (int) $byStatus->sum(),
+            'active' => (int) ($byStatus['active'] ?? 0),
+            'inactive' => (int) ($byStatus['inactive'] ?? 0),
+            'suspended' => (int) ($byStatus['suspended'] ?? 0),
+            'pending' => (int) ($byStatus['pending'] ?? 0),
+            'growth' => $growthData,
+        ];
+    }
+
+    protected function packageStats(): array
+    {
+        $counts = InternetPackage::query()->toBase()->first([
+            DB::raw('COUNT(*) as total'),
+            DB::raw('SUM(CASE WHEN is_active = 1 THEN 1 ELSE 0 END) as active'),
+        ]);
+
+        $distribution = Customer::where('customers.status', 'active')
+            ->join('internet_packages', 'customers.package_id', '=', 'internet_packages.id')
+            ->groupBy('internet_packages.name')
+            ->toBase()
+            ->get(['internet_packages.name as name', DB::raw('COUNT(*) as value')])
+            ->map(fn ($item, $key) => [
+                'name' => $item->name,
+                'value' => (int) $item->value,
+                'color' => self::CHART_COLORS[$key % count(self::CHART_COLORS)],
+            ])
+            ->all();
+
+        return [
+            'total' => (int) ($counts->total ?? 0),
+            'active' => (int) ($counts->active ?? 0),
+            'distribution' => $distribution,
+        ];
+    }
+
+    protected function paymentStats(): array
+    {
+        // Satu scan untuk semua status (index status)
+        $byStatus = Payment::groupBy('status')
+            ->toBase()
+            ->get(['status', DB::raw('COUNT(*) as total'), DB::raw('SUM(amount) as amount')])
+            ->keyBy('status');
+
+        // Pendapatan per bulan bayar, 6 bulan terakhir (index status + payment_date)
+        $from = now()->startOfMonth()->subMonths(5);
+        $revenue = Payment::where('status', 'paid')
+            ->where('payment_date', '>=', $from->toDateString())
+            ->groupBy(DB::raw('YEAR(payment_date)'), DB::raw('MONTH(payment_date)'))
+            ->orderBy(DB::raw('YEAR(payment_date)'))
+            ->orderBy(DB::raw('MONTH(payment_date)'))
+            ->toBase()
+            ->get([
+                DB::raw('YEAR(payment_date) as year'),
+                DB::raw('MONTH(payment_date) as month'),
+                DB::raw('SUM(amount) as revenue'),
+                DB::raw('COUNT(DISTINCT customer_id) as customers'),
+            ]);
+
+        $thisMonth = $revenue->first(fn ($row) => (int) $row->year === now()->year && (int) $row->month === now()->month);
+
+        // 12 periode tagihan terakhir (index billing_year + billing_month + status)
+        $monthly = Payment::groupBy('billing_year', 'billing_month')
+            ->orderByDesc('billing_year')
+            ->orderByDesc('billing_month')
+            ->limit(12)
+            ->toBase()
+            ->get([
+                DB::raw('billing_year as year'),
+                DB::raw('billing_month as month'),
+                DB::raw('SUM(amount) as totalRevenue'),
+                DB::raw('COUNT(*) as totalPayments'),
+                DB::raw("SUM(CASE WHEN status = 'paid' THEN 1 ELSE 0 END) as paidCount"),
+                DB::raw("SUM(CASE WHEN status = 'pending' THEN 1 ELSE 0 END) as pendingCount"),
+                DB::raw("SUM(CASE WHEN status = 'overdue' THEN 1 ELSE 0 END) as overdueCount"),
+            ])
+            ->all();
+
+        $methods = Payment::where('status', 'paid')
+            ->groupBy('payment_method')
+            ->toBase()
+            ->get(['payment_method', DB::raw('COUNT(*) as count'), DB::raw('SUM(amount) as value')])
+            ->all();
+
+        $topCustomers = Payment::where('payments.status', 'paid')
+            ->join('customers', 'payments.customer_id', '=', 'customers.id')
+            ->groupBy('customers.id', 'customers.name', 'customers.customer_number')
+            ->orderByDesc('totalAmount')
+            ->limit(10)
+            ->toBase()
+            ->get([
+                'customers.id',
+                'customers.name as customerName',
+                'customers.customer_number as customerId',
+                DB::raw('COUNT(payments.id) as totalPayments'),
+                DB::raw('SUM(payments.amount) as totalAmount'),
+                DB::raw('MAX(payments.payment_date) as lastPayment'),
+            ])
+            ->all();
+
+        $paid = $byStatus['paid'] ?? null;
+
+        return [
+            'total' => (int) $byStatus->sum('total'),
+            'paid' => (int) ($paid->total ?? 0),
+            'pending' => (int) ($byStatus['pending']->total ?? 0),
+            'overdue' => (int) ($byStatus['overdue']->total ?? 0),
+            'total_revenue' => (float) ($paid->amount ?? 0),
+            'pending_amount' => (float) ($byStatus['pending']->amount ?? 0),
+            'overdue_amount' => (float) ($byStatus['overdue']->amount ?? 0),
+            'monthly_revenue' => (float) ($thisMonth->revenue ?? 0),
+            'revenue_chart' => $revenue->map(fn ($row) => [
+                'month' => Carbon::create($row->year, $row->month)->format('M'),
+                'revenue' => (float) $row->revenue,
+                'customers' => (int) $row->customers,
+            ])->all(),
+            'monthly' => $monthly,
+            'methods' => $methods,
+            'top_customers' => $topCustomers,
+        ];
+    }
+
+    protected function networkStats(): array
+    {
+        // OLT, ODC, ODP dalam satu round-trip
+        $count = fn ($model, string $type) => $model::query()->toBase()->select([
+            DB::raw("'{$type}' as type"),
+            DB::raw("SUM(CASE WHEN status = 'active' THEN 1 ELSE 0 END) as active"),
+            DB::raw('COUNT(*) as total'),
+        ]);
+
+        return $count(Olt::class, 'OLT')
+            ->unionAll($count(Odc::class, 'ODC'))
+            ->unionAll($count(Odp::class, 'ODP'))
+            ->get()
+            ->map(fn ($row) => [
+                'type' => $row->type,
+                'active' => (int) $row->active,
+                'inactive' => (int) $row->total - (int) $row->active,
+                'total' => (int) $row->total,
+            ])
+            ->all();
+    }
+
+    // Key biasa (tanpa tag): store default 'database' tidak mendukung tag
+    protected function cache()
+    {
+        return Cache::store();
+    }
+
+    protected function key(string $section): string
+    {
+        return self::PREFIX . ':' . $section;
+    }
+
+    protected function lockKey(string $section): string
+    {
+        return self::PREFIX . ':lock:' . $section;
+    }
+}
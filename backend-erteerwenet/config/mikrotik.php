@@ -0,0 +1,104 @@
+<?php
+
+return [
+
+    /*
+    |--------------------------------------------------------------------------
+    | Poller PPP Active Sessions
+    |--------------------------------------------------------------------------
+    |
+    | Interval (detik) job PollActiveSessions dijalankan oleh scheduler, dan
+    | koneksi queue-nya (lihat 'mikrotik-poll' di config/queue.php). Nilai di
+    | bawah 60 detik butuh `php artisan schedule:work` (sub-minute), di
+    | atasnya dibulatkan ke menit.
+    |
+    */
+
+    'poll_interval' => (int) env('MIKROTIK_POLL_INTERVAL', 30),
+
+    'poll_connection' => env('MIKROTIK_POLL_CONNECTION', 'mikrotik-poll'),
+
+    /*
+    |--------------------------------------------------------------------------
+    | Koneksi RouterOS API
+    |--------------------------------------------------------------------------
+    |
+    | Kredensial router disimpan per-router di tabel mikrotik_routers.
+    | Di sini hanya profil timeout: 'interactive' untuk request HTTP (gagal
+    | cepat), 'worker' untuk queue worker yang menyimpan sesi long-lived.
+    | Sesi worker yang idle lebih dari 'max_idle' detik dibuka ulang.
+    |
+    */
+
+    'connections' => [
+        'interactive' => [
+            'timeout' => (int) env('MIKROTIK_INTERACTIVE_TIMEOUT', 3),
+            'socket_timeout' => (int) env('MIKROTIK_INTERACTIVE_SOCKET_TIMEOUT', 30),
+            'attempts' => 1,
+        ],
+        'worker' => [
+            'timeout' => (int) env('MIKROTIK_WORKER_TIMEOUT', 10),
+            'socket_timeout' => (int) env('MIKROTIK_WORKER_SOCKET_TIMEOUT', 120),
+            'attempts' => 3,
+        ],
+    ],
+
+    'max_idle' => (int) env('MIKROTIK_MAX_IDLE', 300),
+
+    /*
+    |--------------------------------------------------------------------------
+    | Router Lama dari .env
+    |--------------------------------------------------------------------------
+    |
+    | Sebelum ada tabel mikrotik_routers, kredensial router diambil dari
+    | MIKROTIK_HOST/USER/PASS/PORT. Nilai ini hanya dibaca migrasi
+    | import_env_mikrotik_router untuk membuat router default; setelah itu
+    | router dikelola dari menu Server > Router MikroTik.
+    |
+    */
+
+    'legacy' => [
+        'host' => env('MIKROTIK_HOST'),
+        'port' => (int) env('MIKROTIK_PORT', 8728),
+        'username' => env('MIKROTIK_USER'),
+        'password' => env('MIKROTIK_PASS'),
+    ],
+
+    /*
+    |--------------------------------------------------------------------------
+    | Circuit Breaker
+    |--------------------------------------------------------------------------
+    |
+    | Setelah 'failure_threshold' kali gagal konek berturut-turut, router
+    | dianggap down selama 'cooldown' detik: semua panggilan langsung gagal
+    | tanpa membuka socket, supaya request tidak ikut menggantung.
+    |
+    */
+
+    'circuit' => [
+        'failure_threshold' => (int) env('MIKROTIK_CIRCUIT_THRESHOLD', 3),
+        'cooldown' => (int) env('MIKROTIK_CIRCUIT_COOLDOWN', 30),
+    ],
+
+    /*
+    |--------------------------------------------------------------------------
+    | Riwayat Sesi & Traffic PPPoE
+    |--------------------------------------------------------------------------
+    |
+    | Poller menyimpan sampel counter tiap 'sample_interval' detik. Command
+    | pppoe:rollup (tiap jam) merangkum ke rollup jam/hari lalu menghapus
+    | data yang lebih tua dari 'retention' (hari) supaya tabel tetap kecil.
+    |
+    */
+
+    'history' => [
+        'sample_interval' => (int) env('PPPOE_SAMPLE_INTERVAL', 300),
+        'retention' => [
+            'samples' => (int) env('PPPOE_RETENTION_SAMPLES', 7),
+            'events' => (int) env('PPPOE_RETENTION_EVENTS', 90),
+            'hourly' => (int) env('PPPOE_RETENTION_HOURLY', 60),
+            'daily' => (int) env('PPPOE_RETENTION_DAILY', 730),
+        ],
+    ],
+
+];
@@ -15,6 +15,24 @@
 
     'default' => env('QUEUE_CONNECTION', 'database'),
 
+    /*
+    |--------------------------------------------------------------------------
+    | Koneksi Job Panjang
+    |--------------------------------------------------------------------------
+    |
+    | Job yang bisa berjalan lebih lama dari retry_after koneksi default (90
+    | detik): import pelanggan & generate tagihan. Kalau tidak dipisah,
+    | worker lain mengambil ulang job yang masih berjalan lalu job langsung
+    | gagal ($tries = 1). Poll MikroTik (tiap ~30 detik, timeout 120 detik)
+    | punya koneksi sendiri 'mikrotik-poll' supaya tidak tertahan di belakang
+    | import yang bisa makan satu jam. Jalankan dua worker tambahan:
+    | php artisan queue:work long-running
+    | php artisan queue:work mikrotik-poll
+    |
+    */
+
+    'long_running' => env('LONG_QUEUE_CONNECTION', 'long-running'),
+
     /*
     |--------------------------------------------------------------------------
     | Queue Connections
@@ -44,6 +62,26 @@
             'after_commit' => false,
         ],
 
+        // retry_after harus lebih lama dari $timeout job terpanjang (ImportCustomers: 3600 detik)
+        'long-running' => [
+            'driver' => 'database',
+            'connection' => env('DB_QUEUE_CONNECTION'),
+            'table' => env('DB_QUEUE_TABLE', 'jobs'),
+            'queue' => env('LONG_QUEUE', 'long-running'),
+            'retry_after' => (int) env('LONG_QUEUE_RETRY_AFTER', 3900),
+            'after_commit' => false,
+        ],
+
+        // Poller sesi PPPoE: retry_after sedikit di atas $timeout PollActiveSessions (120 detik)
+        'mikrotik-poll' => [
+            'driver' => 'database',
+            'connection' => env('DB_QUEUE_CONNECTION'),
+            'table' => env('DB_QUEUE_TABLE', 'jobs'),
+            'queue' => env('MIKROTIK_POLL_QUEUE', 'mikrotik-poll'),
+            'retry_after' => (int) env('MIKROTIK_POLL_RETRY_AFTER', 150),
+            'after_commit' => false,
+        ],
+
         'beanstalkd' => [
             'driver' => 'beanstalkd',
             'host' => env('BEANSTALKD_QUEUE_HOST', 'localhost'),
@@ -0,0 +1,23 @@
+<?php
+
+use Illuminate\Database\Migrations\Migration;
+use Illuminate\Database\Schema\Blueprint;
+use Illuminate\Support\Facades\Schema;
+
+return new class extends Migration
+{
+    public function up(): void
+    {
+        Schema::table('customer_pppoe_accounts', function (Blueprint $table) {
+            // Waktu sesi mulai (dari uptime router), uptime live dihitung dari sini
+            $table->timestamp('connected_at')->nullable()->after('session_id');
+        });
+    }
+
+    public function down(): void
+    {
+        Schema::table('customer_pppoe_accounts', function (Blueprint $table) {
+            $table->dropColumn('connected_at');
+        });
+    }
+};
@@ -0,0 +1,48 @@
+<?php
+
+use Illuminate\Database\Migrations\Migration;
+use Illuminate\Database\Schema\Blueprint;
+use Illuminate\Support\Facades\Schema;
+
+return new class extends Migration
+{
+    /**
+     * Run the migrations.
+     */
+    public function up(): void
+    {
+        Schema::create('mikrotik_routers', function (Blueprint $table) {
+            $table->id();
+            // Router bisa ditempelkan ke OLT (opsional), dipakai saat aktivasi pelanggan di OLT tsb
+            $table->foreignId('olt_id')->nullable()->constrained('olts')->onDelete('set null');
+            $table->string('name');
+            $table->string('host');
+            $table->integer('port')->default(8728);
+            $table->string('username');
+            $table->text('password'); // Disimpan terenkripsi (cast 'encrypted')
+            $table->boolean('is_default')->default(false);
+            $table->boolean('is_active')->default(true);
+            $table->timestamps();
+
+            $table->unique(['host', 'port']);
+        });
+
+        Schema::table('customer_pppoe_accounts', function (Blueprint $table) {
+            // Router asal akun PPPoE (null = router default)
+            $table->foreignId('mikrotik_router_id')->nullable()->after('customer_id')
+                ->constrained('mikrotik_routers')->onDelete('set null');
+        });
+    }
+
+    /**
+     * Reverse the migrations.
+     */
+    public function down(): void
+    {
+        Schema::table('customer_pppoe_accounts', function (Blueprint $table) {
+            $table->dropConstrainedForeignId('mikrotik_router_id');
+        });
+
+        Schema::dropIfExists('mikrotik_routers');
+    }
+};
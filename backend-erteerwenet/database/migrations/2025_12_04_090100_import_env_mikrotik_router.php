@@ -0,0 +1,44 @@
+<?php
+
+use App\Models\MikrotikRouter;
+use Illuminate\Database\Migrations\Migration;
+
+return new class extends Migration
+{
+    /**
+     * Run the migrations.
+     */
+    public function up(): void
+    {
+        // Router dari .env lama (MIKROTIK_HOST/USER/PASS) jadi router default,
+        // supaya sync, poller & aktivasi tetap jalan setelah upgrade
+        $legacy = config('mikrotik.legacy');
+
+        if (empty($legacy['host']) || empty($legacy['username'])) {
+            return;
+        }
+
+        $router = MikrotikRouter::firstOrCreate(
+            ['host' => $legacy['host'], 'port' => $legacy['port'] ?: 8728],
+            [
+                'name' => 'Router Utama',
+                'username' => $legacy['username'],
+                'password' => (string) $legacy['password'],
+                'is_active' => true,
+            ]
+        );
+
+        // Jadikan default kalau belum ada router default lain
+        if (!MikrotikRouter::where('is_default', true)->exists()) {
+            $router->update(['is_default' => true]);
+        }
+    }
+
+    /**
+     * Reverse the migrations.
+     */
+    public function down(): void
+    {
+        // Router tetap disimpan: bisa saja sudah dipakai akun PPPoE / diubah dari UI
+    }
+};
@@ -0,0 +1,85 @@
+<?php
+
+use Illuminate\Database\Migrations\Migration;
+use Illuminate\Database\Schema\Blueprint;
+use Illuminate\Support\Facades\Schema;
+
+return new class extends Migration
+{
+    /**
+     * Run the migrations.
+     */
+    public function up(): void
+    {
+        // Event connect/disconnect (append-only, ditulis poller active session)
+        Schema::create('pppoe_session_events', function (Blueprint $table) {
+            $table->id();
+            $table->foreignId('customer_pppoe_account_id')->constrained('customer_pppoe_accounts')->onDelete('cascade');
+            $table->unsignedBigInteger('customer_id')->nullable(); // Denormalisasi, tanpa FK biar insert ringan
+            $table->enum('event', ['connect', 'disconnect']);
+            $table->string('session_id')->nullable();
+            $table->string('remote_address')->nullable();
+            $table->string('caller_id')->nullable();
+            $table->timestamp('occurred_at');
+
+            $table->index(['customer_pppoe_account_id', 'occurred_at']);
+            $table->index('occurred_at');
+        });
+
+        // Sampel counter per akun online (append-only, tiap sample_interval detik)
+        Schema::create('pppoe_counter_samples', function (Blueprint $table) {
+            $table->id();
+            $table->unsignedBigInteger('customer_pppoe_account_id');
+            $table->timestamp('sampled_at');
+            $table->unsignedBigInteger('bytes_in')->default(0);  // Delta sejak sampel sebelumnya
+            $table->unsignedBigInteger('bytes_out')->default(0); // Delta sejak sampel sebelumnya
+            $table->unsignedInteger('uptime_seconds')->default(0);
+
+            $table->index(['customer_pppoe_account_id', 'sampled_at']);
+            $table->index('sampled_at');
+        });
+
+        // Rollup per akun per jam / per hari (sumber semua endpoint uptime & availability)
+        Schema::create('pppoe_usage_rollups', function (Blueprint $table) {
+            $table->id();
+            $table->unsignedBigInteger('customer_pppoe_account_id');
+            $table->unsignedBigInteger('customer_id')->nullable();
+            $table->unsignedBigInteger('odp_id')->nullable();
+            $table->enum('period', ['hour', 'day']);
+            $table->timestamp('period_start');
+            $table->unsignedInteger('online_seconds')->default(0);
+            $table->unsignedInteger('connects')->default(0);
+            $table->unsignedInteger('disconnects')->default(0);
+            $table->unsignedBigInteger('bytes_in')->default(0);
+            $table->unsignedBigInteger('bytes_out')->default(0);
+            $table->unsignedInteger('samples')->default(0);
+
+            $table->unique(['customer_pppoe_account_id', 'period', 'period_start'], 'pppoe_usage_rollups_account_period_unique');
+            $table->index(['customer_id', 'period', 'period_start']);
+            $table->index(['odp_id', 'period', 'period_start']);
+            $table->index(['period', 'period_start']);
+        });
+
+        // Rollup jumlah sesi bersamaan (seluruh jaringan)
+        Schema::create('pppoe_network_rollups', function (Blueprint $table) {
+            $table->id();
+            $table->enum('period', ['hour', 'day']);
+            $table->timestamp('period_start');
+            $table->unsignedInteger('peak_online')->default(0);
+            $table->unsignedInteger('avg_online')->default(0);
+
+            $table->unique(['period', 'period_start']);
+        });
+    }
+
+    /**
+     * Reverse the migrations.
+     */
+    public function down(): void
+    {
+        Schema::dropIfExists('pppoe_network_rollups');
+        Schema::dropIfExists('pppoe_usage_rollups');
+        Schema::dropIfExists('pppoe_counter_samples');
+        Schema::dropIfExists('pppoe_session_events');
+    }
+};
@@ -0,0 +1,54 @@
+<?php
+
+use Illuminate\Database\Migrations\Migration;
+use Illuminate\Database\Schema\Blueprint;
+use Illuminate\Support\Facades\Schema;
+
+return new class extends Migration
+{
+    /**
+     * Run the migrations.
+     */
+    public function up(): void
+    {
+        Schema::table('payments', function (Blueprint $table) {
+            // Ringkasan per status & grafik pendapatan per tanggal bayar
+            $table->index(['status', 'payment_date']);
+            // Monitoring per periode tagihan
+            $table->index(['billing_year', 'billing_month', 'status']);
+        });
+
+        Schema::table('customers', function (Blueprint $table) {
+            $table->index(['status', 'package_id']);
+            $table->index('created_at');
+        });
+
+        foreach (['olts', 'odcs', 'odps'] as $name) {
+            Schema::table($name, function (Blueprint $table) {
+                $table->index('status');
+            });
+        }
+    }
+
+    /**
+     * Reverse the migrations.
+     */
+    public function down(): void
+    {
+        Schema::table('payments', function (Blueprint $table) {
+            $table->dropIndex(['status', 'payment_date']);
+            $table->dropIndex(['billing_year', 'billing_month', 'status']);
+        });
+
+        Schema::table('customers', function (Blueprint $table) {
+            $table->dropIndex(['status', 'package_id']);
+            $table->dropIndex(['created_at']);
+        });
+
+        foreach (['olts', 'odcs', 'odps'] as $name) {
+            Schema::table($name, function (Blueprint $table) {
+                $table->dropIndex(['status']);
+            });
+        }
+    }
+};
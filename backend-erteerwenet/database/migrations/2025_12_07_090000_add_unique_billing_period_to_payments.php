@@ -0,0 +1,59 @@
+<?php
+
+use Illuminate\Database\Migrations\Migration;
+use Illuminate\Database\Schema\Blueprint;
+use Illuminate\Support\Facades\DB;
+use Illuminate\Support\Facades\Schema;
+
+return new class extends Migration
+{
+    /**
+     * Run the migrations.
+     */
+    public function up(): void
+    {
+        // Bersihkan tagihan dobel (sisa scheduler & generate manual yang bentrok).
+        // Satu tagihan dipertahankan per pelanggan per periode: yang sudah lunas dulu, lalu id terkecil.
+        // Tagihan lunas tidak pernah dihapus; lunas dobel dicek di bawah.
+        DB::statement("
+            DELETE p FROM payments p
+            JOIN (
+                SELECT id, ROW_NUMBER() OVER (
+                    PARTITION BY customer_id, billing_month, billing_year
+                    ORDER BY status = 'paid' DESC, id
+                ) AS rn
+                FROM payments
+            ) ranked ON ranked.id = p.id
+            WHERE ranked.rn > 1 AND p.status <> 'paid'
+        ");
+
+        // Lunas lebih dari sekali di periode yang sama harus diputuskan manual (refund / pindah periode)
+        $paidTwice = DB::table('payments')
+            ->select('customer_id', 'billing_month', 'billing_year', DB::raw('GROUP_CONCAT(id ORDER BY id) as ids'))
+            ->groupBy('customer_id', 'billing_month', 'billing_year')
+            ->havingRaw('COUNT(*) > 1')
+            ->get();
+
+        if ($paidTwice->isNotEmpty()) {
+            $report = $paidTwice->map(fn ($row) => "pelanggan {$row->customer_id} periode {$row->billing_month}/{$row->billing_year}: payment id {$row->ids}")
+                ->implode('; ');
+
+            throw new RuntimeException("Tagihan lunas dobel, rapikan manual sebelum migrasi: {$report}");
+        }
+
+        Schema::table('payments', function (Blueprint $table) {
+            // Satu tagihan per pelanggan per periode: generate ulang jadi aman
+            $table->unique(['customer_id', 'billing_month', 'billing_year'], 'payments_customer_period_unique');
+        });
+    }
+
+    /**
+     * Reverse the migrations.
+     */
+    public function down(): void
+    {
+        Schema::table('payments', function (Blueprint $table) {
+            $table->dropUnique('payments_customer_period_unique');
+        });
+    }
+};
@@ -0,0 +1,31 @@
+<?php
+
+use Illuminate\Database\Migrations\Migration;
+use Illuminate\Database\Schema\Blueprint;
+use Illuminate\Support\Facades\Schema;
+
+return new class extends Migration
+{
+    /**
+     * Run the migrations.
+     */
+    public function up(): void
+    {
+        Schema::table('customers', function (Blueprint $table) {
+            // Pengganti LIKE '%...%' di list pelanggan & pembayaran (lihat Customer::scopeSearch)
+            $table->fullText(['name', 'email', 'address'], 'customers_search_fulltext');
+            $table->index('phone');
+        });
+    }
+
+    /**
+     * Reverse the migrations.
+     */
+    public function down(): void
+    {
+        Schema::table('customers', function (Blueprint $table) {
+            $table->dropFullText('customers_search_fulltext');
+            $table->dropIndex(['phone']);
+        });
+    }
+};
@@ -0,0 +1,72 @@
+<?php
+
+use App\Services\PortService;
+use Illuminate\Database\Migrations\Migration;
+use Illuminate\Database\Schema\Blueprint;
+use Illuminate\Support\Facades\DB;
+use Illuminate\Support\Facades\Log;
+use Illuminate\Support\Facades\Schema;
+
+return new class extends Migration
+{
+    /**
+     * Run the migrations.
+     */
+    public function up(): void
+    {
+        Schema::table('customers', function (Blueprint $table) {
+            // Nomor port fisik di ODP (1..capacity), tersimpan permanen per pelanggan
+            $table->unsignedSmallInteger('odp_port')->nullable()->after('odp_id');
+            // Satu port hanya untuk satu pelanggan (juga jadi index occupancy per ODP)
+            $table->unique(['odp_id', 'odp_port'], 'customers_odp_port_unique');
+        });
+
+        // Pelanggan lama: port = urutan id di ODP-nya (sama dengan tampilan monitoring sebelumnya).
+        // ODP yang kelebihan pelanggan: urutan di atas kapasitas dibiarkan tanpa port (NULL)
+        DB::statement('
+            UPDATE customers c
+            JOIN (
+                SELECT id, odp_id, ROW_NUMBER() OVER (PARTITION BY odp_id ORDER BY id) AS port
+                FROM customers
+                WHERE odp_id IS NOT NULL
+            ) numbered ON numbered.id = c.id
+            JOIN odps o ON o.id = numbered.odp_id
+            SET c.odp_port = IF(numbered.port <= o.capacity, numbered.port, NULL)
+        ');
+
+        // Laporkan pelanggan tanpa port supaya bisa dipindah / kapasitas ODP dinaikkan manual
+        $overflow = DB::table('customers')
+            ->join('odps', 'odps.id', '=', 'customers.odp_id')
+            ->whereNull('customers.odp_port')
+            ->groupBy('odps.id', 'odps.name', 'odps.capacity')
+            ->get([
+                'odps.id',
+                'odps.name',
+                'odps.capacity',
+                DB::raw('GROUP_CONCAT(customers.id ORDER BY customers.id) as customer_ids'),
+            ]);
+
+        foreach ($overflow as $odp) {
+            $message = "ODP {$odp->name} (#{$odp->id}) melebihi kapasitas {$odp->capacity}: pelanggan {$odp->customer_ids} belum mendapat port.";
+            Log::warning($message);
+
+            if (app()->runningInConsole()) {
+                fwrite(STDERR, $message . PHP_EOL);
+            }
+        }
+
+        // Counter used_capacity / used_ports yang selama ini diisi manual dihitung ulang
+        app(PortService::class)->refreshAll();
+    }
+
+    /**
+     * Reverse the migrations.
+     */
+    public function down(): void
+    {
+        Schema::table('customers', function (Blueprint $table) {
+            $table->dropUnique('customers_odp_port_unique');
+            $table->dropColumn('odp_port');
+        });
+    }
+};
@@ -0,0 +1,35 @@
+<?php
+
+use Illuminate\Database\Migrations\Migration;
+use Illuminate\Database\Schema\Blueprint;
+use Illuminate\Support\Facades\Schema;
+
+return new class extends Migration
+{
+    // Tabel yang tampil di peta jaringan (query bounding box, lihat NetworkMapService)
+    protected $tables = ['olts', 'odcs', 'odps', 'customers'];
+
+    /**
+     * Run the migrations.
+     */
+    public function up(): void
+    {
+        foreach ($this->tables as $name) {
+            Schema::table($name, function (Blueprint $table) {
+                $table->index(['latitude', 'longitude']);
+            });
+        }
+    }
+
+    /**
+     * Reverse the migrations.
+     */
+    public function down(): void
+    {
+        foreach ($this->tables as $name) {
+            Schema::table($name, function (Blueprint $table) {
+                $table->dropIndex(['latitude', 'longitude']);
+            });
+        }
+    }
+};
@@ -0,0 +1,38 @@
+<?php
+
+use Illuminate\Database\Migrations\Migration;
+use Illuminate\Database\Schema\Blueprint;
+use Illuminate\Support\Facades\DB;
+use Illuminate\Support\Facades\Schema;
+
+return new class extends Migration
+{
+    /**
+     * Run the migrations.
+     */
+    public function up(): void
+    {
+        // Counter penomoran (customer_number 79xxxx), dipesan per range lewat CustomerNumberService
+        Schema::create('sequences', function (Blueprint $table) {
+            $table->string('name')->primary();
+            $table->unsignedBigInteger('value');
+        });
+
+        $last = DB::table('customers')
+            ->where('customer_number', 'like', '79%')
+            ->max(DB::raw('CAST(customer_number AS UNSIGNED)'));
+
+        DB::table('sequences')->insert([
+            'name' => 'customer_number',
+            'value' => $last ?: 790000,
+        ]);
+    }
+
+    /**
+     * Reverse the migrations.
+     */
+    public function down(): void
+    {
+        Schema::dropIfExists('sequences');
+    }
+};
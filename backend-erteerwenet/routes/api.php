@@ -14,6 +14,8 @@
 use App\Http\Controllers\CustomerPortal\AuthController as CustomerAuthController;
 use App\Http\Controllers\Infrastructure\MikrotikController;
 use App\Http\Controllers\Infrastructure\MikrotikProfileController;
+use App\Http\Controllers\Infrastructure\MikrotikRouterController;
+use App\Http\Controllers\Infrastructure\SessionHistoryController;
 use App\Services\MikrotikService;
 use Illuminate\Http\Request;
 use Illuminate\Support\Facades\Route;
@@ -69,8 +71,11 @@
         Route::get('/odcs/{odcId}/odps', [OdpController::class, 'getByOdc']); // Get ODP by ODC ID
         // Route Khusus Monitoring
         Route::get('/monitoring/ports', [PortMonitoringController::class, 'index']);
+        Route::get('/monitoring/ports/{id}', [PortMonitoringController::class, 'show']);
         // Route Network Map
         Route::get('/map/locations', [NetworkMapController::class, 'index']);
+        Route::get('/map/export', [NetworkMapController::class, 'export']);
+        Route::get('/map/locations/{id}', [NetworkMapController::class, 'show']);
 
         // Route Sync MikroTik
         Route::post('/mikrotik/sync', [MikrotikController::class, 'syncCustomers']);
@@ -90,6 +95,18 @@
         // Tambahkan route baru untuk sync active
         Route::post('/mikrotik/sync-active', [MikrotikController::class, 'syncActive']);
 
+        // Router MikroTik (kredensial per router, disimpan di DB)
+        Route::get('/mikrotik/routers', [MikrotikRouterController::class, 'index']);
+        Route::post('/mikrotik/routers', [MikrotikRouterController::class, 'store']);
+        Route::put('/mikrotik/routers/{id}', [MikrotikRouterController::class, 'update']);
+        Route::delete('/mikrotik/routers/{id}', [MikrotikRouterController::class, 'destroy']);
+        Route::post('/mikrotik/routers/{id}/test', [MikrotikRouterController::class, 'test']);
+
+        // Riwayat sesi PPPoE (dari tabel rollup)
+        Route::get('/history/customers/{id}', [SessionHistoryController::class, 'customerUptime']);
+        Route::get('/history/availability', [SessionHistoryController::class, 'availability']);
+        Route::get('/history/network', [SessionHistoryController::class, 'network']);
+
         Route::get('/profiles', [MikrotikProfileController::class, 'index']); // Get Local
         Route::post('/profiles', [MikrotikProfileController::class, 'store']); // Create Baru
         Route::post('/profiles/sync', [MikrotikProfileController::class, 'sync']); // Sync
@@ -109,6 +126,7 @@
         // Payments
         Route::get('/payments', [PaymentController::class, 'index']);
         Route::post('/payments/generate', [PaymentController::class, 'generateBilling']); // Generate Bulanan
+        Route::get('/payments/generate/status', [PaymentController::class, 'generateStatus']); // Progress generate
         Route::post('/payments/{id}/pay', [PaymentController::class, 'pay']); // Bayar per ID
         Route::delete('/payments/{id}', [PaymentController::class, 'destroy']);
 
@@ -130,6 +148,7 @@
     Route::put('/customers/{id}', [CustomerController::class, 'update']);
     Route::delete('/customers/{id}', [CustomerController::class, 'destroy']);
     Route::post('/customers/import', [CustomerController::class, 'import']);
+    Route::get('/customers/import/{importId}', [CustomerController::class, 'importStatus']);
 });
 
 // Group khusus Customer Portal
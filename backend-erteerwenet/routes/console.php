@@ -1,5 +1,6 @@
 <?php
 
+use App\Jobs\PollActiveSessions;
 use Illuminate\Foundation\Inspiring;
 use Illuminate\Support\Facades\Artisan;
 use Illuminate\Support\Facades\Schedule;
@@ -11,3 +12,21 @@
 // Jalankan command billing kita SETIAP MENIT
 // Command kita punya logic sendiri untuk mengecek tanggal/jam, jadi aman dijalankan tiap menit.
 Schedule::command('billing:auto-generate')->everyMinute();
+
+// Poll status PPP Active dari MikroTik (masuk queue, bukan dari request HTTP)
+$pollInterval = max(1, (int) config('mikrotik.poll_interval', 30));
+$poller = Schedule::job(new PollActiveSessions)->name('mikrotik:poll-active');
+
+match (true) {
+    $pollInterval <= 10 => $poller->everyTenSeconds(),
+    $pollInterval <= 15 => $poller->everyFifteenSeconds(),
+    $pollInterval <= 20 => $poller->everyTwentySeconds(),
+    $pollInterval <= 30 => $poller->everyThirtySeconds(),
+    default => $poller->cron('*/' . max(1, intdiv($pollInterval, 60)) . ' * * * *'),
+};
+
+// Rollup riwayat PPPoE (jam yang sudah lewat) + retensi data mentah
+Schedule::command('pppoe:rollup')->hourlyAt(5)->withoutOverlapping();
+
+// Hitung ulang semua cache statistik (model event hanya mengantrikan section yang berubah)
+Schedule::command('stats:rebuild')->everyFifteenMinutes()->withoutOverlapping();
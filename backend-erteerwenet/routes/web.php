@@ -10,11 +10,18 @@
 Route::get('/test-mikrotik', function (MikrotikService $service) {
     try {
         if ($service->isConnected()) {
-            $data = $service->getPppSecrets();
+            // Hitung sambil iterasi, tidak menyimpan seluruh daftar secret di array
+            $count = 0;
+            $first = null;
+            foreach ($service->streamPppSecrets() as $secret) {
+                $first ??= $secret;
+                $count++;
+            }
+
             return response()->json([
                 'status' => 'Sukses',
-                'jumlah_secret' => count($data),
-                'data_pertama' => $data[0] ?? 'Kosong'
+                'jumlah_secret' => $count,
+                'data_pertama' => $first ?? 'Kosong'
             ]);
         } else {
             return response()->json(['status' => 'Gagal Konek (Client Null)'], 500);
@@ -17,6 +17,7 @@ import CustomerDashboard from "@/pages/portal/CustomerDashboard";
 import MikrotikSecrets from "@/pages/MikrotikSecrets";
 import CustomerMonitoring from "@/pages/CustomerMonitoring";
 import PppoeProfiles from "@/pages/PppoeProfiles";
+import MikrotikRouters from "@/pages/MikrotikRouters";
 import { Toaster } from 'sonner';
 
 // --- SATPAM ADMIN (Cek 'token') ---
@@ -55,6 +56,7 @@ export default function App() {
           <Route path="/mikrotik/secrets" element={<MikrotikSecrets />} />
           <Route path="/customer-monitoring" element={<CustomerMonitoring />} />
           <Route path="/pppoe-profiles" element={<PppoeProfiles />} />
+          <Route path="/mikrotik/routers" element={<MikrotikRouters />} />
         </Route>
         {/* --- AREA PELANGGAN (PORTAL) --- */}
         <Route path="/portal/login" element={<CustomerLogin />} />
@@ -17,6 +17,7 @@ import {
   Activity,
   Map,
   MonitorPlay,
+  Router,
 } from "lucide-react";
 
 interface LayoutProps {
@@ -177,7 +178,8 @@ const Layout: React.FC<LayoutProps> = ({ children }) => {
                 isActive("/olt") ||
                 isActive("/odc") ||
                 isActive("/odp") ||
-                isActive("/port-monitoring")
+                isActive("/port-monitoring") ||
+                isActive("/mikrotik/routers")
                   ? "bg-blue-50 text-blue-700"
                   : "text-gray-600 hover:bg-gray-50 hover:text-gray-900"
               }`}
@@ -249,6 +251,17 @@ const Layout: React.FC<LayoutProps> = ({ children }) => {
                   <Activity className="mr-2 h-4 w-4" />
                   Monitoring Port
                 </Link>
+                <Link
+                  to="/mikrotik/routers"
+                  className={`flex items-center px-3 py-2 text-sm font-medium rounded-lg transition-colors duration-200 ${
+                    isActive("/mikrotik/routers")
+                      ? "bg-blue-100 text-blue-700 border-r-2 border-blue-700"
+                      : "text-gray-500 hover:bg-gray-50 hover:text-gray-700"
+                  }`}
+                >
+                  <Router className="mr-2 h-4 w-4" />
+                  Router MikroTik
+                </Link>
                 <Link
                   to="/mikrotik/secrets"
                   className={`flex items-center px-3 py-2 text-sm font-medium rounded-lg transition-colors duration-200 ${
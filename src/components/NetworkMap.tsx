@@ -1,5 +1,6 @@
 import React, { useState, useCallback, useEffect } from 'react';
-import { GoogleMap, useJsApiLoader, MarkerF, InfoWindowF, CircleF } from '@react-google-maps/api';
+import { GoogleMap, useJsApiLoader, MarkerF, InfoWindowF, CircleF, MarkerClustererF } from '@react-google-maps/api';
+import { infrastructureService, MapCluster, MapViewport } from '@/services/infrastructureService';
 
 // --- KONFIGURASI ICON GOOGLE MAPS ---
 const getMarkerIcon = (type: string) => {
@@ -30,7 +31,10 @@ export interface MapLocation {
 }
 
 interface NetworkMapProps {
-  locations: MapLocation[];
+  locations: MapLocation[]; // Titik di viewport (tanpa details, dimuat saat diklik)
+  clusters?: MapCluster[]; // Cluster dari server (zoom rendah)
+  total?: number; // Jumlah lokasi di viewport (termasuk isi cluster)
+  onViewportChange?: (viewport: MapViewport) => void;
   height?: string; // Props ini diabaikan krn pakai flex-1
   center?: [number, number];
   zoom?: number;
@@ -40,6 +44,9 @@ interface NetworkMapProps {
 
 const NetworkMap: React.FC<NetworkMapProps> = ({ 
   locations, 
+  clusters = [],
+  total,
+  onViewportChange,
   center = [-5.3738973, 105.0782348], // Default Center (Lampung)
   zoom = 13,
   showCoverage = true,
@@ -54,6 +61,7 @@ const NetworkMap: React.FC<NetworkMapProps> = ({
 
   const [map, setMap] = useState<google.maps.Map | null>(null);
   const [selectedLocation, setSelectedLocation] = useState<MapLocation | null>(null);
+  const [loadingDetails, setLoadingDetails] = useState(false);
 
   const onLoad = useCallback(function callback(map: google.maps.Map) {
     setMap(map);
@@ -71,6 +79,51 @@ const NetworkMap: React.FC<NetworkMapProps> = ({
     }
   }, [map, center, zoom]);
 
+  // Peta berhenti digeser/zoom => minta data viewport baru
+  const handleIdle = useCallback(() => {
+    const bounds = map?.getBounds();
+    if (!map || !bounds || !onViewportChange) return;
+
+    const ne = bounds.getNorthEast();
+    const sw = bounds.getSouthWest();
+    onViewportChange({
+      north: ne.lat(),
+      east: ne.lng(),
+      south: sw.lat(),
+      west: sw.lng(),
+      zoom: map.getZoom() ?? zoom,
+    });
+  }, [map, onViewportChange, zoom]);
+
+  // Detail marker dimuat saat diklik (tidak ikut payload viewport)
+  const handleSelect = async (location: MapLocation) => {
+    setSelectedLocation(location);
+    if (location.details) return;
+
+    try {
+      setLoadingDetails(true);
+      const detail = await infrastructureService.getNetworkMapLocation(location.id);
+      setSelectedLocation(current => (current?.id === location.id ? { ...location, ...detail } : current));
+    } catch (error) {
+      console.error('Gagal memuat detail lokasi', error);
+    } finally {
+      setLoadingDetails(false);
+    }
+  };
+
+  // Klik cluster => zoom ke area isi cluster
+  const handleClusterClick = (cluster: MapCluster) => {
+    if (!map) return;
+
+    const { north, south, east, west } = cluster.bounds;
+    if (north === south && east === west) {
+      map.panTo({ lat: cluster.lat, lng: cluster.lng });
+      map.setZoom((map.getZoom() ?? zoom) + 2);
+      return;
+    }
+    map.fitBounds({ north, south, east, west });
+  };
+
   const getStatusColor = (status?: string) => {
     if (!status) return '#4B5563'; // Gray
     switch (status.toLowerCase()) {
@@ -101,6 +154,7 @@ const NetworkMap: React.FC<NetworkMapProps> = ({
           zoom={zoom}
           onLoad={onLoad}
           onUnmount={onUnmount}
+          onIdle={handleIdle}
           options={{
             streetViewControl: true,
             mapTypeControl: true,
@@ -109,18 +163,47 @@ const NetworkMap: React.FC<NetworkMapProps> = ({
             mapId: "DEMO_MAP_ID" // Fix warning deprecated marker
           }}
         >
+          {/* Cluster server (jumlah lokasi per sel grid) */}
+          {clusters.map((cluster) => (
+            <MarkerF
+              key={cluster.id}
+              position={{ lat: cluster.lat, lng: cluster.lng }}
+              icon={{
+                path: window.google.maps.SymbolPath.CIRCLE,
+                scale: Math.min(14 + Math.log10(cluster.count) * 8, 36),
+                fillColor: '#2563EB',
+                fillOpacity: 0.85,
+                strokeColor: '#FFFFFF',
+                strokeWeight: 2,
+              }}
+              label={{ text: String(cluster.count), color: '#FFFFFF', fontSize: '12px', fontWeight: 'bold' }}
+              title={`Pelanggan: ${cluster.counts.customer}, OLT: ${cluster.counts.olt}, ODC: ${cluster.counts.odc}, ODP: ${cluster.counts.odp}`}
+              onClick={() => handleClusterClick(cluster)}
+            />
+          ))}
+
+          {/* Titik individual, yang bertumpuk digabung marker clusterer */}
+          <MarkerClustererF options={{ minimumClusterSize: 5, maxZoom: 19 }}>
+            {(clusterer) => (
+              <>
+                {validLocations.map((location) => (
+                  <MarkerF
+                    key={location.id}
+                    clusterer={clusterer}
+                    position={{ lat: Number(location.lat), lng: Number(location.lng) }}
+                    icon={{
+                      url: getMarkerIcon(location.type),
+                      scaledSize: new window.google.maps.Size(40, 40) // Ukuran icon
+                    }}
+                    onClick={() => handleSelect(location)}
+                  />
+                ))}
+              </>
+            )}
+          </MarkerClustererF>
+
           {validLocations.map((location) => (
             <React.Fragment key={location.id}>
-              {/* Marker */}
-              <MarkerF
-                position={{ lat: Number(location.lat), lng: Number(location.lng) }}
-                icon={{
-                  url: getMarkerIcon(location.type),
-                  scaledSize: new window.google.maps.Size(40, 40) // Ukuran icon
-                }}
-                onClick={() => setSelectedLocation(location)}
-              />
-
               {/* Coverage Radius (Lingkaran) */}
               {showCoverage && ['olt', 'odc', 'odp'].includes(location.type.toLowerCase()) && (
                 <CircleF
@@ -162,6 +245,10 @@ const NetworkMap: React.FC<NetworkMapProps> = ({
                    </span>
                 </div>
 
+                {loadingDetails && !selectedLocation.details && (
+                  <p className="text-xs text-gray-500">Memuat detail...</p>
+                )}
+
                 {selectedLocation.details && (
                   <div className="mt-2 pt-2 border-t border-gray-200">
                     {Object.entries(selectedLocation.details).map(([key, value]) => (
@@ -201,7 +288,9 @@ const NetworkMap: React.FC<NetworkMapProps> = ({
           </div>
         </div>
         <div className="mt-2 text-center text-xs text-gray-500">
-          Total: {validLocations.length} lokasi valid ditampilkan
+          {clusters.length > 0
+            ? `${total ?? validLocations.length} lokasi di area ini (${clusters.length} cluster, perbesar peta untuk detail)`
+            : `Total: ${validLocations.length} lokasi valid ditampilkan`}
         </div>
       </div>
     </div>
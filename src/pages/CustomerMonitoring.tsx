@@ -25,6 +25,7 @@ const CustomerMonitoring: React.FC = () => {
   // Loading states
   const [loadingData, setLoadingData] = useState(true); // Loading saat fetch DB
   const [syncing, setSyncing] = useState(false); // Loading saat Sync ke Router
+  const [polledAt, setPolledAt] = useState<string | null>(null); // Waktu poll router terakhir
 
   const [searchTerm, setSearchTerm] = useState("");
   const [filterStatus, setFilterStatus] = useState<
@@ -32,12 +33,13 @@ const CustomerMonitoring: React.FC = () => {
   >("all");
 
   // 1. Fetch Data dari Database Lokal
-  const fetchData = async () => {
-    setLoadingData(true);
+  const fetchData = async (silent = false) => {
+    if (!silent) setLoadingData(true);
     try {
       const result = await infrastructureService.getFormattedMonitoring();
       setData(result.data);
       setStats(result.stats);
+      setPolledAt(result.polled_at ?? null);
     } catch (error) {
       toast.error("Gagal mengambil data database");
     } finally {
@@ -50,11 +52,12 @@ const CustomerMonitoring: React.FC = () => {
     setSyncing(true);
     const toastId = toast.loading("Sinkronisasi status koneksi...");
     try {
-      const result = await infrastructureService.syncActiveConnections();
-      toast.success(`Sync Selesai. ${result.online_count} user online.`, {
+      await infrastructureService.syncActiveConnections();
+      // Poll berjalan di queue server, tampilan ikut ter-refresh otomatis
+      toast.success("Sync dijadwalkan. Data akan diperbarui sebentar lagi.", {
         id: toastId,
       });
-      fetchData(); // Refresh tampilan setelah sync
+      setTimeout(() => fetchData(true), 5000);
     } catch (error: any) {
       toast.error(
         error.response?.data?.message || "Gagal sinkronisasi router",
@@ -67,9 +70,9 @@ const CustomerMonitoring: React.FC = () => {
 
   useEffect(() => {
     fetchData();
-    // Auto refresh tampilan lokal setiap 30 detik (opsional, kalau ada cron job di server)
-    // const interval = setInterval(fetchData, 30000);
-    // return () => clearInterval(interval);
+    // Auto refresh tampilan lokal setiap 30 detik (status diisi poller queue di server)
+    const interval = setInterval(() => fetchData(true), 30000);
+    return () => clearInterval(interval);
   }, []);
 
   // --- HELPER: FORMAT UPTIME ---
@@ -122,12 +125,16 @@ const CustomerMonitoring: React.FC = () => {
             </h1>
             <div className="flex items-center mt-1 text-gray-600">
               <Database className="w-4 h-4 mr-1.5" />
-              <span>Data dari Database Lokal</span>
+              <span>
+                Data dari Database Lokal
+                {polledAt &&
+                  ` · Poll terakhir ${new Date(polledAt).toLocaleTimeString("id-ID")}`}
+              </span>
             </div>
           </div>
           <div className="flex gap-2">
             <button
-              onClick={fetchData}
+              onClick={() => fetchData()}
               className="bg-white border border-gray-300 text-gray-700 px-4 py-2 rounded-lg hover:bg-gray-50 transition-colors flex items-center"
               disabled={loadingData || syncing}
             >
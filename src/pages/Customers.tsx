@@ -28,6 +28,8 @@ import {
   customerService,
   Customer,
   CustomerCreate,
+  CustomerPage,
+  CustomerImportProgress,
 } from "@/services/customerService";
 import { odpService, ODP } from "@/services/odpService";
 import { servicesService, Package } from "@/services/servicesService";
@@ -62,6 +64,10 @@ const Customers: React.FC = () => {
   const [searchTerm, setSearchTerm] = useState("");
   const [filterStatus, setFilterStatus] = useState<string>("all");
   const [filterOdp, setFilterOdp] = useState<string>("all");
+  // Cursor pagination dari server
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
+  const [loadingMore, setLoadingMore] = useState(false);
+  const [summary, setSummary] = useState<CustomerPage["summary"] | null>(null);
 
   // State untuk form
   const [formData, setFormData] = useState<Partial<CustomerCreate>>({
@@ -72,6 +78,7 @@ const Customers: React.FC = () => {
     latitude: null,
     longitude: null,
     odp_id: 0,
+    odp_port: null,
     package_id: 0,
     status: "pending",
     installation_date: new Date().toISOString().split("T")[0],
@@ -81,23 +88,45 @@ const Customers: React.FC = () => {
 
   // Fetch data dari API
   useEffect(() => {
-    fetchData();
+    const loadOptions = async () => {
+      try {
+        const [odpsResponse, packagesData] = await Promise.all([
+          odpService.getAll(1, 100), // Ambil 100 ODP pertama untuk dropdown
+          servicesService.getPackages(),
+        ]);
+        setOdps(odpsResponse.data);
+        setPackages(packagesData as unknown as Package[]);
+      } catch (err) {
+        console.error("Error fetching options:", err);
+      }
+    };
+
+    loadOptions();
   }, []);
 
+  // Search & filter di server (search di-debounce)
+  useEffect(() => {
+    const timer = setTimeout(() => fetchData(), 400);
+    return () => clearTimeout(timer);
+  }, [searchTerm, filterStatus, filterOdp]);
+
+  const fetchCustomers = (cursor?: string | null) =>
+    customerService.getCustomers({
+      search: searchTerm || undefined,
+      status: filterStatus,
+      odp_id: filterOdp,
+      cursor,
+      size: 30,
+    });
+
   const fetchData = async () => {
     try {
       setLoading(true);
 
-      // Fetch semua data secara parallel
-      const [customersData, odpsResponse, packagesData] = await Promise.all([
-        customerService.getCustomers(),
-        odpService.getAll(1, 100), // Ambil 100 ODP pertama untuk dropdown
-        servicesService.getPackages(),
-      ]);
-
-      setCustomers(customersData);
-      setOdps(odpsResponse.data);
-      setPackages(packagesData as unknown as Package[]);
+      const page = await fetchCustomers();
+      setCustomers(page.data);
+      setNextCursor(page.next_cursor);
+      setSummary(page.summary);
     } catch (err) {
       toast.error("Gagal memuat data dari server");
       console.error("Error fetching data:", err);
@@ -106,6 +135,20 @@ const Customers: React.FC = () => {
     }
   };
 
+  const loadMore = async () => {
+    if (!nextCursor) return;
+    try {
+      setLoadingMore(true);
+      const page = await fetchCustomers(nextCursor);
+      setCustomers((prev) => [...prev, ...page.data]);
+      setNextCursor(page.next_cursor);
+    } catch (err) {
+      toast.error("Gagal memuat data berikutnya");
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   // Handler saat lokasi dipilih dari peta
   const handleLocationSelect = (lat: number, lng: number) => {
     setFormData((prev) => ({
@@ -145,6 +188,7 @@ const Customers: React.FC = () => {
       const payload = {
         ...formData,
         odp_id: Number(formData.odp_id),
+        odp_port: formData.odp_port ? Number(formData.odp_port) : null,
         package_id: Number(formData.package_id),
         latitude: formData.latitude ? Number(formData.latitude) : null,
         longitude: formData.longitude ? Number(formData.longitude) : null,
@@ -184,6 +228,7 @@ const Customers: React.FC = () => {
       latitude: null,
       longitude: null,
       odp_id: 0,
+      odp_port: null,
       package_id: 0,
       status: "pending",
       installation_date: new Date().toISOString().split("T")[0],
@@ -204,6 +249,7 @@ const Customers: React.FC = () => {
       latitude: customer.latitude,
       longitude: customer.longitude,
       odp_id: customer.odp_id || 0,
+      odp_port: customer.odp_port ?? null,
       package_id: customer.package_id || 0,
       status: customer.status,
       installation_date: customer.installation_date,
@@ -258,17 +304,80 @@ const Customers: React.FC = () => {
     // Reset value agar bisa upload file yang sama jika gagal sebelumnya
     event.target.value = "";
 
-    const toastId = toast.loading("Sedang mengimport data...");
+    const toastId = toast.loading("Mengunggah file...");
 
     try {
-      await customerService.importCustomers(file);
-      toast.dismiss(toastId);
-      toast.success("Import berhasil! Data pelanggan telah ditambahkan.");
-      fetchData(); // Refresh tabel
+      const { import_id } = await customerService.importCustomers(file);
+      watchImportProgress(import_id, toastId);
     } catch (error: any) {
-      toast.dismiss(toastId);
       const msg = error.response?.data?.message || "Gagal mengimport file.";
-      toast.error(msg);
+      toast.error(msg, { id: toastId });
+    }
+  };
+
+  // Polling progress import di queue sampai selesai
+  const watchImportProgress = (importId: string, toastId: string | number) => {
+    const poll = async () => {
+      try {
+        const progress = await customerService.getImportStatus(importId);
+
+        if (progress.status === "done") {
+          fetchData(); // Refresh tabel
+          if (progress.failed > 0) {
+            toast.warning(
+              `Import selesai: ${progress.created} pelanggan baru, ${progress.failed} baris gagal.`,
+              {
+                id: toastId,
+                duration: 15000,
+                action: { label: "Unduh laporan", onClick: () => downloadImportErrors(progress) },
+              }
+            );
+          } else {
+            toast.success(`Import berhasil! ${progress.created} pelanggan ditambahkan.`, { id: toastId });
+          }
+          return;
+        }
+
+        if (progress.status === "failed") {
+          toast.error(`Gagal import: ${progress.error}`, { id: toastId });
+          return;
+        }
+
+        toast.loading(
+          progress.total
+            ? `Mengimport data... ${progress.processed}/${progress.total}`
+            : "Menunggu antrian import...",
+          { id: toastId }
+        );
+        setTimeout(poll, 2000);
+      } catch (error) {
+        console.error(error);
+        toast.error("Gagal memantau proses import.", { id: toastId });
+      }
+    };
+
+    setTimeout(poll, 1000);
+  };
+
+  // Laporan error per baris (CSV)
+  const downloadImportErrors = (progress: CustomerImportProgress) => {
+    const csvContent = [
+      ["Baris", "Nama", "Email", "Error"],
+      ...progress.errors.map((item) => [item.row, item.name ?? "", item.email ?? "", item.errors.join("; ")]),
+    ]
+      .map((row) => row.map((val) => `"${String(val).replace(/"/g, '""')}"`).join(","))
+      .join("\n");
+
+    const blob = new Blob([csvContent], { type: "text/csv" });
+    const url = window.URL.createObjectURL(blob);
+    const a = document.createElement("a");
+    a.href = url;
+    a.download = `import-error-${progress.id}.csv`;
+    a.click();
+    window.URL.revokeObjectURL(url);
+
+    if (progress.errors_truncated) {
+      toast.info(`Laporan hanya berisi ${progress.errors.length} dari ${progress.failed} baris gagal.`);
     }
   };
 
@@ -369,13 +478,15 @@ const Customers: React.FC = () => {
         setFormData((prev) => ({
           ...prev,
           odp_id: odpId,
+          // Pindah ODP: port lama tidak berlaku, biarkan kosong (otomatis) atau pilih ulang
+          odp_port: prev.odp_id === odpId ? prev.odp_port : null,
           // Jika lat/long pelanggan kosong, pakai lat/long ODP sebagai default view
           latitude: prev.latitude ?? selectedOdp.latitude,
           longitude: prev.longitude ?? selectedOdp.longitude,
         }));
       }
     } else {
-      setFormData((prev) => ({ ...prev, odp_id: 0 }));
+      setFormData((prev) => ({ ...prev, odp_id: 0, odp_port: null }));
     }
   };
 
@@ -409,21 +520,6 @@ const Customers: React.FC = () => {
     }
   };
 
-  const filteredCustomers = customers.filter((customer) => {
-    const matchesSearch =
-      customer.name.toLowerCase().includes(searchTerm.toLowerCase()) ||
-      customer.email.toLowerCase().includes(searchTerm.toLowerCase()) ||
-      customer.phone.includes(searchTerm) ||
-      customer.address.toLowerCase().includes(searchTerm.toLowerCase());
-
-    const matchesStatus =
-      filterStatus === "all" || customer.status === filterStatus;
-    const matchesOdp =
-      filterOdp === "all" || customer.odp_id === parseInt(filterOdp);
-
-    return matchesSearch && matchesStatus && matchesOdp;
-  });
-
   const openGoogleMaps = (address: string) => {
     window.open(
       `https://www.google.com/maps?q=${encodeURIComponent(address)}`,
@@ -431,7 +527,8 @@ const Customers: React.FC = () => {
     );
   };
 
-  if (loading) {
+  // Spinner penuh hanya saat load pertama (ganti filter tidak menghilangkan input search)
+  if (loading && !summary) {
     return (
       <Layout>
         <div className="max-w-7xl mx-auto px-4 sm:px-6 lg:px-8 py-8">
@@ -503,7 +600,7 @@ const Customers: React.FC = () => {
                   Total Pelanggan
                 </p>
                 <p className="text-2xl font-bold text-gray-900">
-                  {customers.length}
+                  {summary?.total ?? customers.length}
                 </p>
               </div>
             </div>
@@ -514,7 +611,7 @@ const Customers: React.FC = () => {
               <div>
                 <p className="text-sm font-medium text-gray-600">Aktif</p>
                 <p className="text-2xl font-bold text-gray-900">
-                  {customers.filter((c) => c.status === "active").length}
+                  {summary?.active ?? 0}
                 </p>
               </div>
             </div>
@@ -525,7 +622,7 @@ const Customers: React.FC = () => {
               <div>
                 <p className="text-sm font-medium text-gray-600">Pending</p>
                 <p className="text-2xl font-bold text-gray-900">
-                  {customers.filter((c) => c.status === "pending").length}
+                  {summary?.pending ?? 0}
                 </p>
               </div>
             </div>
@@ -536,7 +633,7 @@ const Customers: React.FC = () => {
               <div>
                 <p className="text-sm font-medium text-gray-600">Non-Aktif</p>
                 <p className="text-2xl font-bold text-gray-900">
-                  {customers.filter((c) => c.status === "inactive").length}
+                  {summary?.inactive ?? 0}
                 </p>
               </div>
             </div>
@@ -611,7 +708,7 @@ const Customers: React.FC = () => {
 
         {/* Customer Cards */}
         <div className="grid grid-cols-1 md:grid-cols-2 lg:grid-cols-3 gap-6 mb-8">
-          {filteredCustomers.map((customer) => (
+          {customers.map((customer) => (
             <div
               key={customer.id}
               className="bg-white rounded-lg shadow-md p-6 hover:shadow-lg transition-shadow"
@@ -771,7 +868,20 @@ const Customers: React.FC = () => {
           ))}
         </div>
 
-        {filteredCustomers.length === 0 && (
+        {nextCursor && (
+          <div className="flex justify-center mb-8">
+            <button
+              onClick={loadMore}
+              disabled={loadingMore}
+              className="flex items-center bg-white border border-gray-300 text-gray-700 px-6 py-2 rounded-lg hover:bg-gray-50 transition-colors disabled:opacity-50"
+            >
+              {loadingMore && <Loader2 className="w-4 h-4 mr-2 animate-spin" />}
+              Muat lebih banyak
+            </button>
+          </div>
+        )}
+
+        {customers.length === 0 && (
           <div className="bg-white rounded-lg shadow-md p-8 text-center">
             <User className="w-12 h-12 text-gray-400 mx-auto mb-4" />
             <h3 className="text-lg font-medium text-gray-900 mb-2">
@@ -1025,6 +1135,29 @@ const Customers: React.FC = () => {
                         ))}
                       </select>
                     </div>
+                    <div>
+                      <label className="block text-sm font-medium text-gray-700 mb-1">
+                        Port ODP
+                      </label>
+                      <input
+                        type="number"
+                        min={1}
+                        max={
+                          odps.find((odp) => odp.id === formData.odp_id)
+                            ?.capacity
+                        }
+                        value={formData.odp_port ?? ""}
+                        onChange={(e) =>
+                          setFormData((prev) => ({
+                            ...prev,
+                            odp_port: parseInt(e.target.value) || null,
+                          }))
+                        }
+                        disabled={!formData.odp_id}
+                        className="w-full px-3 py-2 border border-gray-300 rounded-lg focus:ring-2 focus:ring-blue-500 focus:border-transparent disabled:bg-gray-50"
+                        placeholder="Otomatis (port kosong terkecil)"
+                      />
+                    </div>
                     <div>
                       <label className="block text-sm font-medium text-gray-700 mb-1">
                         Paket Layanan *
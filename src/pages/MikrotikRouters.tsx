@@ -0,0 +1,462 @@
+import React, { useState, useEffect } from "react";
+import Layout from "@/components/Layout";
+import {
+  Plus,
+  Edit,
+  Trash2,
+  Router,
+  Server,
+  X,
+  Loader2,
+  Wifi,
+  Star,
+} from "lucide-react";
+import {
+  infrastructureService,
+  MikrotikRouter,
+  OLT,
+} from "@/services/infrastructureService";
+import { toast } from "sonner";
+
+const emptyForm: MikrotikRouter = {
+  name: "",
+  host: "",
+  port: 8728,
+  username: "",
+  password: "",
+  olt_id: null,
+  is_default: false,
+  is_active: true,
+};
+
+const MikrotikRouters: React.FC = () => {
+  const [routers, setRouters] = useState<MikrotikRouter[]>([]);
+  const [olts, setOlts] = useState<OLT[]>([]);
+  const [loading, setLoading] = useState(true);
+  const [submitting, setSubmitting] = useState(false);
+  const [testingId, setTestingId] = useState<number | null>(null);
+
+  // Modal State
+  const [showModal, setShowModal] = useState(false);
+  const [editingRouter, setEditingRouter] = useState<MikrotikRouter | null>(
+    null
+  );
+
+  // Form Data
+  const [formData, setFormData] = useState<MikrotikRouter>(emptyForm);
+
+  const fetchData = async () => {
+    setLoading(true);
+    try {
+      const [routerData, oltData] = await Promise.all([
+        infrastructureService.getRouters(),
+        infrastructureService.getOLTs(),
+      ]);
+      setRouters(routerData);
+      setOlts(oltData);
+    } catch (error) {
+      toast.error("Gagal memuat data router");
+    } finally {
+      setLoading(false);
+    }
+  };
+
+  useEffect(() => {
+    fetchData();
+  }, []);
+
+  const handleTest = async (router: MikrotikRouter) => {
+    setTestingId(router.id!);
+    try {
+      const result = await infrastructureService.testRouter(router.id!);
+      toast.success(result.message);
+    } catch (error: any) {
+      toast.error(error.response?.data?.message || "Gagal koneksi ke router");
+    } finally {
+      setTestingId(null);
+    }
+  };
+
+  const handleEdit = (router: MikrotikRouter) => {
+    setEditingRouter(router);
+    setFormData({
+      name: router.name,
+      host: router.host,
+      port: router.port,
+      username: router.username,
+      password: "", // Kosong = password lama tetap dipakai
+      olt_id: router.olt_id ?? null,
+      is_default: router.is_default,
+      is_active: router.is_active,
+    });
+    setShowModal(true);
+  };
+
+  const handleDelete = async (id: number) => {
+    if (
+      !confirm(
+        "Yakin ingin menghapus router ini? Akun PPPoE dari router ini akan memakai router default."
+      )
+    )
+      return;
+
+    try {
+      await infrastructureService.deleteRouter(id);
+      toast.success("Router berhasil dihapus");
+      setRouters((prev) => prev.filter((r) => r.id !== id));
+    } catch (error: any) {
+      toast.error(error.response?.data?.message || "Gagal menghapus router");
+    }
+  };
+
+  const handleSubmit = async (e: React.FormEvent) => {
+    e.preventDefault();
+    setSubmitting(true);
+
+    try {
+      if (editingRouter && editingRouter.id) {
+        // Update (password kosong tidak dikirim)
+        const { password, ...data } = formData;
+        await infrastructureService.updateRouter(
+          editingRouter.id,
+          password ? formData : data
+        );
+        toast.success("Router berhasil diperbarui");
+      } else {
+        // Create
+        await infrastructureService.createRouter(formData);
+        toast.success("Router berhasil ditambahkan");
+      }
+
+      setShowModal(false);
+      fetchData();
+      resetForm();
+    } catch (error: any) {
+      toast.error(error.response?.data?.message || "Gagal menyimpan router");
+    } finally {
+      setSubmitting(false);
+    }
+  };
+
+  const resetForm = () => {
+    setEditingRouter(null);
+    setFormData(emptyForm);
+  };
+
+  return (
+    <Layout>
+      <div className="max-w-7xl mx-auto px-4 sm:px-6 lg:px-8 py-8">
+        {/* Header */}
+        <div className="flex justify-between items-center mb-8">
+          <div>
+            <h1 className="text-3xl font-bold text-gray-900">
+              Router MikroTik
+            </h1>
+            <p className="text-gray-600 mt-1">
+              Kelola koneksi API router untuk sync PPPoE, monitoring & aktivasi
+            </p>
+          </div>
+          <button
+            onClick={() => {
+              resetForm();
+              setShowModal(true);
+            }}
+            className="bg-green-600 text-white px-4 py-2 rounded-lg flex items-center hover:bg-green-700 transition-colors"
+          >
+            <Plus className="w-4 h-4 mr-2" /> Tambah Router
+          </button>
+        </div>
+
+        {/* Table */}
+        <div className="bg-white rounded-lg shadow overflow-hidden">
+          <div className="overflow-x-auto">
+            <table className="min-w-full divide-y divide-gray-200">
+              <thead className="bg-gray-50">
+                <tr>
+                  <th className="px-6 py-3 text-left text-xs font-medium text-gray-500 uppercase">
+                    Nama Router
+                  </th>
+                  <th className="px-6 py-3 text-left text-xs font-medium text-gray-500 uppercase">
+                    Alamat API
+                  </th>
+                  <th className="px-6 py-3 text-left text-xs font-medium text-gray-500 uppercase">
+                    Username
+                  </th>
+                  <th className="px-6 py-3 text-left text-xs font-medium text-gray-500 uppercase">
+                    OLT
+                  </th>
+                  <th className="px-6 py-3 text-left text-xs font-medium text-gray-500 uppercase">
+                    Status
+                  </th>
+                  <th className="px-6 py-3 text-right text-xs font-medium text-gray-500 uppercase">
+                    Aksi
+                  </th>
+                </tr>
+              </thead>
+              <tbody className="bg-white divide-y divide-gray-200">
+                {loading ? (
+                  <tr>
+                    <td colSpan={6} className="text-center py-8 text-gray-500">
+                      Memuat data...
+                    </td>
+                  </tr>
+                ) : routers.length === 0 ? (
+                  <tr>
+                    <td colSpan={6} className="text-center py-8 text-gray-500">
+                      Belum ada router. Tambahkan router agar sync & aktivasi
+                      PPPoE bisa berjalan.
+                    </td>
+                  </tr>
+                ) : (
+                  routers.map((router) => (
+                    <tr key={router.id} className="hover:bg-gray-50">
+                      <td className="px-6 py-4 font-medium text-gray-900">
+                        <div className="flex items-center">
+                          <Server className="w-4 h-4 mr-2 text-gray-400" />
+                          {router.name}
+                          {router.is_default && (
+                            <span className="ml-2 inline-flex items-center bg-yellow-100 text-yellow-800 px-2 py-0.5 rounded text-xs font-semibold">
+                              <Star className="w-3 h-3 mr-1" /> Default
+                            </span>
+                          )}
+                        </div>
+                      </td>
+                      <td className="px-6 py-4 text-sm text-gray-500 font-mono">
+                        {router.host}:{router.port}
+                      </td>
+                      <td className="px-6 py-4 text-sm text-gray-500">
+                        {router.username}
+                      </td>
+                      <td className="px-6 py-4 text-sm text-gray-500">
+                        {router.olt?.name || "-"}
+                      </td>
+                      <td className="px-6 py-4">
+                        <span
+                          className={`px-2 py-1 rounded text-xs font-semibold ${
+                            router.is_active
+                              ? "bg-green-100 text-green-800"
+                              : "bg-gray-100 text-gray-600"
+                          }`}
+                        >
+                          {router.is_active ? "Aktif" : "Nonaktif"}
+                        </span>
+                      </td>
+                      <td className="px-6 py-4 text-right text-sm font-medium space-x-2">
+                        <button
+                          onClick={() => handleTest(router)}
+                          disabled={testingId === router.id}
+                          className="text-blue-600 hover:text-blue-800 transition-colors disabled:opacity-50"
+                          title="Tes Koneksi"
+                        >
+                          {testingId === router.id ? (
+                            <Loader2 className="w-4 h-4 animate-spin" />
+                          ) : (
+                            <Wifi className="w-4 h-4" />
+                          )}
+                        </button>
+                        <button
+                          onClick={() => handleEdit(router)}
+                          className="text-yellow-600 hover:text-yellow-800 transition-colors"
+                          title="Edit Router"
+                        >
+                          <Edit className="w-4 h-4" />
+                        </button>
+                        <button
+                          onClick={() => handleDelete(router.id!)}
+                          className="text-red-600 hover:text-red-800 transition-colors"
+                          title="Hapus Router"
+                        >
+                          <Trash2 className="w-4 h-4" />
+                        </button>
+                      </td>
+                    </tr>
+                  ))
+                )}
+              </tbody>
+            </table>
+          </div>
+        </div>
+
+        {/* Modal Form */}
+        {showModal && (
+          <div className="fixed inset-0 bg-black bg-opacity-50 flex items-center justify-center z-50 p-4">
+            <div className="bg-white rounded-lg max-w-md w-full p-6 shadow-xl">
+              <div className="flex justify-between items-center mb-4 border-b pb-3">
+                <h3 className="text-lg font-bold text-gray-900 flex items-center">
+                  <Router className="w-5 h-5 mr-2 text-blue-600" />
+                  {editingRouter ? "Edit Router" : "Tambah Router Baru"}
+                </h3>
+                <button
+                  onClick={() => setShowModal(false)}
+                  className="text-gray-400 hover:text-gray-600"
+                >
+                  <X className="w-5 h-5" />
+                </button>
+              </div>
+
+              <form onSubmit={handleSubmit} className="space-y-4">
+                <div>
+                  <label className="block text-sm font-medium text-gray-700 mb-1">
+                    Nama Router *
+                  </label>
+                  <input
+                    type="text"
+                    value={formData.name}
+                    onChange={(e) =>
+                      setFormData({ ...formData, name: e.target.value })
+                    }
+                    className="w-full px-3 py-2 border border-gray-300 rounded-lg focus:ring-2 focus:ring-blue-500"
+                    placeholder="Contoh: Router Utama"
+                    required
+                  />
+                </div>
+
+                <div className="grid grid-cols-3 gap-4">
+                  <div className="col-span-2">
+                    <label className="block text-sm font-medium text-gray-700 mb-1">
+                      Host / IP *
+                    </label>
+                    <input
+                      type="text"
+                      value={formData.host}
+                      onChange={(e) =>
+                        setFormData({ ...formData, host: e.target.value })
+                      }
+                      className="w-full px-3 py-2 border border-gray-300 rounded-lg focus:ring-2 focus:ring-blue-500"
+                      placeholder="192.168.88.1"
+                      required
+                    />
+                  </div>
+                  <div>
+                    <label className="block text-sm font-medium text-gray-700 mb-1">
+                      Port API *
+                    </label>
+                    <input
+                      type="number"
+                      min={1}
+                      max={65535}
+                      value={formData.port}
+                      onChange={(e) =>
+                        setFormData({
+                          ...formData,
+                          port: parseInt(e.target.value) || 0,
+                        })
+                      }
+                      className="w-full px-3 py-2 border border-gray-300 rounded-lg focus:ring-2 focus:ring-blue-500"
+                      required
+                    />
+                  </div>
+                </div>
+
+                <div className="grid grid-cols-2 gap-4">
+                  <div>
+                    <label className="block text-sm font-medium text-gray-700 mb-1">
+                      Username *
+                    </label>
+                    <input
+                      type="text"
+                      value={formData.username}
+                      onChange={(e) =>
+                        setFormData({ ...formData, username: e.target.value })
+                      }
+                      className="w-full px-3 py-2 border border-gray-300 rounded-lg focus:ring-2 focus:ring-blue-500"
+                      required
+                    />
+                  </div>
+                  <div>
+                    <label className="block text-sm font-medium text-gray-700 mb-1">
+                      Password {editingRouter ? "" : "*"}
+                    </label>
+                    <input
+                      type="password"
+                      value={formData.password}
+                      onChange={(e) =>
+                        setFormData({ ...formData, password: e.target.value })
+                      }
+                      className="w-full px-3 py-2 border border-gray-300 rounded-lg focus:ring-2 focus:ring-blue-500"
+                      placeholder={editingRouter ? "Kosongkan jika tetap" : ""}
+                      required={!editingRouter}
+                    />
+                  </div>
+                </div>
+
+                <div>
+                  <label className="block text-sm font-medium text-gray-700 mb-1">
+                    OLT
+                  </label>
+                  <select
+                    value={formData.olt_id ?? ""}
+                    onChange={(e) =>
+                      setFormData({
+                        ...formData,
+                        olt_id: e.target.value ? parseInt(e.target.value) : null,
+                      })
+                    }
+                    className="w-full px-3 py-2 border border-gray-300 rounded-lg focus:ring-2 focus:ring-blue-500"
+                  >
+                    <option value="">- Tidak ditempelkan ke OLT -</option>
+                    {olts.map((olt) => (
+                      <option key={olt.id} value={olt.id}>
+                        {olt.name}
+                      </option>
+                    ))}
+                  </select>
+                  <p className="text-xs text-gray-500 mt-1">
+                    Pelanggan di OLT ini diaktivasi lewat router ini
+                  </p>
+                </div>
+
+                <div className="flex items-center space-x-6">
+                  <label className="flex items-center text-sm text-gray-700">
+                    <input
+                      type="checkbox"
+                      checked={formData.is_default}
+                      onChange={(e) =>
+                        setFormData({ ...formData, is_default: e.target.checked })
+                      }
+                      className="mr-2"
+                    />
+                    Router default
+                  </label>
+                  <label className="flex items-center text-sm text-gray-700">
+                    <input
+                      type="checkbox"
+                      checked={formData.is_active}
+                      onChange={(e) =>
+                        setFormData({ ...formData, is_active: e.target.checked })
+                      }
+                      className="mr-2"
+                    />
+                    Aktif
+                  </label>
+                </div>
+
+                <div className="flex justify-end space-x-3 pt-4">
+                  <button
+                    type="button"
+                    onClick={() => setShowModal(false)}
+                    className="px-4 py-2 border border-gray-300 rounded-lg text-gray-700 hover:bg-gray-50 transition-colors"
+                  >
+                    Batal
+                  </button>
+                  <button
+                    type="submit"
+                    disabled={submitting}
+                    className="px-4 py-2 bg-blue-600 text-white rounded-lg hover:bg-blue-700 flex items-center transition-colors disabled:opacity-70"
+                  >
+                    {submitting ? (
+                      <Loader2 className="w-4 h-4 mr-2 animate-spin" />
+                    ) : null}
+                    Simpan
+                  </button>
+                </div>
+              </form>
+            </div>
+          </div>
+        )}
+      </div>
+    </Layout>
+  );
+};
+
+export default MikrotikRouters;
@@ -52,18 +52,26 @@ const MikrotikSecrets: React.FC = () => {
   );
   const [selectedCustomerId, setSelectedCustomerId] = useState<number | "">("");
   const [mappingLoading, setMappingLoading] = useState(false);
+  const [customerSearch, setCustomerSearch] = useState("");
+  // Cursor pagination dari server
+  const [cursor, setCursor] = useState<string | null>(null);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
+  const [prevCursor, setPrevCursor] = useState<string | null>(null);
 
-  // 1. Fetch Data dari DATABASE LOKAL
+  // 1. Fetch Data dari DATABASE LOKAL (search, filter & paginasi di server)
   const fetchData = async () => {
     setLoading(true);
     try {
-      const [accountsData, customersData] = await Promise.all([
-        infrastructureService.getMikrotikSecrets(),
-        customerService.getCustomers(),
-      ]);
+      const page = await infrastructureService.getMikrotikSecrets({
+        search: searchTerm || undefined,
+        sync_status: filterSyncStatus,
+        cursor,
+        size: itemsPerPage,
+      });
 
-      setAccounts(accountsData);
-      setCustomers(customersData);
+      setAccounts(page.data);
+      setNextCursor(page.next_cursor);
+      setPrevCursor(page.prev_cursor);
     } catch (error) {
       toast.error("Gagal mengambil data database");
     } finally {
@@ -100,11 +108,42 @@ const MikrotikSecrets: React.FC = () => {
   };
 
   useEffect(() => {
-    fetchData();
-  }, []);
+    const timer = setTimeout(() => fetchData(), 400);
+    return () => clearTimeout(timer);
+  }, [searchTerm, filterSyncStatus, itemsPerPage, cursor]);
+
+  // Halaman 1 selalu tanpa cursor
+  useEffect(() => {
+    if (currentPage === 1) setCursor(null);
+  }, [currentPage]);
+
+  const goToPage = (direction: "next" | "prev") => {
+    setCursor(direction === "next" ? nextCursor : prevCursor);
+    setCurrentPage((prev) => (direction === "next" ? prev + 1 : Math.max(prev - 1, 1)));
+  };
+
+  // Pilihan pelanggan di modal mapping: dicari di server, hanya kolom yang dipakai dropdown
+  useEffect(() => {
+    if (!showModal) return;
+
+    const timer = setTimeout(async () => {
+      try {
+        const page = await customerService.getCustomers({
+          search: customerSearch || undefined,
+          fields: "id,name,customer_number,pppoe_account.id",
+          size: 50,
+        });
+        setCustomers(page.data);
+      } catch (error) {
+        toast.error("Gagal mengambil data pelanggan");
+      }
+    }, 300);
+    return () => clearTimeout(timer);
+  }, [showModal, customerSearch]);
 
   const openMappingModal = (account: PppoeAccount) => {
     setSelectedAccount(account);
+    setCustomerSearch("");
     if (account.customer) {
       setSelectedCustomerId(account.customer.id);
     } else {
@@ -139,34 +178,6 @@ const MikrotikSecrets: React.FC = () => {
     }
   };
 
-  // --- LOGIKA FILTER ---
-  const filteredAccounts = accounts.filter((acc) => {
-    // 1. Filter Search
-    const matchesSearch =
-      acc.username.toLowerCase().includes(searchTerm.toLowerCase()) ||
-      acc.profile?.toLowerCase().includes(searchTerm.toLowerCase()) ||
-      acc.caller_id?.toLowerCase().includes(searchTerm.toLowerCase()) ||
-      (acc.customer &&
-        acc.customer.name.toLowerCase().includes(searchTerm.toLowerCase()));
-
-    // 2. Filter Status Mapping (Baru)
-    const matchesSync =
-      filterSyncStatus === "all" ||
-      (filterSyncStatus === "synced" && acc.customer) ||
-      (filterSyncStatus === "unsynced" && !acc.customer);
-
-    return matchesSearch && matchesSync;
-  });
-
-  // --- LOGIKA PAGINASI ---
-  const indexOfLastItem = currentPage * itemsPerPage;
-  const indexOfFirstItem = indexOfLastItem - itemsPerPage;
-  const currentItems = filteredAccounts.slice(
-    indexOfFirstItem,
-    indexOfLastItem
-  );
-  const totalPages = Math.ceil(filteredAccounts.length / itemsPerPage);
-
   // --- LOGIKA FILTER PELANGGAN ---
   // Filter customer untuk Dropdown
   const availableCustomers = customers.filter((cust) => {
@@ -240,7 +251,10 @@ const MikrotikSecrets: React.FC = () => {
                   type="text"
                   placeholder="Cari Username, Pelanggan..."
                   value={searchTerm}
-                  onChange={(e) => setSearchTerm(e.target.value)}
+                  onChange={(e) => {
+                    setSearchTerm(e.target.value);
+                    setCurrentPage(1);
+                  }}
                   className="pl-10 px-3 py-1.5 border border-gray-300 rounded-md text-sm w-72 focus:ring-2 focus:ring-blue-500"
                 />
               </div>
@@ -284,7 +298,7 @@ const MikrotikSecrets: React.FC = () => {
                       Memuat data database...
                     </td>
                   </tr>
-                ) : filteredAccounts.length === 0 ? (
+                ) : accounts.length === 0 ? (
                   <tr>
                     <td
                       colSpan={7}
@@ -294,9 +308,9 @@ const MikrotikSecrets: React.FC = () => {
                     </td>
                   </tr>
                 ) : (
-                  currentItems.map(
+                  accounts.map(
                     (
-                      acc // Gunakan currentItems hasil paginasi
+                      acc // Sudah dipaginasi di server
                     ) => (
                       <tr key={acc.id} className="hover:bg-gray-50">
                         <td className="px-6 py-4 whitespace-nowrap">
@@ -382,7 +396,7 @@ const MikrotikSecrets: React.FC = () => {
             </table>
           </div>
           {/* --- KONTROL PAGINASI & DATA PER HALAMAN --- */}
-          {filteredAccounts.length > 0 && (
+          {accounts.length > 0 && (
               <div className="px-6 py-4 border-t border-gray-200 flex flex-col sm:flex-row items-center justify-between bg-gray-50 gap-4">
                   
                   {/* Bagian Kiri: Info Data & Dropdown Limit */}
@@ -407,38 +421,25 @@ const MikrotikSecrets: React.FC = () => {
                       <span className="hidden sm:inline text-gray-400">|</span>
                       
                       <span>
-                          Menampilkan <span className="font-medium">{indexOfFirstItem + 1}</span> - <span className="font-medium">{Math.min(indexOfLastItem, filteredAccounts.length)}</span> dari <span className="font-medium">{filteredAccounts.length}</span> data
+                          Menampilkan <span className="font-medium">{accounts.length}</span> data
                       </span>
                   </div>
 
                   {/* Bagian Kanan: Tombol Navigasi */}
                   <div className="flex space-x-2">
                       <button
-                          onClick={() => setCurrentPage(prev => Math.max(prev - 1, 1))}
-                          disabled={currentPage === 1}
+                          onClick={() => goToPage("prev")}
+                          disabled={currentPage === 1 || !prevCursor}
                           className="px-3 py-1 border border-gray-300 rounded-md text-sm disabled:opacity-50 hover:bg-white transition-colors disabled:cursor-not-allowed"
                       >
                           Sebelumnya
                       </button>
                       
-                      {/* Opsional: Dropdown Halaman Langsung */}
-                      <span className="flex items-center px-2">
-                          <span className="text-sm text-gray-600 mr-2">Hal</span>
-                          <select
-                              value={currentPage}
-                              onChange={(e) => setCurrentPage(Number(e.target.value))}
-                              className="border border-gray-300 rounded-md text-sm py-0.5 px-1 focus:ring-2 focus:ring-blue-500 outline-none w-12 text-center"
-                          >
-                              {Array.from({ length: totalPages }, (_, i) => (
-                                  <option key={i + 1} value={i + 1}>{i + 1}</option>
-                              ))}
-                          </select>
-                          <span className="text-sm text-gray-600 ml-2">/ {totalPages}</span>
-                      </span>
+                      <span className="flex items-center px-2 text-sm text-gray-600">Hal {currentPage}</span>
 
                       <button
-                          onClick={() => setCurrentPage(prev => Math.min(prev + 1, totalPages))}
-                          disabled={currentPage === totalPages}
+                          onClick={() => goToPage("next")}
+                          disabled={!nextCursor}
                           className="px-3 py-1 border border-gray-300 rounded-md text-sm disabled:opacity-50 hover:bg-white transition-colors disabled:cursor-not-allowed"
                       >
                           Selanjutnya
@@ -487,6 +488,13 @@ const MikrotikSecrets: React.FC = () => {
                       ? "Ganti ke Pelanggan Lain:"
                       : "Hubungkan ke Pelanggan:"}
                   </label>
+                  <input
+                    type="text"
+                    value={customerSearch}
+                    onChange={(e) => setCustomerSearch(e.target.value)}
+                    placeholder="Cari nama / ID pelanggan..."
+                    className="w-full px-3 py-2 mb-2 border border-gray-300 rounded-lg text-sm focus:ring-2 focus:ring-blue-500"
+                  />
                   <select
                     value={selectedCustomerId}
                     onChange={(e) =>
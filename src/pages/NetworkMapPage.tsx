@@ -1,4 +1,4 @@
-import React, { useState, useMemo, useEffect } from "react";
+import React, { useState, useMemo, useEffect, useCallback } from "react";
 import Layout from "@/components/Layout";
 import NetworkMap from "@/components/NetworkMap";
 import {
@@ -14,13 +14,24 @@ import {
 } from "lucide-react";
 import {
   infrastructureService,
+  MapCluster,
   MapLocation,
+  MapTotals,
+  MapViewport,
 } from "@/services/infrastructureService";
 import { toast } from "sonner";
 
+// Default ke SMK Telkom Lampung (Sesuai datamu)
+const DEFAULT_CENTER: [number, number] = [-5.3738973, 105.0782348];
+
 const NetworkMapPage: React.FC = () => {
   const [locations, setLocations] = useState<MapLocation[]>([]);
-  const [loading, setLoading] = useState(true);
+  const [clusters, setClusters] = useState<MapCluster[]>([]);
+  const [viewportTotal, setViewportTotal] = useState(0);
+  const [totals, setTotals] = useState<MapTotals | null>(null);
+  const [viewport, setViewport] = useState<MapViewport | null>(null);
+  const [loading, setLoading] = useState(false);
+  const [exporting, setExporting] = useState(false);
 
   const [searchTerm, setSearchTerm] = useState("");
   const [filterType, setFilterType] = useState<string>("all");
@@ -28,13 +39,20 @@ const NetworkMapPage: React.FC = () => {
   const [showCoverage, setShowCoverage] = useState(true);
   const [coverageRadius, setCoverageRadius] = useState(1000);
 
-  // Fetch Data dari API
-  const fetchLocations = async () => {
+  // Fetch marker untuk viewport aktif (cluster/titik ditentukan server)
+  const fetchLocations = async (area: MapViewport) => {
     try {
       setLoading(true);
-      const data = await infrastructureService.getNetworkMapLocations();
-      console.log("Data Peta Diterima:", data); // Debugging
-      setLocations(data);
+      const data = await infrastructureService.getNetworkMapLocations({
+        ...area,
+        type: filterType,
+        status: filterStatus,
+        search: searchTerm || undefined,
+      });
+      setLocations(data.points);
+      setClusters(data.clusters);
+      setViewportTotal(data.total);
+      setTotals(data.totals);
     } catch (error) {
       toast.error("Gagal memuat data peta");
       console.error(error);
@@ -43,98 +61,60 @@ const NetworkMapPage: React.FC = () => {
     }
   };
 
-  useEffect(() => {
-    fetchLocations();
-  }, []);
-
-  // Filter locations
-  const filteredLocations = useMemo(() => {
-    return locations.filter((location) => {
-      const matchesSearch =
-        location.name.toLowerCase().includes(searchTerm.toLowerCase()) ||
-        (location.address &&
-          location.address.toLowerCase().includes(searchTerm.toLowerCase()));
+  const handleViewportChange = useCallback((area: MapViewport) => setViewport(area), []);
 
-      const matchesType = filterType === "all" || location.type === filterType;
-      const matchesStatus =
-        filterStatus === "all" || location.status === filterStatus;
-
-      return matchesSearch && matchesType && matchesStatus;
-    });
-  }, [locations, searchTerm, filterType, filterStatus]);
+  // Geser/zoom peta & filter di-debounce
+  useEffect(() => {
+    if (!viewport) return;
 
-  // LOGIC BARU: Tentukan Titik Tengah Peta Dinamis
-  const mapCenter: [number, number] = useMemo(() => {
-    if (filteredLocations.length > 0) {
-      // Jika ada data, ambil koordinat data pertama sebagai pusat
-      return [
-        Number(filteredLocations[0].lat),
-        Number(filteredLocations[0].lng),
-      ];
-    }
-    // Default ke SMK Telkom Lampung (Sesuai datamu) jika kosong
-    return [-5.3738973, 105.0782348];
-  }, [filteredLocations]);
+    const timer = setTimeout(() => fetchLocations(viewport), 300);
+    return () => clearTimeout(timer);
+  }, [viewport, searchTerm, filterType, filterStatus]);
 
-  // Stats calculation
+  // Stats dari server (semua lokasi berkoordinat, bukan hanya viewport)
   const stats = useMemo(() => {
-    const total = locations.length;
-    const customers = locations.filter((l) => l.type === "customer").length;
-    const olt = locations.filter((l) => l.type === "olt").length;
-    const odc = locations.filter((l) => l.type === "odc").length;
-    const odp = locations.filter((l) => l.type === "odp").length;
-
-    const active = locations.filter((l) => l.status === "active").length;
-    const inactive = locations.filter((l) => l.status === "inactive").length;
-    const maintenance = locations.filter(
-      (l) =>
-        l.status === "maintenance" ||
-        l.status === "suspended" ||
-        l.status === "pending"
-    ).length;
-
-    return { total, customers, olt, odc, odp, active, inactive, maintenance };
-  }, [locations]);
-
-  const handleExportData = () => {
-    const data = filteredLocations.map((loc) => ({
-      Nama: loc.name,
-      Tipe: loc.type.toUpperCase(),
-      Status: loc.status || "-",
-      Alamat: loc.address || "-",
-      Latitude: loc.lat,
-      Longitude: loc.lng,
-    }));
-
-    const csvContent = [
-      ["Nama", "Tipe", "Status", "Alamat", "Latitude", "Longitude"],
-      ...data.map((row) => Object.values(row).map((val) => `"${val}"`)),
-    ]
-      .map((row) => row.join(","))
-      .join("\n");
-
-    const blob = new Blob([csvContent], { type: "text/csv" });
-    const url = window.URL.createObjectURL(blob);
-    const a = document.createElement("a");
-    a.href = url;
-    a.download = "network-infrastructure.csv";
-    a.click();
-    window.URL.revokeObjectURL(url);
+    const types = totals?.types;
+    const statuses = totals?.statuses ?? {};
+
+    return {
+      total: totals?.total ?? 0,
+      customers: types?.customer ?? 0,
+      olt: types?.olt ?? 0,
+      odc: types?.odc ?? 0,
+      odp: types?.odp ?? 0,
+      active: statuses.active ?? 0,
+      inactive: statuses.inactive ?? 0,
+      maintenance:
+        (statuses.maintenance ?? 0) +
+        (statuses.suspended ?? 0) +
+        (statuses.pending ?? 0),
+    };
+  }, [totals]);
+
+  const handleExportData = async () => {
+    // Semua lokasi sesuai filter (bukan hanya viewport), CSV dibuat server
+    try {
+      setExporting(true);
+      const blob = await infrastructureService.exportNetworkMap({
+        type: filterType,
+        status: filterStatus,
+        search: searchTerm || undefined,
+      });
+
+      const url = window.URL.createObjectURL(blob);
+      const a = document.createElement("a");
+      a.href = url;
+      a.download = "network-infrastructure.csv";
+      a.click();
+      window.URL.revokeObjectURL(url);
+    } catch (error) {
+      toast.error("Gagal export data peta");
+      console.error(error);
+    } finally {
+      setExporting(false);
+    }
   };
 
-  if (loading) {
-    return (
-      <Layout>
-        <div className="max-w-7xl mx-auto px-4 sm:px-6 lg:px-8 py-8">
-          <div className="flex justify-center items-center h-96">
-            <Loader2 className="animate-spin h-12 w-12 text-blue-600" />
-            <span className="ml-3 text-gray-600">Memuat peta jaringan...</span>
-          </div>
-        </div>
-      </Layout>
-    );
-  }
-
   return (
     <Layout>
       <div className="max-w-7xl mx-auto px-4 sm:px-6 lg:px-8 py-8">
@@ -150,9 +130,14 @@ const NetworkMapPage: React.FC = () => {
           </div>
           <button
             onClick={handleExportData}
-            className="bg-green-600 text-white px-4 py-2 rounded-lg hover:bg-green-700 transition-colors flex items-center"
+            disabled={exporting}
+            className="bg-green-600 text-white px-4 py-2 rounded-lg hover:bg-green-700 transition-colors flex items-center disabled:opacity-50"
           >
-            <Download className="w-4 h-4 mr-2" />
+            {exporting ? (
+              <Loader2 className="w-4 h-4 mr-2 animate-spin" />
+            ) : (
+              <Download className="w-4 h-4 mr-2" />
+            )}
             Export Data
           </button>
         </div>
@@ -349,18 +334,21 @@ const NetworkMapPage: React.FC = () => {
             <h2 className="text-xl font-semibold text-gray-900">
               Peta Sebaran
             </h2>
-            <div className="text-sm text-gray-600">
-              Menampilkan {filteredLocations.length} dari {locations.length}{" "}
-              lokasi
+            <div className="text-sm text-gray-600 flex items-center">
+              {loading && <Loader2 className="animate-spin h-4 w-4 mr-2 text-blue-600" />}
+              Menampilkan {viewportTotal} dari {stats.total} lokasi di area peta
             </div>
           </div>
 
           {/* PERBAIKAN: Bungkus dengan DIV yang punya tinggi eksplisit (h-[600px]) */}
           <div className="h-[600px] w-full border border-gray-200 rounded-lg overflow-hidden relative z-0">
              <NetworkMap
-               locations={filteredLocations as any}
+               locations={locations as any}
+               clusters={clusters}
+               total={viewportTotal}
+               onViewportChange={handleViewportChange}
                height="100%" // Ubah ini jadi 100% agar mengikuti wrapper di atas
-               center={mapCenter}
+               center={DEFAULT_CENTER}
                zoom={13}
                showCoverage={showCoverage}
                coverageRadius={coverageRadius}
@@ -516,15 +516,13 @@ const ODPPage: React.FC = () => {
                       />
                     </div>
                     <div>
-                      <label className="block text-sm font-medium text-gray-700 mb-1">Port Terpakai *</label>
+                      <label className="block text-sm font-medium text-gray-700 mb-1">Port Terpakai</label>
+                      {/* Dihitung otomatis dari jumlah pelanggan */}
                       <input
                         type="number"
-                        required
-                        min="0"
-                        max={formData.capacity}
+                        readOnly
                         value={formData.used_capacity}
-                        onChange={(e) => setFormData(prev => ({ ...prev, used_capacity: parseInt(e.target.value) }))}
-                        className="w-full px-3 py-2 border border-gray-300 rounded-lg focus:ring-2 focus:ring-blue-500 focus:border-transparent"
+                        className="w-full px-3 py-2 border border-gray-300 rounded-lg bg-gray-100 text-gray-600"
                       />
                     </div>
                     {/* Jumlah Pelanggan field removed - not in API schema */}
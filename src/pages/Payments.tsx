@@ -21,6 +21,7 @@ import {
 import {
   servicesService,
   Payment,
+  PaymentPage,
   BillingSettings,
 } from "@/services/servicesService";
 import { toast } from "sonner";
@@ -39,6 +40,11 @@ const Payments: React.FC = () => {
   // State Paginasi
   const [currentPage, setCurrentPage] = useState(1);
   const [itemsPerPage, setItemsPerPage] = useState(10);
+  // Cursor pagination dari server
+  const [cursor, setCursor] = useState<string | null>(null);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
+  const [prevCursor, setPrevCursor] = useState<string | null>(null);
+  const [summary, setSummary] = useState<PaymentPage["summary"] | null>(null);
 
   // Modal States
   const [showBillingModal, setShowBillingModal] = useState(false);
@@ -60,12 +66,22 @@ const Payments: React.FC = () => {
   });
   const [savingSettings, setSavingSettings] = useState(false);
 
-  // --- 1. FETCH DATA ---
+  // --- 1. FETCH DATA (filter & paginasi di server) ---
   const fetchPayments = async () => {
     try {
       setLoading(true);
-      const data = await servicesService.getPayments();
-      setPayments(data);
+      const page = await servicesService.getPayments({
+        search: searchTerm || undefined,
+        status: filterStatus,
+        billing_month: filterMonth,
+        billing_year: filterYear,
+        cursor,
+        size: itemsPerPage,
+      });
+      setPayments(page.data);
+      setNextCursor(page.next_cursor);
+      setPrevCursor(page.prev_cursor);
+      setSummary(page.summary);
     } catch (error) {
       console.error(error);
       toast.error("Gagal memuat data pembayaran");
@@ -84,43 +100,24 @@ const Payments: React.FC = () => {
   };
 
   useEffect(() => {
-    fetchPayments();
     fetchSettings();
   }, []);
 
-  // --- 2. LOGIC FILTER ---
-  const filteredPayments = payments.filter((payment) => {
-    const customerName = payment.customer?.name || payment.customerName || "";
-    const customerId =
-      payment.customer?.customer_number || payment.customerId || "";
-    const packageName =
-      payment.subscription?.package?.name || payment.packageName || "";
-
-    const matchesSearch =
-      customerName.toLowerCase().includes(searchTerm.toLowerCase()) ||
-      customerId.toLowerCase().includes(searchTerm.toLowerCase()) ||
-      packageName.toLowerCase().includes(searchTerm.toLowerCase());
-
-    const matchesStatus =
-      filterStatus === "all" || payment.status === filterStatus;
-
-    // Filter Bulan & Tahun
-    const matchesMonth =
-      filterMonth === "all" || payment.billing_month === filterMonth;
-    const matchesYear =
-      filterYear === "all" || payment.billing_year === filterYear;
+  // Search di-debounce, ganti filter kembali ke halaman pertama (lihat setCurrentPage(1) di filter)
+  useEffect(() => {
+    const timer = setTimeout(() => fetchPayments(), 400);
+    return () => clearTimeout(timer);
+  }, [searchTerm, filterStatus, filterMonth, filterYear, itemsPerPage, cursor]);
 
-    return matchesSearch && matchesStatus && matchesMonth && matchesYear;
-  });
+  // Halaman 1 selalu tanpa cursor
+  useEffect(() => {
+    if (currentPage === 1) setCursor(null);
+  }, [currentPage]);
 
-  // --- 3. LOGIC PAGINASI ---
-  const indexOfLastItem = currentPage * itemsPerPage;
-  const indexOfFirstItem = indexOfLastItem - itemsPerPage;
-  const currentItems = filteredPayments.slice(
-    indexOfFirstItem,
-    indexOfLastItem
-  );
-  const totalPages = Math.ceil(filteredPayments.length / itemsPerPage);
+  const goToPage = (direction: "next" | "prev") => {
+    setCursor(direction === "next" ? nextCursor : prevCursor);
+    setCurrentPage((prev) => (direction === "next" ? prev + 1 : Math.max(prev - 1, 1)));
+  };
 
   // --- 4. ACTIONS ---
   const handleGenerateBilling = async () => {
@@ -129,15 +126,47 @@ const Payments: React.FC = () => {
         billingMonth,
         billingYear
       );
-      toast.success(result.message || "Tagihan berhasil digenerate");
+      toast.info(result.message || "Generate tagihan diproses di background");
       setShowBillingModal(false);
-      fetchPayments();
+      watchBillingProgress(billingMonth, billingYear);
     } catch (error) {
       console.error(error);
       toast.error("Gagal membuat tagihan.");
     }
   };
 
+  // Polling progress generate tagihan sampai selesai
+  const watchBillingProgress = (month: number, year: number) => {
+    const toastId = toast.loading("Membuat tagihan...");
+
+    const poll = async () => {
+      try {
+        const progress = await servicesService.getBillingProgress(month, year);
+
+        if (progress.status === "done") {
+          toast.success(`Berhasil generate ${progress.created} tagihan baru.`, { id: toastId });
+          fetchPayments();
+          return;
+        }
+
+        if (progress.status === "failed") {
+          toast.error(`Gagal membuat tagihan: ${progress.error}`, { id: toastId });
+          return;
+        }
+
+        if (progress.total) {
+          toast.loading(`Membuat tagihan... ${progress.processed}/${progress.total}`, { id: toastId });
+        }
+        setTimeout(poll, 2000);
+      } catch (error) {
+        console.error(error);
+        toast.error("Gagal memantau proses generate tagihan.", { id: toastId });
+      }
+    };
+
+    setTimeout(poll, 1000);
+  };
+
   const handleProcessPayment = async (id: number) => {
     if (!confirm("Konfirmasi pembayaran ini? Status akan menjadi LUNAS."))
       return;
@@ -293,20 +322,14 @@ const Payments: React.FC = () => {
     }
   };
 
-  const totalRevenue = filteredPayments
-    .filter((p) => p.status === "paid")
-    .reduce((sum, p) => sum + Number(p.amount), 0);
-  const totalPending = filteredPayments
-    .filter((p) => p.status === "pending")
-    .reduce((sum, p) => sum + Number(p.amount), 0);
-  const totalOverdue = filteredPayments
-    .filter((p) => p.status === "overdue")
-    .reduce((sum, p) => sum + Number(p.amount), 0);
-  const pendingPaymentsCount = filteredPayments.filter(
-    (p) => p.status === "pending"
-  ).length;
+  // Ringkasan dari server (seluruh tagihan, bukan hanya halaman ini)
+  const totalRevenue = summary?.paid_amount ?? 0;
+  const totalPending = summary?.pending_amount ?? 0;
+  const totalOverdue = summary?.overdue_amount ?? 0;
+  const pendingPaymentsCount = summary?.pending_count ?? 0;
 
-  if (loading) {
+  // Spinner penuh hanya saat load pertama
+  if (loading && !summary) {
     return (
       <Layout>
         <div className="max-w-7xl mx-auto px-4 sm:px-6 lg:px-8 py-8">
@@ -558,7 +581,7 @@ const Payments: React.FC = () => {
                 </tr>
               </thead>
               <tbody className="bg-white divide-y divide-gray-200">
-                {currentItems.map((payment) => (
+                {payments.map((payment) => (
                   <tr key={payment.id} className="hover:bg-gray-50">
                     <td className="px-6 py-4 whitespace-nowrap">
                       <div className="flex items-center">
@@ -688,7 +711,7 @@ const Payments: React.FC = () => {
           </div>
 
           {/* --- PAGINATION CONTROLS --- */}
-          {filteredPayments.length > 0 && (
+          {payments.length > 0 && (
             <div className="px-6 py-4 border-t border-gray-200 flex flex-col sm:flex-row items-center justify-between bg-gray-50 gap-4">
               <div className="flex items-center space-x-4 text-sm text-gray-700">
                 <div className="flex items-center">
@@ -711,34 +734,24 @@ const Payments: React.FC = () => {
                 <span className="hidden sm:inline text-gray-400">|</span>
                 <span>
                   Menampilkan{" "}
-                  <span className="font-medium">{indexOfFirstItem + 1}</span> -{" "}
-                  <span className="font-medium">
-                    {Math.min(indexOfLastItem, filteredPayments.length)}
-                  </span>{" "}
-                  dari{" "}
-                  <span className="font-medium">{filteredPayments.length}</span>{" "}
-                  data
+                  <span className="font-medium">{payments.length}</span> data
                 </span>
               </div>
 
               <div className="flex space-x-2">
                 <button
-                  onClick={() =>
-                    setCurrentPage((prev) => Math.max(prev - 1, 1))
-                  }
-                  disabled={currentPage === 1}
+                  onClick={() => goToPage("prev")}
+                  disabled={currentPage === 1 || !prevCursor}
                   className="px-3 py-1 border border-gray-300 rounded-md text-sm disabled:opacity-50 hover:bg-white transition-colors disabled:cursor-not-allowed"
                 >
                   Sebelumnya
                 </button>
                 <span className="px-3 py-1 text-sm font-medium text-gray-700">
-                  Hal {currentPage} / {totalPages}
+                  Hal {currentPage}
                 </span>
                 <button
-                  onClick={() =>
-                    setCurrentPage((prev) => Math.min(prev + 1, totalPages))
-                  }
-                  disabled={currentPage === totalPages}
+                  onClick={() => goToPage("next")}
+                  disabled={!nextCursor}
                   className="px-3 py-1 border border-gray-300 rounded-md text-sm disabled:opacity-50 hover:bg-white transition-colors disabled:cursor-not-allowed"
                 >
                   Selanjutnya
@@ -748,7 +761,7 @@ const Payments: React.FC = () => {
           )}
         </div>
 
-        {filteredPayments.length === 0 && (
+        {payments.length === 0 && (
           <div className="bg-white rounded-lg shadow-md p-8 text-center mt-4">
             <DollarSign className="w-12 h-12 text-gray-400 mx-auto mb-4" />
             <h3 className="text-lg font-medium text-gray-900 mb-2">
@@ -2,7 +2,9 @@ import React, { useState, useEffect } from 'react';
 import Layout from '@/components/Layout';
 import { Activity, Box, Users, Network, Search, Filter, TrendingUp, AlertCircle, CheckCircle, XCircle, Loader2 } from 'lucide-react';
 import { PieChart, Pie, Cell, BarChart, Bar, XAxis, YAxis, CartesianGrid, Tooltip, ResponsiveContainer } from 'recharts';
-import { infrastructureService } from '@/services/infrastructureService'; // Import service
+import { infrastructureService, PortMonitoringSummary } from '@/services/infrastructureService'; // Import service
+import { odcService, ODC } from '@/services/odcService';
+import { oltService, OLT } from '@/services/oltService';
 import { toast } from 'sonner';
 
 // Interface disesuaikan dengan response backend
@@ -25,67 +27,98 @@ interface ODPWithPortDetails {
   status: 'active' | 'inactive' | 'maintenance';
   type: string;
   customerCount: number;
+  activeCustomers: number;
   ports: PortStatus[];
   utilizationRate: number;
   availablePorts: number;
 }
 
+const PAGE_SIZE = 10;
+
 const PortMonitoring: React.FC = () => {
   const [odpsWithPorts, setOdpsWithPorts] = useState<ODPWithPortDetails[]>([]);
+  const [summary, setSummary] = useState<PortMonitoringSummary | null>(null);
+  const [currentPage, setCurrentPage] = useState(1);
+  const [totalPages, setTotalPages] = useState(1);
   const [loading, setLoading] = useState(true);
   const [searchTerm, setSearchTerm] = useState('');
   const [filterStatus, setFilterStatus] = useState<string>('all');
-  const [selectedOdp, setSelectedOdp] = useState<string>('all');
+  const [selectedOlt, setSelectedOlt] = useState<string>('all');
+  const [selectedOdc, setSelectedOdc] = useState<string>('all');
+  const [olts, setOlts] = useState<OLT[]>([]);
+  const [odcs, setOdcs] = useState<ODC[]>([]);
 
-  // Fetch Data Real-time dari API
+  // Opsi dropdown filter OLT & ODC
   useEffect(() => {
-    const fetchData = async () => {
+    const loadOptions = async () => {
       try {
-        setLoading(true);
-        const data = await infrastructureService.getPortMonitoring();
-        setOdpsWithPorts(data);
+        const [oltResponse, odcResponse] = await Promise.all([
+          oltService.getAll(1, 100),
+          odcService.getAll(1, 100),
+        ]);
+        setOlts(oltResponse.data);
+        setOdcs(odcResponse.data);
       } catch (error) {
-        console.error("Failed to fetch monitoring data", error);
-        toast.error("Gagal memuat data monitoring");
-      } finally {
-        setLoading(false);
+        console.error('Error fetching filter options:', error);
       }
     };
 
-    fetchData();
-    
-    // Optional: Auto refresh setiap 30 detik
-    const interval = setInterval(fetchData, 30000);
-    return () => clearInterval(interval);
+    loadOptions();
   }, []);
 
-  // Filter Logic
-  const filteredOdps = odpsWithPorts.filter(odp => {
-    const matchesSearch = odp.name.toLowerCase().includes(searchTerm.toLowerCase()) ||
-                          odp.location.toLowerCase().includes(searchTerm.toLowerCase()) ||
-                          odp.odcName.toLowerCase().includes(searchTerm.toLowerCase());
-    
-    const matchesOdp = selectedOdp === 'all' || odp.id.toString() === selectedOdp;
-    
-    const matchesStatus = filterStatus === 'all' || 
-                          (filterStatus === 'high' && odp.utilizationRate >= 80) ||
-                          (filterStatus === 'medium' && odp.utilizationRate >= 50 && odp.utilizationRate < 80) ||
-                          (filterStatus === 'low' && odp.utilizationRate < 50);
-    
-    return matchesSearch && matchesOdp && matchesStatus;
-  });
+  // Filter & pagination di server, port detail hanya untuk ODP di halaman ini
+  const fetchData = async () => {
+    try {
+      setLoading(true);
+      const response = await infrastructureService.getPortMonitoring({
+        page: currentPage,
+        size: PAGE_SIZE,
+        search: searchTerm || undefined,
+        olt_id: selectedOlt,
+        odc_id: selectedOdc,
+        utilization: filterStatus === 'all' ? undefined : filterStatus,
+        with_ports: true,
+      });
+      setOdpsWithPorts(response.data);
+      setSummary(response.summary);
+      setTotalPages(Math.max(1, Math.ceil(response.total / response.size)));
+    } catch (error) {
+      console.error("Failed to fetch monitoring data", error);
+      toast.error("Gagal memuat data monitoring");
+    } finally {
+      setLoading(false);
+    }
+  };
+
+  // Search di-debounce, auto refresh setiap 30 detik
+  useEffect(() => {
+    const timer = setTimeout(fetchData, 400);
+    const interval = setInterval(fetchData, 30000);
+    return () => {
+      clearTimeout(timer);
+      clearInterval(interval);
+    };
+  }, [currentPage, searchTerm, filterStatus, selectedOlt, selectedOdc]);
+
+  // Filter berubah => kembali ke halaman 1
+  useEffect(() => {
+    setCurrentPage(1);
+  }, [searchTerm, filterStatus, selectedOlt, selectedOdc]);
+
+  const filteredOdps = odpsWithPorts;
+  const visibleOdcs = selectedOlt === 'all' ? odcs : odcs.filter(odc => odc.olt_id.toString() === selectedOlt);
 
-  // Calculate statistics
-  const totalPorts = odpsWithPorts.reduce((sum, odp) => sum + odp.capacity, 0);
-  const totalUsedPorts = odpsWithPorts.reduce((sum, odp) => sum + odp.usedPorts, 0);
-  const totalAvailablePorts = totalPorts - totalUsedPorts;
-  const overallUtilization = totalPorts > 0 ? (totalUsedPorts / totalPorts) * 100 : 0;
+  // Statistik seluruh hasil filter (dari server, bukan hanya halaman ini)
+  const totalPorts = summary?.totalPorts ?? 0;
+  const totalUsedPorts = summary?.usedPorts ?? 0;
+  const totalAvailablePorts = summary?.availablePorts ?? 0;
+  const overallUtilization = summary?.utilizationRate ?? 0;
 
   // Chart data
   const utilizationData = [
     { name: 'Tersedia', value: totalAvailablePorts, color: '#10B981' },
     { name: 'Terpakai', value: totalUsedPorts, color: '#3B82F6' },
-    { name: 'Maintenance', value: odpsWithPorts.filter(o => o.status === 'maintenance').reduce((sum, o) => sum + o.capacity, 0), color: '#F59E0B' }
+    { name: 'Maintenance', value: summary?.maintenancePorts ?? 0, color: '#F59E0B' }
   ];
 
   const odpUtilizationData = odpsWithPorts.map(odp => ({
@@ -113,7 +146,8 @@ const PortMonitoring: React.FC = () => {
     }
   };
 
-  if (loading) {
+  // Spinner penuh hanya saat load pertama, supaya input search tidak kehilangan fokus
+  if (loading && !summary) {
     return (
       <Layout>
         <div className="max-w-7xl mx-auto px-4 sm:px-6 lg:px-8 py-8">
@@ -225,7 +259,7 @@ const PortMonitoring: React.FC = () => {
           </div>
           
           <div className="bg-white rounded-lg shadow-md p-6">
-            <h3 className="text-lg font-semibold text-gray-900 mb-4">Utilisasi Port per ODP</h3>
+            <h3 className="text-lg font-semibold text-gray-900 mb-4">Utilisasi Port per ODP (halaman ini)</h3>
             <ResponsiveContainer width="100%" height={300}>
               <BarChart data={odpUtilizationData}>
                 <CartesianGrid strokeDasharray="3 3" />
@@ -241,7 +275,7 @@ const PortMonitoring: React.FC = () => {
 
         {/* Filters */}
         <div className="bg-white rounded-lg shadow-md p-6 mb-6">
-          <div className="grid grid-cols-1 md:grid-cols-4 gap-4">
+          <div className="grid grid-cols-1 md:grid-cols-5 gap-4">
             <div>
               <label className="block text-sm font-medium text-gray-700 mb-1">Cari ODP</label>
               <div className="relative">
@@ -256,16 +290,34 @@ const PortMonitoring: React.FC = () => {
               </div>
             </div>
             <div>
-              <label className="block text-sm font-medium text-gray-700 mb-1">Pilih ODP</label>
+              <label className="block text-sm font-medium text-gray-700 mb-1">Pilih OLT</label>
               <select
-                value={selectedOdp}
-                onChange={(e) => setSelectedOdp(e.target.value)}
+                value={selectedOlt}
+                onChange={(e) => {
+                  setSelectedOlt(e.target.value);
+                  setSelectedOdc('all');
+                }}
                 className="w-full px-3 py-2 border border-gray-300 rounded-lg focus:ring-2 focus:ring-blue-500 focus:border-transparent"
               >
-                <option value="all">Semua ODP</option>
-                {odpsWithPorts.map((odp) => (
-                  <option key={odp.id} value={odp.id.toString()}>
-                    {odp.name}
+                <option value="all">Semua OLT</option>
+                {olts.map((olt) => (
+                  <option key={olt.id} value={olt.id.toString()}>
+                    {olt.name}
+                  </option>
+                ))}
+              </select>
+            </div>
+            <div>
+              <label className="block text-sm font-medium text-gray-700 mb-1">Pilih ODC</label>
+              <select
+                value={selectedOdc}
+                onChange={(e) => setSelectedOdc(e.target.value)}
+                className="w-full px-3 py-2 border border-gray-300 rounded-lg focus:ring-2 focus:ring-blue-500 focus:border-transparent"
+              >
+                <option value="all">Semua ODC</option>
+                {visibleOdcs.map((odc) => (
+                  <option key={odc.id} value={odc.id.toString()}>
+                    {odc.name}
                   </option>
                 ))}
               </select>
@@ -287,7 +339,8 @@ const PortMonitoring: React.FC = () => {
               <button
                 onClick={() => {
                   setSearchTerm('');
-                  setSelectedOdp('all');
+                  setSelectedOlt('all');
+                  setSelectedOdc('all');
                   setFilterStatus('all');
                 }}
                 className="bg-gray-600 text-white px-4 py-2 rounded-lg hover:bg-gray-700 transition-colors w-full"
@@ -374,6 +427,29 @@ const PortMonitoring: React.FC = () => {
           ))}
         </div>
 
+        {/* Pagination */}
+        {totalPages > 1 && (
+          <div className="flex justify-center items-center space-x-2 mt-8">
+            <button
+              onClick={() => setCurrentPage(prev => Math.max(prev - 1, 1))}
+              disabled={currentPage === 1}
+              className="px-3 py-2 border border-gray-300 rounded-lg disabled:opacity-50 disabled:cursor-not-allowed hover:bg-gray-50"
+            >
+              Sebelumnya
+            </button>
+            <span className="px-4 py-2 text-gray-700">
+              Halaman {currentPage} dari {totalPages} ({summary?.totalOdps ?? 0} ODP)
+            </span>
+            <button
+              onClick={() => setCurrentPage(prev => Math.min(prev + 1, totalPages))}
+              disabled={currentPage === totalPages}
+              className="px-3 py-2 border border-gray-300 rounded-lg disabled:opacity-50 disabled:cursor-not-allowed hover:bg-gray-50"
+            >
+              Selanjutnya
+            </button>
+          </div>
+        )}
+
         {filteredOdps.length === 0 && (
           <div className="bg-white rounded-lg shadow-md p-8 text-center">
             <Box className="w-12 h-12 text-gray-400 mx-auto mb-4" />
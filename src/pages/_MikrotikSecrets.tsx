@@ -55,8 +55,8 @@ const MikrotikSecrets: React.FC = () => {
         customerService.getCustomers(),
       ]);
 
-      setSecrets(secretsData);
-      setCustomers(customersData);
+      setSecrets(secretsData.data);
+      setCustomers(customersData.data);
       toast.success("Data berhasil diperbarui");
     } catch (error) {
       toast.error("Gagal mengambil data");
@@ -124,7 +124,7 @@ const MikrotikSecrets: React.FC = () => {
 
       // Refresh data customer juga agar dropdown terupdate status pppoe-nya
       const updatedCustomers = await customerService.getCustomers();
-      setCustomers(updatedCustomers);
+      setCustomers(updatedCustomers.data);
 
       setShowModal(false);
     } catch (error: any) {
@@ -2,7 +2,7 @@ import React, { useState, useEffect } from 'react';
 import { useNavigate } from 'react-router-dom';
 import axios from 'axios';
 import CustomerLayout from '@/components/CustomerLayout';
-import { Wifi, Calendar, CheckCircle, XCircle, Clock, Package, Download } from 'lucide-react';
+import { Wifi, Calendar, CheckCircle, XCircle, Clock, Package, Download, Activity } from 'lucide-react';
 import { toast } from 'sonner';
 
 // Interface khusus untuk data dashboard pelanggan
@@ -27,6 +27,22 @@ interface CustomerData {
     payment_date: string;
     token?: string;
   }>;
+  connection_history?: {
+    days: number;
+    sla_percent: number | null;
+    disconnects: number;
+    daily: Array<{
+      date: string;
+      uptime_percent: number | null;
+      disconnects: number;
+      bytes_in: number;
+      bytes_out: number;
+    }>;
+    recent_events: Array<{
+      event: 'connect' | 'disconnect';
+      occurred_at: string;
+    }>;
+  };
 }
 
 const CustomerDashboard: React.FC = () => {
@@ -160,6 +176,52 @@ const CustomerDashboard: React.FC = () => {
           </div>
         </div>
 
+        {/* Riwayat Koneksi */}
+        {customer.connection_history && (
+          <div className="bg-white rounded-xl shadow-sm border border-gray-100 p-6">
+            <div className="flex items-center justify-between mb-4">
+              <div className="flex items-center">
+                <div className="p-3 bg-indigo-50 rounded-lg mr-4">
+                  <Activity className="w-6 h-6 text-indigo-600" />
+                </div>
+                <div>
+                  <p className="text-sm text-gray-500">Riwayat Koneksi ({customer.connection_history.days} hari)</p>
+                  <h3 className="font-bold text-gray-900">
+                    Uptime {customer.connection_history.sla_percent !== null ? `${customer.connection_history.sla_percent}%` : '-'}
+                  </h3>
+                </div>
+              </div>
+              <span className="text-sm text-gray-500">{customer.connection_history.disconnects}x terputus</span>
+            </div>
+
+            {/* Bar uptime per hari */}
+            <div className="flex items-end gap-1 h-24">
+              {customer.connection_history.daily.map((day) => (
+                <div key={day.date} className="flex-1 h-full flex items-end bg-gray-50 rounded" title={`${new Date(day.date).toLocaleDateString('id-ID')}: ${day.uptime_percent ?? '-'}% online, ${day.disconnects}x putus`}>
+                  <div
+                    className={`w-full rounded ${(day.uptime_percent ?? 0) >= 99 ? 'bg-green-500' : (day.uptime_percent ?? 0) >= 90 ? 'bg-yellow-500' : 'bg-red-500'}`}
+                    style={{ height: `${Math.max(2, day.uptime_percent ?? 0)}%` }}
+                  />
+                </div>
+              ))}
+            </div>
+
+            {customer.connection_history.recent_events.length > 0 && (
+              <div className="border-t border-gray-100 pt-4 mt-4 space-y-2">
+                {customer.connection_history.recent_events.slice(0, 5).map((event, index) => (
+                  <div key={index} className="flex items-center justify-between text-sm">
+                    <span className={`flex items-center ${event.event === 'connect' ? 'text-green-600' : 'text-red-600'}`}>
+                      {event.event === 'connect' ? <CheckCircle className="w-4 h-4 mr-2" /> : <XCircle className="w-4 h-4 mr-2" />}
+                      {event.event === 'connect' ? 'Terhubung' : 'Terputus'}
+                    </span>
+                    <span className="text-gray-500">{new Date(event.occurred_at).toLocaleString('id-ID')}</span>
+                  </div>
+                ))}
+              </div>
+            )}
+          </div>
+        )}
+
         {/* Riwayat Pembayaran Table */}
         <div className="bg-white rounded-xl shadow-sm border border-gray-100 overflow-hidden">
           <div className="px-6 py-4 border-b border-gray-100">
@@ -43,4 +43,18 @@ api.interceptors.response.use(
   }
 );
 
+// Response list dengan cursor pagination (customers, payments, pppoe accounts)
+export interface CursorPage<T> {
+  data: T[];
+  next_cursor: string | null;
+  prev_cursor: string | null;
+  size: number;
+}
+
+export interface CursorParams {
+  cursor?: string | null;
+  size?: number;
+  fields?: string;
+}
+
 export default api;
\ No newline at end of file
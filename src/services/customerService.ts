@@ -1,5 +1,5 @@
 import { apiClient } from ".";
-import api from "./api";
+import api, { CursorPage, CursorParams } from "./api";
 
 export interface Customer {
   id?: number;
@@ -11,6 +11,7 @@ export interface Customer {
   latitude?: number | null;
   longitude?: number | null;
   odp_id?: number | null;
+  odp_port?: number | null;
   package_id?: number | null;
   status: string;
   installation_date?: string;
@@ -38,6 +39,7 @@ export interface CustomerCreate {
   latitude?: number | null;
   longitude?: number | null;
   odp_id: number; // Wajib di backend
+  odp_port?: number | null; // Kosong = port kosong terkecil dipilih otomatis
   package_id: number; // Wajib di backend
   status?: string;
   installation_date?: string;
@@ -53,6 +55,7 @@ export interface CustomerUpdate {
   latitude?: number | null;
   longitude?: number | null;
   odp_id?: number;
+  odp_port?: number | null;
   package_id?: number;
   status?: string;
   installation_date?: string;
@@ -60,19 +63,48 @@ export interface CustomerUpdate {
   is_active?: boolean;
 }
 
-export interface CustomerFilters {
+export interface CustomerFilters extends CursorParams {
   search?: string;
   status?: string;
-  odp_id?: number;
-  package_id?: number;
+  odp_id?: number | string;
+  package_id?: number | string;
+}
+
+export interface CustomerPage extends CursorPage<Customer> {
+  summary: {
+    total: number;
+    active: number;
+    inactive: number;
+    suspended: number;
+    pending: number;
+  };
+}
+
+export interface CustomerImportError {
+  row: number;
+  name: string | null;
+  email: string | null;
+  errors: string[];
+}
+
+export interface CustomerImportProgress {
+  id: string;
+  status: "queued" | "running" | "done" | "failed";
+  file: string;
+  total: number | null;
+  processed: number;
+  created: number;
+  failed: number;
+  errors: CustomerImportError[]; // maksimal 1000 baris pertama
+  errors_truncated?: boolean;
+  error?: string;
 }
 
 export const customerService = {
-  // Get all customers with filters
-  getCustomers: async (filters?: CustomerFilters): Promise<Customer[]> => {
+  // Get customers per halaman (cursor), search & filter di server
+  getCustomers: async (filters?: CustomerFilters): Promise<CustomerPage> => {
     try {
-      // Backend Laravel kita mengembalikan array langsung untuk index
-      const response = await api.get<Customer[]>("/customers", {
+      const response = await api.get<CustomerPage>("/customers", {
         params: filters,
       });
       return response.data;
@@ -93,8 +125,8 @@ export const customerService = {
     }
   },
 
-  // Import Customer
-  importCustomers: async (file: File): Promise<any> => {
+  // Import Customer (diproses di queue, pantau lewat getImportStatus)
+  importCustomers: async (file: File): Promise<{ import_id: string; progress: CustomerImportProgress }> => {
     const formData = new FormData();
     formData.append("file", file);
 
@@ -111,6 +143,11 @@ export const customerService = {
     }
   },
 
+  getImportStatus: async (importId: string): Promise<CustomerImportProgress> => {
+    const response = await apiClient.get(`/customers/import/${importId}`);
+    return response.data;
+  },
+
   // Download Template (Updated: No ODP/Package, Add Lat/Long)
   downloadTemplate: () => {
     // Header CSV baru
@@ -1,4 +1,4 @@
-import apiClient from "./api";
+import apiClient, { CursorPage } from "./api";
 
 export interface OLT {
   id: number;
@@ -73,6 +73,45 @@ export interface MapLocation {
   details?: Record<string, any>;
 }
 
+// Viewport peta (bounding box + zoom Google Maps)
+export interface MapViewport {
+  north: number;
+  south: number;
+  east: number;
+  west: number;
+  zoom: number;
+}
+
+export interface MapViewportParams extends MapViewport {
+  type?: string;
+  status?: string;
+  search?: string;
+}
+
+// Cluster dari server (zoom rendah), klik => zoom ke bounds
+export interface MapCluster {
+  id: string;
+  lat: number;
+  lng: number;
+  count: number;
+  bounds: { north: number; south: number; east: number; west: number };
+  counts: Record<MapLocation["type"], number>;
+}
+
+export interface MapTotals {
+  total: number;
+  types: Record<MapLocation["type"], number>;
+  statuses: Record<string, number>;
+}
+
+export interface MapViewportResponse {
+  mode: "points" | "clusters";
+  points: MapLocation[]; // tanpa address & details (lihat getNetworkMapLocation)
+  clusters: MapCluster[];
+  total: number;
+  totals: MapTotals;
+}
+
 export interface CustomerMonitorData {
   id: number;
   name: string;
@@ -93,6 +132,8 @@ export interface MonitorResponse {
     offline: number;
   };
   data: CustomerMonitorData[];
+  polled_at?: string | null;
+  poll_error?: string | null;
 }
 
 export interface MikrotikProfile {
@@ -105,6 +146,48 @@ export interface MikrotikProfile {
   default?: boolean;
 }
 
+export interface MikrotikRouter {
+  id?: number;
+  olt_id?: number | null;
+  olt?: { id: number; name: string } | null;
+  name: string;
+  host: string;
+  port: number;
+  username: string;
+  password?: string; // Hanya dikirim saat simpan, tidak pernah dikembalikan API
+  is_default: boolean;
+  is_active: boolean;
+}
+
+export interface PortMonitoringParams {
+  page?: number;
+  size?: number;
+  search?: string;
+  odc_id?: number | string;
+  olt_id?: number | string;
+  utilization?: string;
+  with_ports?: boolean;
+}
+
+export interface PortMonitoringSummary {
+  totalOdps: number;
+  totalPorts: number;
+  usedPorts: number;
+  availablePorts: number;
+  maintenancePorts: number;
+  utilizationRate: number;
+  highUtilizationOdps: number;
+  fullOdps: number;
+}
+
+export interface PortMonitoringResponse {
+  data: any[];
+  total: number;
+  page: number;
+  size: number;
+  summary: PortMonitoringSummary;
+}
+
 export const infrastructureService = {
   // OLT Services
   getOLTs: async (filters?: InfrastructureFilters): Promise<OLT[]> => {
@@ -184,10 +267,12 @@ export const infrastructureService = {
     }
   },
 
-  // Get data dari DB Lokal
-  getMikrotikSecrets: async (): Promise<any[]> => {
+  // Get data dari DB Lokal (cursor), filter: search, sync_status, router_id
+  getMikrotikSecrets: async (filters?: any): Promise<CursorPage<any>> => {
     try {
-      const response = await apiClient.get("/infrastructure/mikrotik/secrets");
+      const response = await apiClient.get("/infrastructure/mikrotik/secrets", {
+        params: filters,
+      });
       return response.data;
     } catch (error) {
       console.error("Error fetching local pppoe accounts:", error);
@@ -358,9 +443,10 @@ export const infrastructureService = {
     }
   },
   // Port Monitoring Service
-  getPortMonitoring: async (): Promise<any[]> => {
+  // Paginated, filter: search, odc_id, olt_id, utilization (high/medium/low), with_ports
+  getPortMonitoring: async (params?: PortMonitoringParams): Promise<PortMonitoringResponse> => {
     try {
-      const response = await apiClient.get("/infrastructure/monitoring/ports");
+      const response = await apiClient.get("/infrastructure/monitoring/ports", { params });
       return response.data;
     } catch (error) {
       console.error("Error fetching port monitoring data:", error);
@@ -368,9 +454,10 @@ export const infrastructureService = {
     }
   },
   // Network Map Service
-  getNetworkMapLocations: async (): Promise<MapLocation[]> => {
+  // Marker per viewport (server pakai ETag, revalidasi ditangani cache browser)
+  getNetworkMapLocations: async (params: MapViewportParams): Promise<MapViewportResponse> => {
     try {
-      const response = await apiClient.get("/infrastructure/map/locations");
+      const response = await apiClient.get("/infrastructure/map/locations", { params });
       return response.data;
     } catch (error) {
       console.error("Error fetching map locations:", error);
@@ -378,6 +465,33 @@ export const infrastructureService = {
     }
   },
 
+  // Export CSV semua lokasi sesuai filter (tidak terbatas viewport), termasuk alamat
+  exportNetworkMap: async (
+    params: Pick<MapViewportParams, "type" | "status" | "search">
+  ): Promise<Blob> => {
+    try {
+      const response = await apiClient.get("/infrastructure/map/export", {
+        params,
+        responseType: "blob",
+      });
+      return response.data;
+    } catch (error) {
+      console.error("Error exporting map locations:", error);
+      throw error;
+    }
+  },
+
+  // Detail satu marker (address + details), dipanggil saat marker diklik
+  getNetworkMapLocation: async (id: string): Promise<MapLocation> => {
+    try {
+      const response = await apiClient.get(`/infrastructure/map/locations/${id}`);
+      return response.data;
+    } catch (error) {
+      console.error(`Error fetching map location ${id}:`, error);
+      throw error;
+    }
+  },
+
   // Monitoring Realtime
   getFormattedMonitoring: async (): Promise<MonitorResponse> => {
     try {
@@ -429,4 +543,32 @@ export const infrastructureService = {
   deleteProfile: async (id: number): Promise<any> => {
     await apiClient.delete(`/infrastructure/profiles/${id}`);
   },
+
+  // --- ROUTER MIKROTIK ---
+  getRouters: async (): Promise<MikrotikRouter[]> => {
+    const response = await apiClient.get("/infrastructure/mikrotik/routers");
+    return response.data;
+  },
+
+  createRouter: async (data: MikrotikRouter): Promise<MikrotikRouter> => {
+    const response = await apiClient.post("/infrastructure/mikrotik/routers", data);
+    return response.data;
+  },
+
+  updateRouter: async (id: number, data: Partial<MikrotikRouter>): Promise<MikrotikRouter> => {
+    const response = await apiClient.put(
+      `/infrastructure/mikrotik/routers/${id}`,
+      data
+    );
+    return response.data;
+  },
+
+  deleteRouter: async (id: number): Promise<void> => {
+    await apiClient.delete(`/infrastructure/mikrotik/routers/${id}`);
+  },
+
+  testRouter: async (id: number): Promise<{ message: string }> => {
+    const response = await apiClient.post(`/infrastructure/mikrotik/routers/${id}/test`);
+    return response.data;
+  },
 };
@@ -1,4 +1,4 @@
-import apiClient from "./api";
+import apiClient, { CursorPage } from "./api";
 
 export interface Package {
   id: number;
@@ -95,6 +95,15 @@ export interface Payment {
   subscription?: { package?: { name: string } }; // Nested relation buat nama paket
 }
 
+export interface PaymentPage extends CursorPage<Payment> {
+  summary: {
+    paid_amount: number;
+    pending_amount: number;
+    overdue_amount: number;
+    pending_count: number;
+  };
+}
+
 // Interface untuk Setting Auto Billing
 export interface BillingSettings {
   id?: number;
@@ -299,13 +308,15 @@ export const servicesService = {
   },
 
   // Payment Services
-  getPayments: async (filters?: any): Promise<Payment[]> => {
+  // Per halaman (cursor), filter: search, status, billing_month, billing_year
+  getPayments: async (filters?: any): Promise<PaymentPage> => {
     const response = await apiClient.get("/services/payments", {
       params: filters,
     });
     return response.data;
   },
 
+  // Generate jalan di queue, response 202 + progress awal
   generateBilling: async (month: number, year: number) => {
     const response = await apiClient.post("/services/payments/generate", {
       month,
@@ -314,6 +325,13 @@ export const servicesService = {
     return response.data;
   },
 
+  getBillingProgress: async (month: number, year: number) => {
+    const response = await apiClient.get("/services/payments/generate/status", {
+      params: { month, year },
+    });
+    return response.data;
+  },
+
   processPayment: async (id: number) => {
     const response = await apiClient.post(`/services/payments/${id}/pay`);
     return response.data;